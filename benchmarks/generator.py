@@ -0,0 +1,246 @@
+"""
+Generates synthetic BBMRI.cz patient exports for benchmarks. Data are
+random, but reproducible for the same seed, and follow the shape of real
+exports: every patient has the given number of LTS tissues and STS
+diagnosis materials, diagnoses and material types are drawn from weighted
+distributions resembling a cancer biobank.
+
+Generate a directory of exports from the root of the repository::
+
+    python -m benchmarks.generator directory --patients 1000 --tissues 5
+"""
+import argparse
+import io
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+from xml.sax.saxutils import escape, quoteattr
+
+from fhir_biobank.xmlReader import PatientXMLReader
+from fhir_biobank._Constants import BBMRI_CZ_NAMESPACE
+
+"""
+ICD-10 codes of diagnoses with their relative frequencies
+"""
+DIAGNOSES = {"C509": 22, "C189": 9, "C187": 5, "C20": 7, "C349": 10,
+             "C61": 12, "C439": 5, "C679": 5, "C64": 4, "C259": 3,
+             "C56": 3, "C541": 4, "C73": 2, "C169": 2, "C719": 2,
+             "D050": 2, "D489": 3}
+
+"""
+BBMRI.cz material types of LTS tissues with their relative frequencies
+"""
+TISSUE_MATERIAL_TYPES = {"1": 45, "2": 25, "3": 5, "4": 10, "53": 10,
+                         "54": 5}
+
+"""
+BBMRI.cz material types of STS diagnosis materials with their relative
+frequencies
+"""
+DIAGNOSIS_MATERIAL_TYPES = {"S": 50, "P": 30, "K": 15, "L": 5}
+
+"""
+Mapping of BBMRI.cz material types to specimen material codes,
+to be passed to PatientXMLReader
+"""
+MATERIAL_CODES = {"1": "tumor-tissue-frozen", "2": "normal-tissue-frozen",
+                  "3": "other-tissue-frozen", "4": "tissue-frozen",
+                  "53": "tumor-tissue-ffpe", "54": "normal-tissue-ffpe",
+                  "S": "blood-serum", "P": "blood-plasma",
+                  "K": "whole-blood", "L": "csf-liquor"}
+
+_GENDERS = {"female": 52, "male": 47, "unknown": 1}
+_FIRST_COLLECTION = date(2010, 1, 1)
+_LAST_COLLECTION = date(2021, 12, 31)
+
+
+def _weighted(rng, distribution):
+    return rng.choices(list(distribution), list(distribution.values()))[0]
+
+
+class Generator:
+    """
+    This class generates patient records, XML exports and resources
+    of a synthetic biobank.
+    """
+
+    def __init__(self, patients: int = 100, tissues: int = 4,
+                 diagnosis_materials: int = 1, seed: int = 0):
+        """
+        :param int patients: number of patients
+        :param int tissues: number of LTS tissues of every patient
+        :param int diagnosis_materials: number of STS diagnosis materials
+            of every patient
+        :param int seed: seed of the random generator
+        """
+        for name, value in (("patients", patients), ("tissues", tissues),
+                            ("diagnosis_materials", diagnosis_materials)):
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise TypeError("{} has to be int!".format(name))
+            if value < 0:
+                raise ValueError("{} cannot be negative!".format(name))
+        self._patients = patients
+        self._tissues = tissues
+        self._diagnosisMaterials = diagnosis_materials
+        self._seed = seed
+
+    @property
+    def specimenCount(self):
+        """
+        :return: number of samples of all patients
+        """
+        return self._patients * (self._tissues + self._diagnosisMaterials)
+
+    def records(self):
+        """
+        Generates patient records in the same form as
+        PatientXMLReader.records() does.
+
+        :return: generator of patient records
+        """
+        rng = random.Random(self._seed)
+        days = (_LAST_COLLECTION - _FIRST_COLLECTION).days
+        for index in range(self._patients):
+            diagnosis = _weighted(rng, DIAGNOSES)
+            record = {"biobank": "MOU", "consent": "true",
+                      "id": str(4800000 + index),
+                      "sex": _weighted(rng, _GENDERS),
+                      "year": str(rng.randint(1930, 2005)),
+                      "month": "--{:02d}".format(rng.randint(1, 12))}
+            collected = datetime.combine(
+                _FIRST_COLLECTION + timedelta(days=rng.randrange(days)),
+                datetime.min.time()) + timedelta(minutes=rng.randint(
+                    7 * 60, 17 * 60))
+            number = str(rng.randint(1, 999999))
+            year = str(collected.year)
+            samples = []
+            for tissue in range(self._tissues):
+                material_type = _weighted(rng, TISSUE_MATERIAL_TYPES)
+                samples_no = str(rng.randint(1, 4))
+                samples.append({
+                    "number": number,
+                    "sampleId": "BBM:{}:{}:{}".format(year, number,
+                                                      tissue + 1),
+                    "year": year, "kind": "tissue",
+                    "samplesNo": samples_no,
+                    "availableSamplesNo": samples_no,
+                    "materialType": material_type, "pTNM": "T2N0M0",
+                    "morphology": "8500/3{}".format(rng.randint(1, 3)),
+                    "diagnosis": diagnosis,
+                    "cutTime": collected.isoformat(),
+                    "freezeTime": (collected + timedelta(
+                        minutes=rng.randint(10, 40))).isoformat(),
+                    "retrieved": "operational"})
+            for material in range(self._diagnosisMaterials):
+                taken = collected - timedelta(days=rng.randint(1, 30))
+                samples.append({
+                    "number": str(rng.randint(1, 999999)),
+                    "sampleId": "&:{}:{}".format(taken.year, rng.randint(
+                        1, 999999)),
+                    "year": str(taken.year), "kind": "diagnosisMaterial",
+                    "materialType": _weighted(rng, DIAGNOSIS_MATERIAL_TYPES),
+                    "diagnosis": diagnosis,
+                    "takingDate": taken.isoformat(),
+                    "retrieved": "unknown"})
+            record["samples"] = samples
+            yield record
+
+    @staticmethod
+    def record_xml(record: dict, namespace: bool = True):
+        """
+        Creates XML of a patient element of a record.
+
+        :param dict record: patient record
+        :param bool namespace: declare the BBMRI.cz namespace on the element
+
+        :return: string containing the patient element
+        """
+        attributes = "".join(
+            " {}={}".format(name, quoteattr(value))
+            for name, value in record.items() if name != "samples")
+        if namespace:
+            attributes += " xmlns=" + quoteattr(BBMRI_CZ_NAMESPACE)
+        parts = ["<patient", attributes, ">\n"]
+        for group, kind in (("LTS", "tissue"),
+                            ("STS", "diagnosisMaterial")):
+            samples = [sample for sample in record["samples"]
+                       if sample["kind"] == kind]
+            if not samples:
+                continue
+            parts.append("\t<{}>\n".format(group))
+            for sample in samples:
+                parts.append("\t\t<{} number={} sampleId={} year={}>\n".format(
+                    kind, quoteattr(sample["number"]),
+                    quoteattr(sample["sampleId"]),
+                    quoteattr(sample["year"])))
+                for name, value in sample.items():
+                    if name not in ("number", "sampleId", "year", "kind"):
+                        parts.append("\t\t\t<{0}>{1}</{0}>\n".format(
+                            name, escape(value)))
+                parts.append("\t\t</{}>\n".format(kind))
+            parts.append("\t</{}>\n".format(group))
+        parts.append("</patient>\n")
+        return "".join(parts)
+
+    def export_xml(self):
+        """
+        Creates a single export containing all the patients.
+
+        :return: UTF-8 encoded XML
+        """
+        parts = ['<?xml version="1.0" encoding="utf-8" ?>\n<export xmlns=',
+                 quoteattr(BBMRI_CZ_NAMESPACE), '>\n']
+        parts.extend(self.record_xml(record, namespace=False)
+                     for record in self.records())
+        parts.append("</export>\n")
+        return "".join(parts).encode("utf-8")
+
+    def write_exports(self, directory: str):
+        """
+        Writes one BBM<patient id>.XML export per patient into the directory.
+
+        :param string directory: existing directory
+
+        :return: list of paths of written files
+        """
+        paths = []
+        for record in self.records():
+            path = os.path.join(directory, "BBM{}.XML".format(record["id"]))
+            with open(path, "w", encoding="utf-8") as fp:
+                fp.write('<?xml version="1.0" encoding="utf-8" ?>\n')
+                fp.write(self.record_xml(record))
+            paths.append(path)
+        return paths
+
+    def resources(self):
+        """
+        Converts the records into resources the same way
+        PatientXMLReader does.
+
+        :return: list of tuples of PatientResource and its SpecimenResources
+        """
+        reader = PatientXMLReader(io.BytesIO(),
+                                  material_codes=MATERIAL_CODES)
+        return [reader.convert_record(record) for record in self.records()]
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        description="Generates synthetic BBMRI.cz patient exports.")
+    parser.add_argument("directory")
+    parser.add_argument("--patients", type=int, default=100)
+    parser.add_argument("--tissues", type=int, default=4)
+    parser.add_argument("--diagnosis-materials", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args(arguments)
+    os.makedirs(arguments.directory, exist_ok=True)
+    paths = Generator(arguments.patients, arguments.tissues,
+                      arguments.diagnosis_materials,
+                      arguments.seed).write_exports(arguments.directory)
+    print("{} exports written to {}".format(len(paths), arguments.directory))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Measures time needed to import the fhir_biobank modules in a new
+interpreter, with fhirclient imported lazily, and compares it with
+importing them together with all the fhirclient models the library uses,
+which is what importing fhir_biobank cost before fhirclient was imported
+lazily. The benchmark fails if the lazy import is not faster, or if
+importing fhir_biobank and serializing resources with JSONSerializer
+imports fhirclient.
+
+Run from the root of the repository::
+
+    python -m benchmarks.imports
+"""
+import json
+import os
+import subprocess
+import sys
+
+MODULES = ["fhir_biobank.bundle", "fhir_biobank.condition",
+           "fhir_biobank.custodian", "fhir_biobank.diagnosis",
+           "fhir_biobank.helperFunctions", "fhir_biobank.patient",
+           "fhir_biobank.serializer", "fhir_biobank.specimen",
+           "fhir_biobank.storageTemperature"]
+
+FHIRCLIENT_MODULES = ["bundle", "codeableconcept", "coding", "condition",
+                      "extension", "fhirdate", "fhirreference", "identifier",
+                      "meta", "patient", "quantity", "specimen"]
+
+_MEASURE = """
+import sys, time
+start = time.perf_counter()
+{imports}
+seconds = time.perf_counter() - start
+{work}
+print(seconds, any(name.startswith("fhirclient") for name in sys.modules))
+"""
+
+_SERIALIZE = """
+from datetime import date
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.serializer import JSONSerializer
+patient = PatientResource("0", "4816522", "female", date(1997, 12, 1))
+JSONSerializer.dumps(Bundle("0", [Entry.from_resource(patient,
+                                                      "https://example.com")]))
+"""
+
+
+def _run(imports, work="", repeat=10):
+    source = _MEASURE.format(imports=imports, work=work)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    times = []
+    imported = False
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", source], cwd=root,
+                                check=True, stdout=subprocess.PIPE,
+                                universal_newlines=True).stdout.split()
+        times.append(float(output[0]))
+        imported = output[1] == "True"
+    return min(times), imported
+
+
+def measure(repeat: int = 10):
+    """
+    :param int repeat: number of new interpreters for each measurement
+
+    :return: dictionary with the best times of lazy and eager import
+        and information whether fhirclient was imported
+    """
+    lazy = "\n".join("import " + module for module in MODULES)
+    eager = "\n".join("import fhirclient.models." + module
+                      for module in FHIRCLIENT_MODULES) + "\n" + lazy
+    lazy_seconds, _ = _run(lazy, repeat=repeat)
+    eager_seconds, _ = _run(eager, repeat=repeat)
+    _, imported = _run(lazy, _SERIALIZE, repeat=1)
+    return {"lazy_seconds": lazy_seconds, "eager_seconds": eager_seconds,
+            "fhirclient_imported_by_serializer": imported}
+
+
+def main():
+    report = measure()
+    report["passed"] = report["lazy_seconds"] < report["eager_seconds"] \
+        and not report["fhirclient_imported_by_serializer"]
+    print(json.dumps(report, indent=2))
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
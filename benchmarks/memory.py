@@ -0,0 +1,123 @@
+"""
+Measures memory used by a single instance of resource, extension, Entry and
+Bundle classes, and compares it with the target sizes. Arguments are
+created once and shared by all instances, so only the instances themselves
+are measured. Diagnosis, StorageTemperature and Custodian instances are
+shared, so creating them again with the same code allocates nothing - they
+are measured with distinct codes, including their entries in the cache
+of shared instances. There are only a few storage temperature codes,
+so the cache is emptied before every StorageTemperature is created.
+
+Run from the root of the repository::
+
+    python -m benchmarks.memory
+"""
+import gc
+import json
+import sys
+import tracemalloc
+from datetime import date
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.condition import ConditionResource
+from fhir_biobank.custodian import Custodian
+from fhir_biobank.diagnosis import Diagnosis
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.specimen import SpecimenResource
+from fhir_biobank.storageTemperature import StorageTemperature
+
+"""
+Maximal number of bytes a single instance is allowed to take. Extension
+instances include their serialized JSON fragment and, except
+StorageTemperature, their entry in the cache of shared instances.
+"""
+TARGET_BYTES_PER_INSTANCE = {
+    "PatientResource": 128,
+    "SpecimenResource": 128,
+    "ConditionResource": 80,
+    "Diagnosis": 384,
+    "StorageTemperature": 352,
+    "Custodian": 320,
+    "Entry": 80,
+    "Bundle": 160,
+}
+
+
+def _storage_temperature(code):
+    StorageTemperature.cache_clear()
+    return StorageTemperature(code)
+
+
+def _factories(instances):
+    """
+    Returns functions creating an instance from its index.
+    """
+    patient = PatientResource("0", "4816522", "female", date(1997, 12, 1))
+    collected = date(2021, 11, 4)
+    entry = Entry(patient, "https://example.com/Patient/0", "Patient/0")
+    entries = [entry]
+    codes = ["C{}".format(index) for index in range(instances)]
+    references = ["Organization/{}".format(index)
+                  for index in range(instances)]
+    return {
+        "PatientResource": lambda index: PatientResource("0", "4816522"),
+        "SpecimenResource": lambda index: SpecimenResource(
+            "0", "BBM:2021:723:1", "tissue-frozen", patient, collected, 3.0),
+        "ConditionResource": lambda index: ConditionResource(
+            "0", "C509", collected, patient),
+        "Diagnosis": lambda index: Diagnosis(codes[index]),
+        "StorageTemperature": lambda index: _storage_temperature(
+            "temperatureLN"),
+        "Custodian": lambda index: Custodian(references[index]),
+        "Entry": lambda index: Entry(patient, "https://example.com/Patient/0",
+                                     "Patient/0"),
+        "Bundle": lambda index: Bundle("0", entries),
+    }
+
+
+def measure(instances: int = 10000):
+    """
+    Measures average number of bytes allocated per instance of each class.
+
+    :param int instances: number of instances created for each class
+
+    :return: dictionary mapping class name to bytes per instance
+    """
+    results = {}
+    cache_sizes = {cls: cls.cache_info().maxsize
+                   for cls in (Diagnosis, Custodian)}
+    # every distinct instance stays in the cache of shared instances
+    for cls in cache_sizes:
+        cls.set_cache_size(instances + 1)
+    try:
+        for name, factory in _factories(instances).items():
+            factory(0)
+            gc.collect()
+            tracemalloc.start()
+            objects = [factory(index) for index in range(instances)]
+            allocated = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            # list holding the objects is not a part of the instances
+            allocated -= sys.getsizeof(objects)
+            results[name] = allocated // instances
+            del objects
+    finally:
+        for cls in (Diagnosis, StorageTemperature, Custodian):
+            cls.cache_clear()
+        for cls, maxsize in cache_sizes.items():
+            cls.set_cache_size(maxsize)
+    return results
+
+
+def main():
+    results = measure()
+    report = {name: {"bytes": size,
+                     "target": TARGET_BYTES_PER_INSTANCE[name],
+                     "passed": size <= TARGET_BYTES_PER_INSTANCE[name]}
+              for name, size in results.items()}
+    print(json.dumps(report, indent=2))
+    return 0 if all(result["passed"] for result in report.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
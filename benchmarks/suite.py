@@ -0,0 +1,177 @@
+"""
+Timed scenarios over a synthetic biobank created by benchmarks.generator:
+
+- xml_records: streaming the XML export into patient records
+- xml_parsing: streaming the XML export into resources
+- construction: creating resources, entries and a Bundle from records
+- fhir_interpretation: Bundle.FHIRInterpretation of a fresh Bundle
+- bundle_json: Bundle.bundleJSON() of a fresh Bundle
+- serializer: JSONSerializer.dumps() of a fresh Bundle
+- peak_memory: peak of memory allocated while creating a Bundle from
+  records and calling bundleJSON()
+
+Every scenario is repeated and the best and mean times are reported,
+together with the number of processed resources per second of the best
+run. Results are printed (or written into a file) as JSON, so results
+of different releases can be compared.
+
+Run from the root of the repository::
+
+    python -m benchmarks.suite --patients 1000 --tissues 4 --output out.json
+"""
+import argparse
+import gc
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.serializer import JSONSerializer
+from fhir_biobank.xmlReader import PatientXMLReader
+from benchmarks.generator import Generator, MATERIAL_CODES
+
+SCENARIOS = ("xml_records", "xml_parsing", "construction",
+             "fhir_interpretation", "bundle_json", "serializer",
+             "peak_memory")
+
+_BASE_URL = "https://example.com"
+
+
+def _build_bundle(reader, records):
+    entries = []
+    for record in records:
+        patient, specimens = reader.convert_record(record)
+        entries.append(Entry.from_resource(patient, _BASE_URL))
+        for specimen in specimens:
+            entries.append(Entry.from_resource(specimen, _BASE_URL))
+    return Bundle("benchmark", entries)
+
+
+def _timed(run, setup=None, repeat=5):
+    """
+    Runs setup (not timed) and run repeatedly, the result of setup
+    is passed to run.
+
+    :return: dictionary with the best and mean time in seconds
+    """
+    times = []
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        gc.collect()
+        start = time.perf_counter()
+        run(argument)
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "mean": sum(times) / len(times),
+            "repeat": repeat}
+
+
+def _version(name):
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return None
+
+
+def run(patients: int = 200, tissues: int = 4, diagnosis_materials: int = 1,
+        seed: int = 0, repeat: int = 5, scenarios=SCENARIOS):
+    """
+    Runs the scenarios.
+
+    :param int patients: number of patients of the synthetic biobank
+    :param int tissues: number of LTS tissues of every patient
+    :param int diagnosis_materials: number of STS samples of every patient
+    :param int seed: seed of the generator
+    :param int repeat: number of runs of every scenario
+    :param scenarios: names of the scenarios to run, see SCENARIOS
+
+    :return: dictionary with parameters, environment and results
+    """
+    unknown = set(scenarios).difference(SCENARIOS)
+    if unknown:
+        raise ValueError("unknown scenarios: " + ", ".join(sorted(unknown)))
+
+    generator = Generator(patients, tissues, diagnosis_materials, seed)
+    records = list(generator.records())
+    export = generator.export_xml()
+    reader = PatientXMLReader(io.BytesIO(), material_codes=MATERIAL_CODES)
+    resources = patients + generator.specimenCount
+
+    def new_reader(_=None):
+        return PatientXMLReader(io.BytesIO(export),
+                                material_codes=MATERIAL_CODES)
+
+    def new_bundle(_=None):
+        return _build_bundle(reader, records)
+
+    timed = {
+        "xml_records": lambda: _timed(
+            lambda source: list(source.records()), new_reader, repeat),
+        "xml_parsing": lambda: _timed(
+            lambda source: list(source), new_reader, repeat),
+        "construction": lambda: _timed(new_bundle, None, repeat),
+        "fhir_interpretation": lambda: _timed(
+            lambda bundle: bundle.FHIRInterpretation, new_bundle, repeat),
+        "bundle_json": lambda: _timed(
+            lambda bundle: bundle.bundleJSON(), new_bundle, repeat),
+        "serializer": lambda: _timed(JSONSerializer.dumps, new_bundle,
+                                     repeat),
+    }
+
+    results = {}
+    for name in scenarios:
+        if name == "peak_memory":
+            gc.collect()
+            tracemalloc.start()
+            new_bundle().bundleJSON()
+            results[name] = {"bytes": tracemalloc.get_traced_memory()[1]}
+            tracemalloc.stop()
+        else:
+            result = timed[name]()
+            result["resources_per_second"] = resources / result["best"]
+            results[name] = result
+
+    return {"parameters": {"patients": patients, "tissues": tissues,
+                           "diagnosis_materials": diagnosis_materials,
+                           "seed": seed, "repeat": repeat,
+                           "resources": resources,
+                           "export_bytes": len(export)},
+            "environment": {"python": platform.python_version(),
+                            "implementation":
+                                platform.python_implementation(),
+                            "platform": platform.platform(),
+                            "fhir_biobank": _version("fhir_biobank"),
+                            "fhirclient": _version("fhirclient")},
+            "results": results}
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        description="Runs benchmarks over a synthetic biobank.")
+    parser.add_argument("--patients", type=int, default=200)
+    parser.add_argument("--tissues", type=int, default=4)
+    parser.add_argument("--diagnosis-materials", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                        help="scenario to run, can be repeated, "
+                             "all scenarios are run by default")
+    parser.add_argument("--output", help="file for the results")
+    arguments = parser.parse_args(arguments)
+    report = run(arguments.patients, arguments.tissues,
+                 arguments.diagnosis_materials, arguments.seed,
+                 arguments.repeat, arguments.scenario or SCENARIOS)
+    report = json.dumps(report, indent=2)
+    if arguments.output:
+        with open(arguments.output, "w") as fp:
+            fp.write(report + "\n")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
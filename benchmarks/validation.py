@@ -0,0 +1,97 @@
+"""
+Measures time needed to create resources, entries and bundles in the strict
+and in the trusted validation mode, and time needed to create patients one
+by one and with create_many(). The benchmark fails if the trusted mode
+is not faster than the strict mode.
+
+Run from the root of the repository::
+
+    python -m benchmarks.validation
+"""
+import json
+import sys
+import timeit
+from datetime import date
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.condition import ConditionResource
+from fhir_biobank.diagnosis import Diagnosis
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.specimen import SpecimenResource
+from fhir_biobank.validation import STRICT, TRUSTED, create_many, \
+    validation_mode
+
+
+def _create_batch(patients: int):
+    born = date(1997, 12, 1)
+    collected = date(2021, 11, 4)
+    extensions = [Diagnosis("C509")]
+    entries = []
+    for index in range(patients):
+        patient_id = str(index)
+        patient = PatientResource(patient_id, patient_id, "female", born)
+        specimen = SpecimenResource(patient_id, "BBM:" + patient_id,
+                                    "tissue-frozen", patient, collected, 3.0,
+                                    extensions=extensions)
+        condition = ConditionResource(patient_id, "C509", collected, patient)
+        entries.append(Entry(patient, "https://example.com/Patient/" +
+                             patient_id, "Patient/" + patient_id))
+        entries.append(Entry(specimen, "https://example.com/Specimen/" +
+                             patient_id, "Specimen/" + patient_id))
+        entries.append(Entry(condition, "https://example.com/Condition/" +
+                             patient_id, "Condition/" + patient_id))
+    return Bundle("0", entries)
+
+
+def measure(patients: int = 2000, repeat: int = 5):
+    """
+    Measures the fastest of repeated creations of a Bundle with a patient,
+    a specimen and a condition per patient in each validation mode.
+
+    :param int patients: number of patients in the Bundle
+    :param int repeat: number of measurements in each mode
+
+    :return: dictionary mapping validation mode to seconds
+    """
+    results = {}
+    for mode in (STRICT, TRUSTED):
+        with validation_mode(mode):
+            results[mode] = min(timeit.repeat(
+                lambda: _create_batch(patients), number=1, repeat=repeat))
+    return results
+
+
+def measure_batch(patients: int = 10000, repeat: int = 5):
+    """
+    Measures the fastest of repeated creations of patients one by one and
+    with create_many(), both in the strict mode.
+
+    :param int patients: number of created patients
+    :param int repeat: number of measurements
+
+    :return: dictionary mapping way of creation to seconds
+    """
+    born = date(1997, 12, 1)
+    records = [(str(index), str(index), "female", born)
+               for index in range(patients)]
+    return {
+        "one_by_one": min(timeit.repeat(
+            lambda: [PatientResource(*record) for record in records],
+            number=1, repeat=repeat)),
+        "create_many": min(timeit.repeat(
+            lambda: create_many(PatientResource, records),
+            number=1, repeat=repeat))}
+
+
+def main():
+    results = measure()
+    report = {"seconds": results,
+              "batch_seconds": measure_batch(),
+              "speedup": results[STRICT] / results[TRUSTED],
+              "passed": results[TRUSTED] < results[STRICT]}
+    print(json.dumps(report, indent=2))
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
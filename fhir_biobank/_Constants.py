@@ -128,3 +128,8 @@ BODY_SITE_SYSTEM = "urn:oid:2.16.840.1.113883.6.43.1"
 URL that defines all the possible units of measure for specimen quantity
 """
 SPECIMEN_QUANTITY_SYSTEM = "http://unitsofmeasure.org"
+
+"""
+Namespace of the BBMRI.cz patient XML exports
+"""
+BBMRI_CZ_NAMESPACE = "http://www.bbmri.cz/schemas/biobank/data"
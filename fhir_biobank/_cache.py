@@ -0,0 +1,108 @@
+"""
+Bounded least recently used cache shared by the caches of the package,
+and statistics of a cache in the same form as functools.lru_cache
+reports them.
+"""
+from collections import OrderedDict as _OrderedDict
+from collections import namedtuple as _namedtuple
+from threading import Lock as _Lock
+
+CacheInfo = _namedtuple("CacheInfo",
+                        ["hits", "misses", "evictions", "maxsize",
+                         "currsize"])
+
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used item when it is
+    full, and counts hits, misses and evictions.
+    """
+
+    __slots__ = ("_items", "_maxsize", "_hits", "_misses", "_evictions",
+                 "_lock")
+
+    def __init__(self, maxsize: int):
+        """
+        :param int maxsize: maximal number of items kept in the cache
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when incorrect
+                           value inside argument is provided.
+        """
+        self._check_maxsize(maxsize)
+        self._items = _OrderedDict()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = _Lock()
+
+    @staticmethod
+    def _check_maxsize(maxsize):
+        if not isinstance(maxsize, int) or isinstance(maxsize, bool):
+            raise TypeError("maxsize has to be int!")
+        if maxsize < 1:
+            raise ValueError("maxsize has to be greater than 0!")
+
+    def get(self, key):
+        """
+        Returns the item stored under the key and marks it as recently used.
+
+        :return: stored item, or None when the key is not in the cache
+        """
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._items.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Stores the item, evicting the least recently used one
+        when the cache is full.
+
+        :return: the stored item
+        """
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+                self._evictions += 1
+            return value
+
+    def resize(self, maxsize: int):
+        """
+        Changes maximal number of items, evicting items above the new limit.
+        """
+        self._check_maxsize(maxsize)
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """
+        Removes all items and resets the statistics.
+        """
+        with self._lock:
+            self._items.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def info(self):
+        """
+        :return: CacheInfo with current statistics of the cache
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions,
+                             self._maxsize, len(self._items))
+
+    def __len__(self):
+        return len(self._items)
@@ -0,0 +1,55 @@
+"""
+Building blocks of the native JSON serialization. Every function returns
+a JSON fragment as a string, with keys in the same order as fhirclient
+as_json() creates them.
+"""
+import json as _json
+from datetime import datetime as _datetime, timedelta as _timedelta
+
+from fhir_biobank._Constants import IDENTIFIER_CODES_SYSTEM as \
+    _IDENTIFIER_CODES_SYSTEM
+
+# NaN and Infinity are not JSON, encode raises ValueError for them
+encode = _json.JSONEncoder(ensure_ascii=False, separators=(",", ":"),
+                           check_circular=False, allow_nan=False).encode
+
+
+def coding(code, system, user_selected):
+    return '{"code":' + encode(code) + ',"system":' + encode(system) + \
+           (',"userSelected":true}' if user_selected
+            else ',"userSelected":false}')
+
+
+def codeable_concept(code, system, user_selected=False):
+    return '{"coding":[' + coding(code, system, user_selected) + ']}'
+
+
+def identifier(value, identifier_type):
+    return '[{"type":' + codeable_concept(identifier_type,
+                                          _IDENTIFIER_CODES_SYSTEM,
+                                          True) + \
+           ',"use":"usual","value":' + encode(value) + '}]'
+
+
+def reference(reference_url):
+    return '{"reference":' + encode(reference_url) + '}'
+
+
+def format_date(value):
+    """
+    Formats date the same way as fhirclient FHIRDate does, so the output
+    of both serialization paths is identical.
+    """
+    if not isinstance(value, _datetime):
+        return '"' + value.isoformat() + '"'
+    formatted = value.strftime("%Y-%m-%dT%H:%M:%S")
+    offset = value.utcoffset()
+    if offset is not None:
+        if offset == _timedelta(0):
+            formatted += "Z"
+        else:
+            sign = "+" if offset >= _timedelta(0) else "-"
+            minutes = abs(int(offset.total_seconds())) // 60
+            formatted += "{}{:02d}:{:02d}".format(sign, minutes // 60,
+                                                  minutes % 60)
+    return '"' + formatted + '"'
@@ -0,0 +1,37 @@
+"""
+Deferred imports of fhirclient models. fhirclient is imported only when
+a fhirclient object is created, JSONSerializer does not need it at all.
+"""
+import importlib as _importlib
+import sys as _sys
+import types as _types
+
+
+class LazyModule(_types.ModuleType):
+    """
+    Module proxy that imports the module on the first attribute access.
+    Accessed attributes are copied into the proxy, so later accesses
+    are plain attribute lookups.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+
+    def __getattr__(self, name):
+        module = _importlib.import_module(self.__name__)
+        value = getattr(module, name)
+        setattr(self, name, value)
+        return value
+
+    def __repr__(self):
+        return "<lazy module {!r}>".format(self.__name__)
+
+
+def lazy_import(name: str):
+    """
+    :param string name: full name of the module
+
+    :return: the module if it is already imported, LazyModule otherwise
+    """
+    module = _sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
@@ -0,0 +1,175 @@
+"""
+Declarative specification of constructor arguments, compiled once into
+a single validation function per class.
+"""
+from datetime import date as _date
+
+"""
+Compiled schemas of classes, used for validation of records in batches
+"""
+SCHEMAS = {}
+
+
+class Type:
+    """
+    Argument has to be an instance of the given types.
+    """
+
+    def __init__(self, argument, types, message, optional=False,
+                 exception=TypeError):
+        self.argument = argument
+        self.types = types
+        self.message = message
+        self.optional = optional
+        self.exception = exception
+
+    def source(self, constant):
+        condition = "not isinstance({0}, {1})".format(
+            self.argument, constant(self.types))
+        if self.optional:
+            condition = "{} is not None and ".format(self.argument) + \
+                        condition
+        return ["if {}:".format(condition),
+                "    raise {}({})".format(constant(self.exception),
+                                          constant(self.message))]
+
+
+class Choice:
+    """
+    Argument has to be one of the choices. The message is formatted with
+    the incorrect value, followed by the list of correct values.
+    """
+
+    def __init__(self, argument, choices, message, exception=ValueError,
+                 list_choices=True):
+        self.argument = argument
+        self.choices = frozenset(choices)
+        self.message = message + " ".join(choices) if list_choices \
+            else message
+        self.exception = exception
+
+    def source(self, constant):
+        return ["if {} not in {}:".format(self.argument,
+                                          constant(self.choices)),
+                "    raise {}({}.format({}))".format(
+                    constant(self.exception), constant(self.message),
+                    self.argument)]
+
+
+class NotFuture:
+    """
+    Date in the argument cannot be greater than today's date. Today's date
+    is looked up at most once per call.
+    """
+
+    def __init__(self, argument, message):
+        self.argument = argument
+        self.message = message
+
+    def source(self, constant):
+        return ["if {} is not None:".format(self.argument),
+                "    if today is None:",
+                "        today = _today()",
+                "    if {} > today:".format(self.argument),
+                "        raise ValueError({})".format(
+                    constant(self.message))]
+
+
+class Items:
+    """
+    Every item of the argument has to be an instance of the given types.
+    """
+
+    def __init__(self, argument, types, message, optional=False):
+        self.argument = argument
+        self.types = types
+        self.message = message
+        self.optional = optional
+
+    def source(self, constant):
+        lines = ["for item in {}:".format(self.argument),
+                 "    if not isinstance(item, {}):".format(
+                     constant(self.types)),
+                 "        raise TypeError({})".format(
+                     constant(self.message))]
+        if self.optional:
+            lines = ["if {} is not None:".format(self.argument)] + \
+                    ["    " + line for line in lines]
+        return lines
+
+
+class Rule:
+    """
+    Arguments have to satisfy a relation, expression is a Python expression
+    over the arguments that is true for incorrect arguments.
+    """
+
+    def __init__(self, expression, message, exception=ValueError):
+        self.expression = expression
+        self.message = message
+        self.exception = exception
+
+    def source(self, constant):
+        return ["if {}:".format(self.expression),
+                "    raise {}({})".format(constant(self.exception),
+                                          constant(self.message))]
+
+
+class Schema:
+    """
+    Checks of the constructor arguments of a class, in the order in which
+    they are evaluated. Arguments and their default values are taken from
+    the constructor, except for the validation argument.
+    """
+
+    def __init__(self, cls, checks):
+        self.cls = cls
+        self.checks = checks
+        self.check = self._compile()
+        SCHEMAS[cls] = self
+
+    def _compile(self):
+        init = self.cls.__init__
+        names = init.__code__.co_varnames[:init.__code__.co_argcount]
+        defaults = dict(zip(names[len(names) - len(init.__defaults__ or ()):],
+                            init.__defaults__ or ()))
+        names = [name for name in names if name not in ("self", "validation")]
+        namespace = {"_today": _date.today}
+
+        def constant(value):
+            name = "_c{}".format(len(namespace))
+            namespace[name] = value
+            return name
+
+        lines = ["def check({}, today=None):".format(
+            ", ".join(names))]
+        for check in self.checks:
+            lines.extend("    " + line for line in check.source(constant))
+        exec("\n".join(lines), namespace)
+
+        check = namespace["check"]
+        check.__name__ = "check_" + self.cls.__name__
+        check.__qualname__ = check.__name__
+        check.__defaults__ = tuple(
+            defaults[name] for name in names if name in defaults) + (None,)
+        return check
+
+    def check_many(self, records):
+        """
+        Checks records of arguments, tuples of positional arguments or
+        dictionaries of keyword arguments.
+
+        :return: list of tuples of index of incorrect record and exception
+        """
+        check = self.check
+        today = _date.today()
+        errors = []
+        for index, record in enumerate(records):
+            try:
+                if isinstance(record, dict):
+                    check(today=today, **record)
+                else:
+                    check(*record, today=today)
+            except Exception as error:
+                errors.append((index, error))
+        return errors
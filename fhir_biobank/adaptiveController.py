@@ -0,0 +1,212 @@
+import threading as _threading
+import time as _time
+from collections import namedtuple as _namedtuple
+
+__all__ = ["AdaptiveController", "AdaptiveMetrics"]
+
+AdaptiveMetrics = _namedtuple("AdaptiveMetrics", [
+    "bundle_size", "concurrency", "latency_mean", "error_rate",
+    "bytes_per_second", "increases", "decreases"])
+AdaptiveMetrics.__doc__ = """
+Metrics of an adaptive controller: currently chosen number of entries
+of a Bundle and of concurrent requests, mean latency in seconds, error rate
+and throughput of the last completed window of requests (None before
+the first window is completed) and number of increases and decreases
+of the parameters.
+"""
+
+
+class AdaptiveController:
+    """
+    This class chooses the number of entries of a Bundle and the number
+    of concurrent requests from observed responses of the server, in the
+    AIMD (additive increase, multiplicative decrease) way. Observations are
+    evaluated in windows of `window` requests:
+
+    - if more than max_error_rate of the requests failed with a retryable
+      error (connection error, 408, 429 or 5xx), the server is overloaded
+      and the concurrency is multiplied by `decrease`
+    - otherwise, if the mean latency exceeds target_latency, Bundles are too
+      large and the bundle size is multiplied by `decrease`
+    - otherwise the bundle size grows by size_step and the concurrency by one
+
+    The controller is passed to BundleUploader, which reports its requests
+    and limits concurrent requests, and UploadPipeline creates Bundles of
+    the chosen size::
+
+        controller = AdaptiveController(target_latency=5.0)
+        with BundleUploader(url, concurrency=16,
+                            controller=controller) as uploader:
+            UploadPipeline(uploader).upload("exports")
+        print(controller.metrics())
+    """
+
+    def __init__(self, bundle_size: int = 100, min_bundle_size: int = 10,
+                 max_bundle_size: int = 1000, concurrency: int = 2,
+                 min_concurrency: int = 1, max_concurrency: int = 16,
+                 target_latency: float = 2.0, max_error_rate: float = 0.05,
+                 window: int = 8, size_step: int = None,
+                 decrease: float = 0.5):
+        """
+        :param Optional[int] bundle_size:
+            initial number of entries of a Bundle
+        :param Optional[int] min_bundle_size:
+            minimal number of entries of a Bundle
+        :param Optional[int] max_bundle_size:
+            maximal number of entries of a Bundle
+        :param Optional[int] concurrency:
+            initial number of concurrent requests
+        :param Optional[int] min_concurrency:
+            minimal number of concurrent requests
+        :param Optional[int] max_concurrency:
+            maximal number of concurrent requests
+        :param Optional[float] target_latency:
+            highest acceptable mean latency of a request in seconds
+        :param Optional[float] max_error_rate:
+            highest acceptable fraction of failed requests
+        :param Optional[int] window:
+            number of requests evaluated at once
+        :param Optional[int] size_step:
+            additive increase of the bundle size, min_bundle_size if None
+        :param Optional[float] decrease:
+            multiplicative decrease of the parameters, between 0 and 1
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when incorrect
+                           value inside argument is provided.
+        """
+        if size_step is None:
+            size_step = min_bundle_size
+
+        for name, value in (("bundle_size", bundle_size),
+                            ("min_bundle_size", min_bundle_size),
+                            ("max_bundle_size", max_bundle_size),
+                            ("concurrency", concurrency),
+                            ("min_concurrency", min_concurrency),
+                            ("max_concurrency", max_concurrency),
+                            ("window", window), ("size_step", size_step)):
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise TypeError("{} has to be int!".format(name))
+            if value < 1:
+                raise ValueError("{} has to be greater than 0!".format(name))
+
+        if not min_bundle_size <= bundle_size <= max_bundle_size:
+            raise ValueError("bundle_size has to be between min_bundle_size "
+                             "and max_bundle_size!")
+
+        if not min_concurrency <= concurrency <= max_concurrency:
+            raise ValueError("concurrency has to be between min_concurrency "
+                             "and max_concurrency!")
+
+        for name, value in (("target_latency", target_latency),
+                            ("max_error_rate", max_error_rate),
+                            ("decrease", decrease)):
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                raise TypeError("{} has to be a number!".format(name))
+
+        if target_latency <= 0:
+            raise ValueError("target_latency has to be greater than 0!")
+
+        if not 0 <= max_error_rate <= 1:
+            raise ValueError("max_error_rate has to be between 0 and 1!")
+
+        if not 0 < decrease < 1:
+            raise ValueError("decrease has to be between 0 and 1!")
+
+        self._bundleSize = bundle_size
+        self._minBundleSize = min_bundle_size
+        self._maxBundleSize = max_bundle_size
+        self._concurrency = concurrency
+        self._minConcurrency = min_concurrency
+        self._maxConcurrency = max_concurrency
+        self._targetLatency = target_latency
+        self._maxErrorRate = max_error_rate
+        self._window = window
+        self._sizeStep = size_step
+        self._decrease = decrease
+        self._lock = _threading.Lock()
+        self._observed = []
+        self._last = (None, None, None)
+        self._windowStart = _time.monotonic()
+        self._increases = 0
+        self._decreases = 0
+
+    @property
+    def bundleSize(self):
+        """
+        Getter for the currently chosen number of entries of a Bundle.
+
+        :return: number of entries
+        """
+        return self._bundleSize
+
+    @property
+    def concurrency(self):
+        """
+        Getter for the currently chosen number of concurrent requests.
+
+        :return: number of concurrent requests
+        """
+        return self._concurrency
+
+    @property
+    def maxConcurrency(self):
+        """
+        Getter for the maximal number of concurrent requests.
+
+        :return: number of concurrent requests
+        """
+        return self._maxConcurrency
+
+    def observe(self, latency: float, error: bool = False, size: int = 0):
+        """
+        Method that records a finished request. It is called by
+        BundleUploader, requests rejected by the server (4xx other than
+        408 and 429) should not be recorded.
+
+        :param float latency: duration of the request in seconds
+        :param bool error: True if the request failed with a retryable error
+        :param int size: number of sent bytes
+        """
+        with self._lock:
+            self._observed.append((latency, error, size))
+            if len(self._observed) >= self._window:
+                now = _time.monotonic()
+                self._adjust(self._observed, now - self._windowStart)
+                self._observed = []
+                self._windowStart = now
+
+    def _adjust(self, observed, seconds):
+        latency = sum(item[0] for item in observed) / len(observed)
+        error_rate = sum(1 for item in observed if item[1]) / len(observed)
+        self._last = (latency, error_rate,
+                      sum(item[2] for item in observed) / seconds
+                      if seconds > 0 else None)
+        if error_rate > self._maxErrorRate:
+            concurrency = max(self._minConcurrency,
+                              int(self._concurrency * self._decrease))
+            self._decreases += concurrency != self._concurrency
+            self._concurrency = concurrency
+        elif latency > self._targetLatency:
+            bundle_size = max(self._minBundleSize,
+                              int(self._bundleSize * self._decrease))
+            self._decreases += bundle_size != self._bundleSize
+            self._bundleSize = bundle_size
+        else:
+            bundle_size = min(self._maxBundleSize,
+                              self._bundleSize + self._sizeStep)
+            concurrency = min(self._maxConcurrency, self._concurrency + 1)
+            self._increases += (bundle_size, concurrency) != \
+                (self._bundleSize, self._concurrency)
+            self._bundleSize = bundle_size
+            self._concurrency = concurrency
+
+    def metrics(self):
+        """
+        :return: AdaptiveMetrics of the controller
+        """
+        with self._lock:
+            return AdaptiveMetrics(self._bundleSize, self._concurrency,
+                                   *self._last, self._increases,
+                                   self._decreases)
@@ -1,14 +1,19 @@
 from typing import List, Union
-import fhirclient.models.bundle as _fhirclient_bundle
+from fhir_biobank._lazy import lazy_import as _lazy_import
 
 from fhir_biobank.condition import ConditionResource as ConditionResource
 from fhir_biobank.patient import PatientResource as PatientResource
 from fhir_biobank.specimen import SpecimenResource as SpecimenResource
+import fhir_biobank.validation as _validation
+from fhir_biobank._schema import Schema as _Schema, Type as _Type, \
+    Choice as _Choice, Rule as _Rule, Items as _Items
 
 from fhir_biobank._Constants import BUNDLE_REQUEST_METHOD as \
     _BUNDLE_REQUEST_METHOD
 from fhir_biobank._Constants import BUNDLE_TYPES as _BUNDLE_TYPES
 
+_fhirclient_bundle = _lazy_import("fhirclient.models.bundle")
+
 
 __all__ = ["Entry", "Bundle"]
 
@@ -20,15 +25,19 @@ class Entry:
 
     """
 
+    __slots__ = ("_resource", "_resourceFullUrl", "_resourceShortUrl",
+                 "_requestMethod", "_FHIREntry", "_JSONBytes")
+
     def __init__(self, resource: Union[PatientResource, SpecimenResource,
                                        ConditionResource],
                  resource_full_url: str, resource_short_url: str,
-                 request_method: str = "PUT"):
+                 request_method: str = "PUT", validation: str = None):
         """
 
         :param [PatientResource, SpecimenResource,ConditionResource] resource:
             resource that an entry will contain. It can be either
             PatientResource, SpecimenResource or a ConditionResource.
+            It can be None if the request method is DELETE, see delete().
         :param string resource_full_url:
             full url of the resource that is in the entry.
             for example: https://example.com/Patient/0
@@ -38,46 +47,112 @@ class Entry:
         :param string request_method:
             this method indicates desired action to be preformed for a given
             resource. Correct values are: GET PUT POST DELETE
+        :param Optional[string] validation:
+            validation mode of this call, "strict", "trusted" or "deferred",
+            see fhir_biobank.validation. None uses the current mode.
 
         :raise TypeError: This exception is raised when incorrect
                           types of arguments are provided
         """
-        if not isinstance(resource, PatientResource) \
-                and not isinstance(resource, SpecimenResource) \
-                and not isinstance(resource, ConditionResource):
+        mode = _validation._resolve(validation)
+        if mode != _validation.TRUSTED:
+            try:
+                _check_entry_arguments(resource, resource_full_url,
+                                       resource_short_url, request_method)
+            except Exception as error:
+                _validation._report(error, mode)
+
+        self._resource = resource
+        self._resourceFullUrl = resource_full_url
+        self._resourceShortUrl = resource_short_url
+        self._requestMethod = request_method
+        self._FHIREntry = None
+        self._JSONBytes = None
+
+    @staticmethod
+    def from_resource(resource: Union[PatientResource, SpecimenResource,
+                                      ConditionResource],
+                      base_url: str, request_method: str = "PUT"):
+        """
+        This method creates an Entry whose urls are derived from the type
+        and internal id of the resource. For example PatientResource
+        with id "0" and base_url "https://example.com" gets short url
+        "Patient/0" and full url "https://example.com/Patient/0".
+
+        :param [PatientResource, SpecimenResource,ConditionResource] resource:
+            resource that an entry will contain.
+        :param string base_url:
+            url of the FHIR server, for example: https://example.com
+        :param string request_method:
+            this method indicates desired action to be preformed for a given
+            resource. Correct values are: GET PUT POST DELETE
+
+        :return: Entry containing the resource.
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided
+        """
+        if not isinstance(base_url, str):
+            raise TypeError("base_url has to be a string!")
+
+        if isinstance(resource, PatientResource):
+            short_url = "Patient/" + resource.patientId
+        elif isinstance(resource, SpecimenResource):
+            short_url = "Specimen/" + resource.specimenId
+        elif isinstance(resource, ConditionResource):
+            short_url = "Condition/" + resource.conditionId
+        else:
             raise TypeError("resource type has to be one of the following: "
                             "PatientResource, SpecimenResource or"
                             " ConditionResource")
+        return Entry(resource, base_url.rstrip("/") + "/" + short_url,
+                     short_url, request_method)
+
+    @staticmethod
+    def delete(resource_short_url: str, base_url: str):
+        """
+        This method creates an Entry deleting a resource from the server.
+        The entry contains no resource.
+
+        :param string resource_short_url:
+            short (relative) url of the deleted resource, for example:
+            Patient/0
+        :param string base_url:
+            url of the FHIR server, for example: https://example.com
 
-        if not isinstance(resource_full_url, str):
-            raise TypeError("resource_url has to be a string!")
+        :return: Entry with the DELETE request method.
 
-        if not isinstance(request_method, str):
-            raise TypeError("request_method has to be a string!")
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided
+        """
+        if not isinstance(base_url, str):
+            raise TypeError("base_url has to be a string!")
 
         if not isinstance(resource_short_url, str):
             raise TypeError("resource_short_url has to be a string!")
 
-        if request_method not in _BUNDLE_REQUEST_METHOD:
-            raise TypeError(
-                "{} in request_method is not correct method! "
-                "request_method has to be one of the following".format(
-                    request_method) +
-                " ".join(["{}"] * len(_BUNDLE_REQUEST_METHOD)).format(
-                    *_BUNDLE_REQUEST_METHOD))
-
-        self._resource = resource.FHIRInterpretation
-        self._resourceFullUrl = resource_full_url
-        self._resourceShortUrl = resource_short_url
-        self._requestMethod = request_method
-        self._FHIREntry = None
+        return Entry(None, base_url.rstrip("/") + "/" + resource_short_url,
+                     resource_short_url, "DELETE")
 
     @property
     def resource(self):
         """
         Getter for resource property.
 
-        :return: resource that is contained by the entry.
+        :return: resource that is contained by the entry, None for entries
+            deleting a resource.
+        """
+        if self._resource is None:
+            return None
+        return self._resource.FHIRInterpretation
+
+    @property
+    def sourceResource(self):
+        """
+        Getter for the resource that the entry was created from.
+
+        :return: PatientResource, SpecimenResource or ConditionResource
+            contained by the entry, None for entries deleting a resource.
         """
         return self._resource
 
@@ -143,7 +218,8 @@ class Entry:
         entry_request.url = self._resourceShortUrl
         entry_request.method = self._requestMethod
 
-        FHIREntry.resource = self._resource
+        if self._resource is not None:
+            FHIREntry.resource = self._resource.FHIRInterpretation
         FHIREntry.fullUrl = self._resourceFullUrl
         FHIREntry.request = entry_request
         return FHIREntry
@@ -155,8 +231,11 @@ class Bundle:
     Bundle can be used for sending/returning/storing a set of resources,etc.
     """
 
+    __slots__ = ("_entries", "_id", "_bundle_type", "_FHIRBundle",
+                 "_entryJSONs")
+
     def __init__(self, bundle_id: str, entries: List[Entry],
-                 bundle_type="transaction"):
+                 bundle_type="transaction", validation: str = None):
         """
         :param string bundle_id:
             Internal id that represents unique Bundle
@@ -169,43 +248,30 @@ class Bundle:
             Correct values are: "document", "message", "transaction",
             "transaction-response", "batch", "batch-response", "history",
             "searchset", "collection"
+        :param Optional[string] validation:
+            validation mode of this call, "strict", "trusted" or "deferred",
+            see fhir_biobank.validation. None uses the current mode.
 
         :raise TypeError: This exception is raised when incorrect
                           types of arguments are provided.
         :raise ValueError: This exception is raised when incorrect
                            value inside argument is provided.
         """
-        if not isinstance(bundle_id, str):
-            raise TypeError("bundle_id has to be a string! ")
+        mode = _validation._resolve(validation)
+        if mode != _validation.TRUSTED:
+            try:
+                _check_bundle_arguments(bundle_id, entries, bundle_type)
+            except Exception as error:
+                _validation._report(error, mode)
 
-        if not isinstance(entries, List):
-            raise TypeError(
-                "entries has to be a list containing objects Entry")
-
-        if len(entries) == 0:
-            raise ValueError("entries list cannot be empty!")
-
-        for entry in entries:
-            if not isinstance(entry, Entry):
-                raise TypeError(
-                    "entries has to be a list containing objects Entry")
-
-        if not isinstance(bundle_type, str):
-            raise TypeError("bundle_type has to be a string!")
-
-        if bundle_type not in _BUNDLE_TYPES:
-            raise TypeError("{} in bundle_type is not correct bundle type!"
-                            .format(bundle_type) +
-                            " ".join(["{}"] * len(_BUNDLE_TYPES))
-                            .format(*_BUNDLE_TYPES))
-
-        self._entries = []
-        for entry in entries:
-            self._entries.append(entry.FHIRInterpretation)
+        # incorrect entries reported in the deferred mode are left out
+        self._entries = list(entries) if isinstance(entries, list) or \
+            mode == _validation.TRUSTED else []
 
         self._id = bundle_id
         self._bundle_type = bundle_type
         self._FHIRBundle = None
+        self._entryJSONs = None
 
     @property
     def id(self):
@@ -223,7 +289,16 @@ class Bundle:
 
         :return: List of Entries that are in a Bundle.
         """
-        return self._entries
+        return [entry.FHIRInterpretation for entry in self._entries]
+
+    @property
+    def sourceEntries(self):
+        """
+        Getter for the Entry objects that the bundle was created from.
+
+        :return: List of Entry objects in the order they appear in the Bundle.
+        """
+        return list(self._entries)
 
     @property
     def bundleType(self):
@@ -234,15 +309,76 @@ class Bundle:
         """
         return self._bundle_type
 
+    @property
+    def FHIRInterpretation(self):
+        """
+        Getter for a FHIR object that is created from this class.
+
+        :return: Bundle in a correct FHIR interpretation
+        """
+        if self._FHIRBundle is None:
+            self._FHIRBundle = self._convert_to_FHIR()
+        return self._FHIRBundle
+
+    def append(self, entry: Entry):
+        """
+        Method that adds an Entry at the end of the Bundle. Representations
+        of the other entries that were already created are reused.
+
+        :param Entry entry: Entry to add
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        """
+        if not isinstance(entry, Entry):
+            raise TypeError("entry has to be an Entry!")
+        self._entries.append(entry)
+        self._FHIRBundle = None
+
+    def remove(self, entry: Entry):
+        """
+        Method that removes the first occurrence of an Entry from the Bundle.
+
+        :param Entry entry: Entry to remove
+
+        :raise ValueError: This exception is raised when the Entry is not
+                           in the Bundle, or it is the last Entry
+                           of the Bundle.
+        """
+        if entry not in self._entries:
+            raise ValueError("entry is not in the Bundle!")
+        if len(self._entries) == 1:
+            raise ValueError("entries list cannot be empty!")
+        self._entries.remove(entry)
+        self._FHIRBundle = None
+        if self._entryJSONs is not None and entry not in self._entries:
+            self._entryJSONs.pop(entry, None)
+
+    def __len__(self):
+        return len(self._entries)
+
     def bundleJSON(self):
         """
         Method that creates JSON representation of an Patient Resource.
+        Representation of every Entry is kept, so only entries appended
+        since the last call are converted again.
 
         :return: FHIR Bundle represented in a json format.
         """
-        if self._FHIRBundle is None:
-            self._FHIRBundle = self._convert_to_FHIR()
-        json = str(self._FHIRBundle.as_json()).replace("True", "true")
+        if self._entryJSONs is None:
+            self._entryJSONs = {}
+        entry_jsons = self._entryJSONs
+        parts = []
+        for entry in self._entries:
+            entry_json = entry_jsons.get(entry)
+            if entry_json is None:
+                entry_json = str(entry.entryJSON())
+                entry_jsons[entry] = entry_json
+            parts.append(entry_json)
+        json = "{'id': " + repr(self._id) + ", 'entry': [" + \
+               ", ".join(parts) + "], 'type': " + \
+               repr(self._bundle_type) + ", 'resourceType': 'Bundle'}"
+        json = json.replace("True", "true")
         json = json.replace("False", "false")
         return json
 
@@ -253,7 +389,39 @@ class Bundle:
         """
         FHIRBundle = _fhirclient_bundle.Bundle()
         FHIRBundle.id = self._id
-        FHIRBundle.entry = self._entries
+        FHIRBundle.entry = self.entries
         FHIRBundle.type = self._bundle_type
         return FHIRBundle
 
+
+_check_entry_arguments = _Schema(Entry, [
+    _Rule("resource is None and request_method != 'DELETE'",
+          "resource type has to be one of the following: "
+          "PatientResource, SpecimenResource or ConditionResource",
+          exception=TypeError),
+    _Type("resource", (PatientResource, SpecimenResource, ConditionResource),
+          "resource type has to be one of the following: "
+          "PatientResource, SpecimenResource or ConditionResource",
+          optional=True),
+    _Type("resource_full_url", str, "resource_url has to be a string!"),
+    _Type("request_method", str, "request_method has to be a string!"),
+    _Type("resource_short_url", str,
+          "resource_short_url has to be a string!"),
+    _Choice("request_method", _BUNDLE_REQUEST_METHOD,
+            "{} in request_method is not correct method! "
+            "request_method has to be one of the following",
+            exception=TypeError),
+]).check
+
+_check_bundle_arguments = _Schema(Bundle, [
+    _Type("bundle_id", str, "bundle_id has to be a string! "),
+    _Type("entries", list,
+          "entries has to be a list containing objects Entry"),
+    _Rule("len(entries) == 0", "entries list cannot be empty!"),
+    _Items("entries", Entry,
+           "entries has to be a list containing objects Entry"),
+    _Type("bundle_type", str, "bundle_type has to be a string!"),
+    _Choice("bundle_type", _BUNDLE_TYPES,
+            "{} in bundle_type is not correct bundle type!",
+            exception=TypeError),
+]).check
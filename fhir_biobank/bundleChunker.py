@@ -0,0 +1,242 @@
+from typing import Iterable, Union
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.condition import ConditionResource
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.specimen import SpecimenResource
+from fhir_biobank.serializer import _bundle_header, _bundle_footer, \
+    _entry_bytes
+from fhir_biobank._Constants import BUNDLE_REQUEST_METHOD as \
+    _BUNDLE_REQUEST_METHOD
+from fhir_biobank._Constants import BUNDLE_TYPES as _BUNDLE_TYPES
+
+__all__ = ["BundleChunker"]
+
+
+def _patient_id(entry):
+    """
+    Returns internal id of the patient the resource of the entry belongs to.
+    Entries deleting a resource contain no resource, they are grouped
+    by their url.
+    """
+    resource = entry.sourceResource
+    if resource is None:
+        return entry.resourceShortUrl
+    if isinstance(resource, PatientResource):
+        return resource.patientId
+    if isinstance(resource, SpecimenResource):
+        return resource.subject.patientId
+    return resource.patient.patientId
+
+
+class _Group:
+    """
+    Entries of a single patient, patients first.
+    """
+
+    __slots__ = ("entries", "patients", "size")
+
+    def __init__(self):
+        self.entries = []
+        self.patients = 0
+        self.size = 0
+
+    def add(self, entry, measure):
+        if isinstance(entry.sourceResource, PatientResource):
+            self.entries.insert(self.patients, entry)
+            self.patients += 1
+        else:
+            self.entries.append(entry)
+        if measure:
+            self.size += len(_entry_bytes(entry))
+
+
+class BundleChunker:
+    """
+    This class splits entries into Bundles limited by the number of entries
+    and by the size of the Bundle serialized by JSONSerializer. A patient is
+    always in the same Bundle as the specimens and conditions referencing it,
+    so every Bundle can be uploaded as a transaction on its own. Entries of
+    a patient that alone exceed the limits form a Bundle of their own.
+
+    Example::
+
+        chunker = BundleChunker(max_entries=500, max_bytes=5 * 1024 ** 2,
+                                base_url="https://example.com")
+        for bundle in chunker.chunks(resources):
+            upload(JSONSerializer.dumps(bundle))
+    """
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None,
+                 bundle_type: str = "transaction", base_url: str = None,
+                 request_method: str = "PUT",
+                 bundle_id_prefix: str = "chunk-",
+                 grouped: bool = False):
+        """
+        :param Optional[int] max_entries:
+            maximal number of entries of a Bundle, None for no limit
+        :param Optional[int] max_bytes:
+            maximal size of a Bundle serialized by JSONSerializer in bytes,
+            None for no limit
+        :param Optional[str] bundle_type:
+            type of the created Bundles, see Bundle
+        :param Optional[str] base_url:
+            url of the FHIR server used to create entries for resources
+            that are given without an Entry, see Entry.from_resource.
+        :param Optional[str] request_method:
+            request method of entries created for resources
+        :param Optional[str] bundle_id_prefix:
+            ids of Bundles are the prefix followed by the number of the Bundle
+        :param Optional[bool] grouped:
+            True if all entries of a patient are next to each other in
+            the input, for example when read by PatientXMLReader. Bundles
+            are then created while the input is read, otherwise the whole
+            input is read first.
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when incorrect
+                           value inside argument is provided.
+        """
+        for name, value in (("max_entries", max_entries),
+                            ("max_bytes", max_bytes)):
+            if value is None:
+                continue
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise TypeError("{} has to be int!".format(name))
+            if value < 1:
+                raise ValueError("{} has to be greater than 0!".format(name))
+
+        if not isinstance(bundle_type, str):
+            raise TypeError("bundle_type has to be a string!")
+
+        if bundle_type not in _BUNDLE_TYPES:
+            raise TypeError("{} in bundle_type is not correct bundle type!"
+                            .format(bundle_type) +
+                            " ".join(_BUNDLE_TYPES))
+
+        if base_url is not None and not isinstance(base_url, str):
+            raise TypeError("base_url has to be a string!")
+
+        if request_method not in _BUNDLE_REQUEST_METHOD:
+            raise TypeError(
+                "{} in request_method is not correct method!".format(
+                    request_method))
+
+        if not isinstance(bundle_id_prefix, str):
+            raise TypeError("bundle_id_prefix has to be a string!")
+
+        if not isinstance(grouped, bool):
+            raise TypeError("grouped has to be a boolean!")
+
+        self._maxEntries = max_entries
+        self._maxBytes = max_bytes
+        self._bundleType = bundle_type
+        self._baseUrl = base_url
+        self._requestMethod = request_method
+        self._bundleIdPrefix = bundle_id_prefix
+        self._grouped = grouped
+
+    @property
+    def maxEntries(self):
+        """
+        Getter for the maximal number of entries of a Bundle.
+
+        :return: maximal number of entries, or None
+        """
+        return self._maxEntries
+
+    @property
+    def maxBytes(self):
+        """
+        Getter for the maximal size of a serialized Bundle.
+
+        :return: maximal size in bytes, or None
+        """
+        return self._maxBytes
+
+    def _entry(self, item):
+        if isinstance(item, Entry):
+            return item
+        if not isinstance(item, (PatientResource, SpecimenResource,
+                                 ConditionResource)):
+            raise TypeError("items have to be Entries, PatientResources, "
+                            "SpecimenResources or ConditionResources!")
+        if self._baseUrl is None:
+            raise ValueError(
+                "base_url has to be provided to chunk resources "
+                "without an Entry!")
+        return Entry.from_resource(item, self._baseUrl, self._requestMethod)
+
+    def _groups(self, items):
+        """
+        Groups entries by patient, in the order of the first entry of each
+        patient.
+        """
+        measure = self._maxBytes is not None
+        if self._grouped:
+            current_id = group = None
+            for item in items:
+                entry = self._entry(item)
+                patient_id = _patient_id(entry)
+                if patient_id != current_id:
+                    if group is not None:
+                        yield group
+                    current_id, group = patient_id, _Group()
+                group.add(entry, measure)
+            if group is not None:
+                yield group
+            return
+
+        groups = {}
+        for item in items:
+            entry = self._entry(item)
+            patient_id = _patient_id(entry)
+            group = groups.get(patient_id)
+            if group is None:
+                group = groups[patient_id] = _Group()
+            group.add(entry, measure)
+        yield from groups.values()
+
+    def _fits(self, entries, size, group, bundle_id):
+        if self._maxEntries is not None and \
+                len(entries) + len(group.entries) > self._maxEntries:
+            return False
+        if self._maxBytes is not None:
+            total = len(_bundle_header(bundle_id).encode("utf-8")) + \
+                    len(_bundle_footer(self._bundleType).encode("utf-8")) + \
+                    size + group.size + len(entries) + len(group.entries) - 1
+            if total > self._maxBytes:
+                return False
+        return True
+
+    def chunks(self, items: Iterable[Union[Entry, PatientResource,
+                                           SpecimenResource,
+                                           ConditionResource]]):
+        """
+        Method that splits the items into Bundles.
+
+        :param items: iterable of Entries or resources
+
+        :return: generator of Bundles
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of items are provided.
+        :raise ValueError: This exception is raised when resources are
+                           given without an Entry and base_url is None.
+        """
+        number = 0
+        entries = []
+        size = 0
+        for group in self._groups(items):
+            bundle_id = self._bundleIdPrefix + str(number)
+            if entries and not self._fits(entries, size, group, bundle_id):
+                yield Bundle(bundle_id, entries, self._bundleType)
+                number += 1
+                entries = []
+                size = 0
+            entries.extend(group.entries)
+            size += group.size
+        if entries:
+            yield Bundle(self._bundleIdPrefix + str(number), entries,
+                         self._bundleType)
@@ -0,0 +1,253 @@
+import gzip as _gzip
+import hashlib as _hashlib
+import json as _json
+import os as _os
+from collections import namedtuple as _namedtuple
+from typing import Iterable, Union
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.bundleWriter import BundleWriter
+from fhir_biobank.serializer import JSONSerializer, _entry_bytes, \
+    _resource_json
+from fhir_biobank._json import encode as _encode
+
+__all__ = ["BundleDiff", "DiffStats"]
+
+DiffStats = _namedtuple("DiffStats", ["added", "changed", "removed",
+                                      "unchanged"])
+DiffStats.__doc__ = """
+Number of resources that are only in the new snapshot, that differ
+between the snapshots, that are only in the old snapshot and that are
+the same in both of them.
+"""
+
+# meta elements assigned by the server, not part of the content
+_SERVER_META = ("versionId", "lastUpdated")
+
+
+def _ndjson_paths(source):
+    """
+    Returns NDJSON files of a directory, a single file or a list of files.
+    """
+    if isinstance(source, str):
+        if not _os.path.isdir(source):
+            return [source]
+        return [_os.path.join(source, name)
+                for name in sorted(_os.listdir(source))
+                if name.endswith((".ndjson", ".ndjson.gz"))]
+    paths = list(source) if hasattr(source, "__iter__") else [None]
+    if not all(isinstance(path, str) for path in paths):
+        raise TypeError("snapshot has to be a Bundle, a path or a list "
+                        "of paths of NDJSON files!")
+    return paths
+
+
+class _Snapshot:
+    """
+    Resources of a snapshot as tuples of relative url made of the type
+    and id of the resource, full url (None if it is not known), resource
+    as a dictionary and the source of the resource, an Entry or a line
+    of an NDJSON file.
+    """
+
+    def __init__(self, source):
+        if isinstance(source, Bundle):
+            self._bundle = source
+            self._paths = None
+        else:
+            self._bundle = None
+            self._paths = _ndjson_paths(source)
+
+    def __iter__(self):
+        if self._bundle is not None:
+            for entry in self._bundle.sourceEntries:
+                # entries deleting a resource are not part of a snapshot
+                if entry.sourceResource is None:
+                    continue
+                # the url of the entry does not have to be canonical,
+                # for example patient/0
+                resource = _json.loads(_resource_json(entry.sourceResource))
+                yield (resource["resourceType"] + "/" + resource["id"],
+                       entry.resourceFullUrl, resource, entry)
+            return
+        for path in self._paths:
+            opener = _gzip.open if path.endswith(".gz") else open
+            with opener(path, "rb") as fp:
+                for line in fp:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    resource = _json.loads(line)
+                    yield (resource["resourceType"] + "/" + resource["id"],
+                           None, resource, line)
+
+
+class BundleDiff:
+    """
+    This class compares two snapshots of the same collection and creates
+    a transaction Bundle that turns the old snapshot into the new one:
+    PUT entries for new and changed resources and DELETE entries
+    for removed resources. Unchanged resources are left out, so the Bundle
+    is usually a small fraction of the collection::
+
+        diff = BundleDiff("https://example.com/fhir")
+        with open("delta.json", "wb") as fp:
+            stats = diff.write("export-2021-12", "export-2022-01", fp,
+                               "delta-2022-01")
+
+    A snapshot is a Bundle, or NDJSON files written by NDJSONExporter
+    (a directory, a single file or a list of files, gzip-compressed if their
+    name ends with .gz). Resources are matched by their type and id
+    and compared by a digest of their canonical JSON, which does not
+    depend on the order of keys or on the version and update time
+    the server assigned.
+    """
+
+    def __init__(self, base_url: str = None):
+        """
+        :param Optional[string] base_url: url of the FHIR server used
+            for entry urls of resources from NDJSON files. Entries
+            of Bundles keep their own urls.
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        """
+        if base_url is not None and not isinstance(base_url, str):
+            raise TypeError("base_url has to be a string!")
+
+        self._baseUrl = base_url
+
+    @property
+    def baseUrl(self):
+        """
+        Getter for the url of the FHIR server.
+
+        :return: base url, None if it is not set
+        """
+        return self._baseUrl
+
+    @staticmethod
+    def digest(resource: dict):
+        """
+        :param dict resource: resource as a dictionary, for example
+            a line of an NDJSON file loaded by json.loads()
+
+        :return: SHA-256 digest of the canonical JSON of the resource
+        """
+        meta = resource.get("meta")
+        if meta and any(key in meta for key in _SERVER_META):
+            resource = dict(resource)
+            meta = {key: value for key, value in meta.items()
+                    if key not in _SERVER_META}
+            if meta:
+                resource["meta"] = meta
+            else:
+                del resource["meta"]
+        return _hashlib.sha256(_json.dumps(
+            resource, sort_keys=True, separators=(",", ":"),
+            ensure_ascii=False).encode("utf-8")).digest()
+
+    def _full_url(self, short_url):
+        if self._baseUrl is None:
+            raise ValueError("base_url has to be given to compare "
+                             "NDJSON snapshots!")
+        return self._baseUrl.rstrip("/") + "/" + short_url
+
+    def _changes(self, old, new):
+        """
+        Returns entries of the delta in the order of the new snapshot,
+        deletions last, and DiffStats.
+        """
+        old, new = _Snapshot(old), _Snapshot(new)
+        known = {short_url: (self.digest(resource), full_url)
+                 for short_url, full_url, resource, _ in old}
+
+        changes = []
+        added = changed = unchanged = 0
+        for short_url, full_url, resource, source in new:
+            previous = known.pop(short_url, None)
+            if previous is None:
+                added += 1
+            elif previous[0] != self.digest(resource):
+                changed += 1
+            else:
+                unchanged += 1
+                continue
+            changes.append((short_url, full_url, source))
+
+        removed = [(short_url, full_url or self._full_url(short_url))
+                   for short_url, (_, full_url) in known.items()]
+        return changes, removed, DiffStats(added, changed, len(removed),
+                                           unchanged)
+
+    def to_bundle(self, old: Union[Bundle, str, Iterable[str]],
+                  new: Bundle, bundle_id: str):
+        """
+        Method that creates the delta of two snapshots as a Bundle.
+
+        :param old: old snapshot, a Bundle or NDJSON files
+        :param Bundle new: new snapshot
+        :param string bundle_id: Internal id that represents unique Bundle
+
+        :return: transaction Bundle, None if the snapshots are the same,
+            as a Bundle cannot be empty
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when base_url is needed
+                           for NDJSON files and is not set.
+        """
+        if not isinstance(new, Bundle):
+            raise TypeError("new has to be a Bundle, use write() "
+                            "for NDJSON files!")
+
+        changes, removed, _ = self._changes(old, new)
+        entries = [entry if entry.requestMethod == "PUT" else
+                   Entry(entry.sourceResource, full_url, short_url, "PUT")
+                   for short_url, full_url, entry in changes]
+        entries.extend(Entry(None, full_url, short_url, "DELETE")
+                       for short_url, full_url in removed)
+        if not entries:
+            return None
+        return Bundle(bundle_id, entries)
+
+    def write(self, old: Union[Bundle, str, Iterable[str]],
+              new: Union[Bundle, str, Iterable[str]], fp, bundle_id: str):
+        """
+        Method that writes the delta of two snapshots as a transaction
+        Bundle into a binary file-like object, see BundleWriter. The Bundle
+        is written also when the snapshots are the same, without
+        the entry element, so the output is always a valid Bundle.
+
+        :param old: old snapshot, a Bundle or NDJSON files
+        :param new: new snapshot, a Bundle or NDJSON files
+        :param fp: binary file-like object
+        :param string bundle_id: Internal id that represents unique Bundle
+
+        :return: DiffStats, the snapshots are the same when no resource
+            was added, changed or removed
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when base_url is needed
+                           for NDJSON files and is not set.
+        """
+        changes, removed, stats = self._changes(old, new)
+        with BundleWriter(fp, bundle_id) as writer:
+            for short_url, full_url, source in changes:
+                if isinstance(source, Entry):
+                    if source.requestMethod != "PUT":
+                        source = Entry(source.sourceResource, full_url,
+                                       short_url, "PUT")
+                    writer.write_serialized(_entry_bytes(source))
+                    continue
+                # the line is written as it is, without parsing it again
+                writer.write_serialized(
+                    ('{"fullUrl":' + _encode(self._full_url(short_url)) +
+                     ',"request":{"method":"PUT","url":' +
+                     _encode(short_url) + '},"resource":').encode("utf-8") +
+                    source + b"}")
+            for short_url, full_url in removed:
+                writer.write_serialized(JSONSerializer.dumps(
+                    Entry(None, full_url, short_url, "DELETE")))
+        return stats
@@ -0,0 +1,213 @@
+from typing import Iterable, Union
+
+from fhir_biobank.bundle import Entry
+from fhir_biobank.condition import ConditionResource
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.specimen import SpecimenResource
+from fhir_biobank.serializer import JSONSerializer
+from fhir_biobank._json import encode as _encode
+from fhir_biobank._Constants import BUNDLE_REQUEST_METHOD as \
+    _BUNDLE_REQUEST_METHOD
+from fhir_biobank._Constants import BUNDLE_TYPES as _BUNDLE_TYPES
+
+__all__ = ["BundleWriter"]
+
+
+class BundleWriter:
+    """
+    This class writes a Bundle into a binary file-like object entry by entry,
+    so the whole Bundle never has to be kept in memory. Output is the same
+    as JSONSerializer.dumps() of a Bundle with the same entries. A Bundle
+    without entries is written without the entry element, as FHIR does not
+    allow an empty one.
+
+    BundleWriter is used as a context manager::
+
+        with open("bundle.json", "wb") as fp:
+            with BundleWriter(fp, "42", base_url="https://example.com") \\
+                    as writer:
+                writer.write_all(resources)
+    """
+
+    def __init__(self, fp, bundle_id: str, bundle_type: str = "transaction",
+                 base_url: str = None, request_method: str = "PUT"):
+        """
+        :param fp:
+            binary file-like object with a write() method.
+        :param string bundle_id:
+            Internal id that represents unique Bundle
+        :param Optional[str] bundle_type:
+            String that indicates the purpose of this Bundle.
+            Correct values are: "document", "message", "transaction",
+            "transaction-response", "batch", "batch-response", "history",
+            "searchset", "collection"
+        :param Optional[str] base_url:
+            url of the FHIR server used to create entries for resources
+            that are written without an Entry, see Entry.from_resource.
+        :param Optional[str] request_method:
+            request method of entries created for resources that are written
+            without an Entry. Correct values are: GET PUT POST DELETE
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        """
+        if not hasattr(fp, "write"):
+            raise TypeError("fp has to be a binary file-like object!")
+
+        if not isinstance(bundle_id, str):
+            raise TypeError("bundle_id has to be a string! ")
+
+        if not isinstance(bundle_type, str):
+            raise TypeError("bundle_type has to be a string!")
+
+        if bundle_type not in _BUNDLE_TYPES:
+            raise TypeError("{} in bundle_type is not correct bundle type!"
+                            .format(bundle_type) +
+                            " ".join(["{}"] * len(_BUNDLE_TYPES))
+                            .format(*_BUNDLE_TYPES))
+
+        if base_url is not None and not isinstance(base_url, str):
+            raise TypeError("base_url has to be a string!")
+
+        if not isinstance(request_method, str):
+            raise TypeError("request_method has to be a string!")
+
+        if request_method not in _BUNDLE_REQUEST_METHOD:
+            raise TypeError(
+                "{} in request_method is not correct method! "
+                "request_method has to be one of the following".format(
+                    request_method) +
+                " ".join(["{}"] * len(_BUNDLE_REQUEST_METHOD)).format(
+                    *_BUNDLE_REQUEST_METHOD))
+
+        self._fp = fp
+        self._id = bundle_id
+        self._bundleType = bundle_type
+        self._baseUrl = base_url
+        self._requestMethod = request_method
+        self._entryCount = 0
+        self._opened = False
+        self._closed = False
+
+    @property
+    def id(self):
+        """
+        Getter for bundle id - internal id that represents unique Bundle
+
+        :return: String - internal id that represents unique Bundle.
+        """
+        return self._id
+
+    @property
+    def bundleType(self):
+        """
+        Getter for a Bundle type that indicates purpose of this Bundle.
+
+        :return:  String that indicates the purpose of this Bundle.
+        """
+        return self._bundleType
+
+    @property
+    def entryCount(self):
+        """
+        Getter for a number of entries written so far.
+
+        :return: number of entries written into the Bundle.
+        """
+        return self._entryCount
+
+    def open(self):
+        """
+        Method that writes the beginning of the Bundle. It is called
+        automatically when the writer is used as a context manager.
+        """
+        if self._opened:
+            raise ValueError("BundleWriter is already opened!")
+        # the entry element is started by the first entry
+        self._fp.write(('{"id":' + _encode(self._id)).encode("utf-8"))
+        self._opened = True
+
+    def write(self, item: Union[Entry, PatientResource, SpecimenResource,
+                                ConditionResource]):
+        """
+        Method that writes a single entry into the Bundle.
+
+        :param item:
+            Entry to write, or PatientResource, SpecimenResource or
+            ConditionResource that is wrapped into an Entry
+            with Entry.from_resource.
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when a resource is
+                           written without base_url
+        """
+        if not isinstance(item, Entry):
+            if self._baseUrl is None:
+                raise ValueError(
+                    "base_url has to be provided to write resources "
+                    "that are not wrapped in an Entry!")
+            item = Entry.from_resource(item, self._baseUrl,
+                                       self._requestMethod)
+        self.write_serialized(JSONSerializer.dumps(item))
+
+    def write_all(self, items: Iterable[Union[Entry, PatientResource,
+                                              SpecimenResource,
+                                              ConditionResource]]):
+        """
+        Method that writes every item of the iterable into the Bundle.
+        Items are consumed one at a time, so generators can be used to keep
+        the memory usage flat.
+
+        :param items: iterable of Entries or resources, see write()
+
+        :return: number of entries written by this call
+        """
+        count = 0
+        for item in items:
+            self.write(item)
+            count += 1
+        return count
+
+    def write_serialized(self, entry_json: bytes):
+        """
+        Method that writes an already serialized entry into the Bundle,
+        for example one created by JSONSerializer.dumps() in another process.
+
+        :param bytes entry_json: UTF-8 encoded JSON representation of an Entry
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when the writer
+                           is not opened or is already closed
+        """
+        if not isinstance(entry_json, bytes):
+            raise TypeError("entry_json has to be bytes!")
+        if not self._opened or self._closed:
+            raise ValueError("BundleWriter has to be opened to write entries!")
+        self._fp.write(b"," if self._entryCount else b',"entry":[')
+        self._fp.write(entry_json)
+        self._entryCount += 1
+
+    def close(self):
+        """
+        Method that writes the end of the Bundle. It is called automatically
+        when the writer is used as a context manager.
+        """
+        if not self._opened:
+            raise ValueError("BundleWriter has to be opened first!")
+        if not self._closed:
+            self._fp.write(((']' if self._entryCount else '') +
+                            ',"type":' + _encode(self._bundleType) +
+                            ',"resourceType":"Bundle"}').encode("utf-8"))
+            self._closed = True
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # incomplete bundle is deliberately left without its end,
+        # so it can not be mistaken for a valid one
+        if exc_type is None:
+            self.close()
@@ -1,13 +1,18 @@
-from datetime import datetime, date
+from datetime import date
 
-import fhirclient.models.meta as _fhirclient_meta
-import fhirclient.models.condition as _fhirclient_condition
-import fhirclient.models.fhirdate as _fhirclient_date
+from fhir_biobank._lazy import lazy_import as _lazy_import
 
 from fhir_biobank.patient import PatientResource
 from fhir_biobank._Constants import META_PROFILE_URL as _META_PROFILE_URL
 from fhir_biobank._Constants import  ICD_CODING_SYSTEM as _ICD_CODING_SYSTEM
 from fhir_biobank.helperFunctions import Helper
+import fhir_biobank.validation as _validation
+from fhir_biobank._schema import Schema as _Schema, Type as _Type, \
+    NotFuture as _NotFuture
+
+_fhirclient_meta = _lazy_import("fhirclient.models.meta")
+_fhirclient_condition = _lazy_import("fhirclient.models.condition")
+_fhirclient_date = _lazy_import("fhirclient.models.fhirdate")
 
 __all__ = ["ConditionResource"]
 
@@ -17,9 +22,12 @@ class ConditionResource:
     This class represents medical condition or diagnosis of a patient.
     """
 
+    __slots__ = ("_conditionId", "_conditionCode", "_startingDateCondition",
+                 "_patient", "_FHIRCondition")
+
     def __init__(self, condition_id: str, condition_code: str,
                  starting_date_condition: date,
-                 patient: PatientResource):
+                 patient: PatientResource, validation: str = None):
         """
         :param string condition_id:
             Internal id that represents unique Condition,
@@ -31,24 +39,22 @@ class ConditionResource:
             opinion of a clinician
         :param PatientResource patient:
             Indicates which patient is associated with the condition.
+        :param Optional[string] validation:
+            validation mode of this call, "strict", "trusted" or "deferred",
+            see fhir_biobank.validation. None uses the current mode.
 
         :raise TypeError: This exception is raised when incorrect
             Types of arguments are provided.
         :raise ValueError: This exception is raised when incorrect
             value inside argument is provided.
         """
-        if not isinstance(condition_id, str):
-            raise TypeError("condition_id has to be a string!")
-
-        if not isinstance(starting_date_condition, date):
-            raise TypeError("starting_date_condition has to be a datetime!")
-        if starting_date_condition > datetime.today().date():
-            raise ValueError(
-                "starting_date_condition cannot be greater than today!")
-        if not isinstance(condition_code, str):
-            raise TypeError("condition_code has to be a string!")
-        if not isinstance(patient, PatientResource):
-            raise TypeError("patient has to be a PatientResource!")
+        mode = _validation._resolve(validation)
+        if mode != _validation.TRUSTED:
+            try:
+                _check_arguments(condition_id, condition_code,
+                                 starting_date_condition, patient)
+            except Exception as error:
+                _validation._report(error, mode)
 
         self._conditionId = condition_id
         self._conditionCode = condition_code
@@ -141,3 +147,13 @@ class ConditionResource:
         condition.subject = subject
         return condition
 
+
+_check_arguments = _Schema(ConditionResource, [
+    _Type("condition_id", str, "condition_id has to be a string!"),
+    _Type("starting_date_condition", date,
+          "starting_date_condition has to be a datetime!"),
+    _NotFuture("starting_date_condition",
+               "starting_date_condition cannot be greater than today!"),
+    _Type("condition_code", str, "condition_code has to be a string!"),
+    _Type("patient", PatientResource, "patient has to be a PatientResource!"),
+]).check
@@ -0,0 +1,275 @@
+import hashlib as _hashlib
+import json as _json
+import sqlite3 as _sqlite3
+import threading as _threading
+import time as _time
+
+from fhir_biobank import __version__
+from fhir_biobank.bundle import Entry
+from fhir_biobank.serializer import JSONSerializer
+from fhir_biobank.xmlReader import PatientXMLReader
+from fhir_biobank._cache import CacheInfo as _CacheInfo
+
+__all__ = ["ConversionCache"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resources (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resources_used ON resources (used);
+"""
+
+
+# caches opened by worker processes, see ConversionCache.__reduce__
+_OPENED = {}
+
+
+def _reopen(path, max_bytes):
+    cache = _OPENED.get((path, max_bytes))
+    if cache is None:
+        cache = _OPENED[path, max_bytes] = ConversionCache(path, max_bytes)
+    return cache
+
+
+def _encode(resources):
+    return b"\n".join(resource_type.encode("ascii") + b"\t" + resource_json
+                      for resource_type, resource_json in resources)
+
+
+def _decode(value):
+    resources = []
+    for line in value.split(b"\n"):
+        resource_type, resource_json = line.split(b"\t", 1)
+        resources.append((resource_type.decode("ascii"), resource_json))
+    return resources
+
+
+class ConversionCache:
+    """
+    This class is an on-disk cache of serialized resources, stored
+    in an SQLite database. Resources converted from a patient record
+    of PatientXMLReader are stored under a hash of the normalized record,
+    the conversion options and the version of the library, so a re-export
+    of an archive converts only the records that changed since the last
+    export, and a new version of the library never reuses old results.
+    When the cache grows over max_bytes, the least recently used records
+    are evicted.
+
+    DirectoryIngestor uses the cache when it is given one::
+
+        with ConversionCache("conversion.cache", 512 * 1024 ** 2) as cache:
+            DirectoryIngestor(cache=cache).to_ndjson("exports", "output")
+            print(cache.cache_info(), cache.hit_rate())
+
+    A cache passed to worker processes is opened once in every worker,
+    hits and misses are counted separately by every process.
+    """
+
+    def __init__(self, path: str, max_bytes: int = None):
+        """
+        :param string path: path of the database file, created if it
+            does not exist
+        :param Optional[int] max_bytes: maximal size of cached resources
+            in bytes, None for no limit
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when incorrect
+                           value inside argument is provided.
+        """
+        if not isinstance(path, str):
+            raise TypeError("path has to be a string!")
+
+        if max_bytes is not None:
+            if not isinstance(max_bytes, int) or isinstance(max_bytes, bool):
+                raise TypeError("max_bytes has to be int!")
+            if max_bytes < 1:
+                raise ValueError("max_bytes has to be greater than 0!")
+
+        self._path = path
+        self._maxBytes = max_bytes
+        self._lock = _threading.Lock()
+        self._connection = _sqlite3.connect(path, check_same_thread=False,
+                                            isolation_level=None,
+                                            timeout=60.0)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._added = 0
+
+    def __reduce__(self):
+        return _reopen, (self._path, self._maxBytes)
+
+    @property
+    def path(self):
+        """
+        Getter for the path of the database file.
+
+        :return: path
+        """
+        return self._path
+
+    @property
+    def maxBytes(self):
+        """
+        Getter for the maximal size of cached resources.
+
+        :return: maximal size in bytes, or None
+        """
+        return self._maxBytes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Evicts records over the size limit and closes the database.
+        """
+        with self._lock:
+            self._evict()
+            self._connection.close()
+
+    @staticmethod
+    def key(record: dict, *options):
+        """
+        Method that computes the key of a record.
+
+        :param dict record: patient record, see PatientXMLReader.records()
+        :param options: other values the conversion depends on, they have
+            to be serializable to JSON
+
+        :return: hexadecimal SHA-256 digest of the normalized record,
+            the options and the version of the library
+        """
+        normalized = _json.dumps([__version__, record, options],
+                                 sort_keys=True, ensure_ascii=False,
+                                 separators=(",", ":"))
+        return _hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """
+        :param string key: key of a record, see key()
+
+        :return: list of tuples of resource type and serialized resource,
+            or None if the key is not cached
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM resources WHERE key = ?",
+                (key,)).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._connection.execute(
+                "UPDATE resources SET used = ? WHERE key = ?",
+                (_time.time(), key))
+        return _decode(row[0])
+
+    def put(self, key: str, resources):
+        """
+        Method that stores serialized resources of a record.
+
+        :param string key: key of the record, see key()
+        :param resources: list of tuples of resource type and
+            serialized resource, see JSONSerializer.dumps()
+        """
+        value = _encode(resources)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?)",
+                (key, value, len(value), _time.time()))
+            self._added += len(value)
+            # summing the sizes of all the records is not cheap, evict
+            # only after a part of the limit was added
+            if self._maxBytes is not None and \
+                    self._added * 16 > self._maxBytes:
+                self._evict()
+
+    def _evict(self):
+        self._added = 0
+        if self._maxBytes is None:
+            return
+        connection = self._connection
+        size = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM resources").fetchone()[0]
+        if size <= self._maxBytes:
+            return
+        evicted = []
+        for key, record_size in connection.execute(
+                "SELECT key, size FROM resources ORDER BY used"):
+            evicted.append((key,))
+            size -= record_size
+            if size <= self._maxBytes:
+                break
+        connection.executemany("DELETE FROM resources WHERE key = ?",
+                               evicted)
+        self._evictions += len(evicted)
+
+    def convert(self, reader: PatientXMLReader, record: dict,
+                base_url: str = None):
+        """
+        Method that converts a record into serialized resources, or returns
+        them from the cache.
+
+        :param PatientXMLReader reader: reader of the record, its material
+            codes are part of the key
+        :param dict record: patient record, see PatientXMLReader.records()
+        :param Optional[str] base_url: if given, serialized Entries with
+            this base url are created instead of serialized resources
+
+        :return: list of tuples of resource type and serialized resource
+            or Entry, patient first
+        """
+        key = self.key(record, reader.defaultMaterialCode,
+                       reader.materialCodes, base_url)
+        resources = self.get(key)
+        if resources is not None:
+            return resources
+        patient, specimens = reader.convert_record(record)
+        resources = [("Patient", patient)] + [("Specimen", specimen)
+                                               for specimen in specimens]
+        if base_url is None:
+            resources = [(resource_type, JSONSerializer.dumps(resource))
+                         for resource_type, resource in resources]
+        else:
+            resources = [(resource_type, JSONSerializer.dumps(
+                Entry.from_resource(resource, base_url)))
+                for resource_type, resource in resources]
+        self.put(key, resources)
+        return resources
+
+    def clear(self):
+        """
+        Removes all the records.
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM resources")
+
+    def cache_info(self):
+        """
+        :return: CacheInfo with hits, misses and evictions of this process,
+            maximal and current size of the cache in bytes
+        """
+        with self._lock:
+            size = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM resources").fetchone()[0]
+            return _CacheInfo(self._hits, self._misses, self._evictions,
+                              self._maxBytes, size)
+
+    def hit_rate(self):
+        """
+        :return: fraction of lookups of this process that were hits,
+            None before the first lookup
+        """
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups else None
@@ -0,0 +1,206 @@
+import hashlib as _hashlib
+import json as _json
+import os as _os
+from collections import namedtuple as _namedtuple
+from typing import List
+
+__all__ = ["ConversionManifest", "ManifestEntry"]
+
+ManifestEntry = _namedtuple("ManifestEntry", ["size", "mtime_ns", "digest",
+                                              "resources"])
+ManifestEntry.__doc__ = """
+Recorded state of a converted source file: its size in bytes, modification
+time in nanoseconds, SHA-256 digest of its content and relative urls
+of the resources converted from it, for example Patient/0.
+"""
+
+_FORMAT = 1
+
+
+class ConversionManifest:
+    """
+    This class records, for every converted source XML file, its size,
+    modification time and content digest together with the resources
+    converted from it. It is passed to DirectoryIngestor.to_bundle(),
+    which then converts only new and changed files and deletes resources
+    whose source disappeared::
+
+        manifest = ConversionManifest("exports.manifest")
+        with open("changes.json", "wb") as fp:
+            DirectoryIngestor().to_bundle("exports", fp, "nightly",
+                                          "https://example.com/fhir",
+                                          manifest=manifest)
+        with open("changes.json", "rb") as fp:
+            uploader.upload(fp.read(), "nightly")
+        manifest.save()
+
+    A file with the recorded size and modification time is not read at all,
+    a file whose content has the recorded digest is not converted.
+    The manifest is a JSON file, it is replaced atomically by save().
+    to_bundle() does not save the manifest, it is saved only after
+    the changes were uploaded.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param string path: path of the manifest file, it does not have
+            to exist
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when the file
+                           is not a manifest.
+        """
+        if not isinstance(path, str):
+            raise TypeError("path has to be a string!")
+
+        self._path = path
+        self._options = None
+        self._files = {}
+        if not _os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as fp:
+            content = _json.load(fp)
+        if not isinstance(content, dict) or content.get("format") != _FORMAT:
+            raise ValueError("{} is not a conversion manifest!".format(path))
+        self._options = content["options"]
+        self._files = {name: ManifestEntry(*entry)
+                       for name, entry in content["files"].items()}
+
+    @property
+    def path(self):
+        """
+        Getter for the path of the manifest file.
+
+        :return: path
+        """
+        return self._path
+
+    @property
+    def options(self):
+        """
+        Getter for the conversion options the files were converted with,
+        see matches().
+
+        :return: options, None for an empty manifest
+        """
+        return self._options
+
+    def __len__(self):
+        return len(self._files)
+
+    def __contains__(self, name):
+        return name in self._files
+
+    def __iter__(self):
+        return iter(list(self._files))
+
+    @staticmethod
+    def digest(data: bytes):
+        """
+        :param bytes data: content of a file
+
+        :return: hexadecimal SHA-256 digest of the content
+        """
+        return _hashlib.sha256(data).hexdigest()
+
+    def matches(self, options: list):
+        """
+        Method that checks whether the recorded files were converted
+        with the given options. Otherwise all the files have to be
+        converted again.
+
+        :param list options: JSON serializable conversion options
+
+        :return: True if the options are the recorded ones
+        """
+        # compare what would be loaded back from the file
+        return self._options == _json.loads(_json.dumps(options))
+
+    def set_options(self, options: list):
+        """
+        Method that records the conversion options.
+
+        :param list options: JSON serializable conversion options
+        """
+        self._options = _json.loads(_json.dumps(options))
+
+    def get(self, name: str):
+        """
+        :param string name: name of a source file
+
+        :return: ManifestEntry of the file, None if it is not recorded
+        """
+        return self._files.get(name)
+
+    def is_unchanged(self, name: str, stat: _os.stat_result):
+        """
+        Method that checks the size and modification time of a file,
+        without reading it.
+
+        :param string name: name of a source file
+        :param os.stat_result stat: result of os.stat() of the file
+
+        :return: True if the file is recorded with the same size
+            and modification time
+        """
+        entry = self._files.get(name)
+        return entry is not None and entry.size == stat.st_size and \
+            entry.mtime_ns == stat.st_mtime_ns
+
+    def record(self, name: str, size: int, mtime_ns: int, digest: str,
+               resources: List[str]):
+        """
+        Method that records a converted file.
+
+        :param string name: name of the source file
+        :param int size: size of the file in bytes
+        :param int mtime_ns: modification time of the file in nanoseconds
+        :param string digest: digest of the content, see digest()
+        :param List[str] resources: relative urls of the resources
+            converted from the file
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        """
+        if not isinstance(name, str):
+            raise TypeError("name has to be a string!")
+
+        if not isinstance(digest, str):
+            raise TypeError("digest has to be a string!")
+
+        resources = list(resources)
+        if not all(isinstance(resource, str) for resource in resources):
+            raise TypeError("resources have to be strings!")
+
+        self._files[name] = ManifestEntry(size, mtime_ns, digest, resources)
+
+    def remove(self, name: str):
+        """
+        Method that forgets a file.
+
+        :param string name: name of a source file
+
+        :return: removed ManifestEntry, None if the file is not recorded
+        """
+        return self._files.pop(name, None)
+
+    def resources(self):
+        """
+        :return: set of relative urls of resources of all recorded files
+        """
+        return {resource for entry in self._files.values()
+                for resource in entry.resources}
+
+    def save(self):
+        """
+        Method that writes the manifest. A temporary file replaces
+        the manifest file, so an interrupted write keeps the previous one.
+        """
+        temporary = self._path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as fp:
+            _json.dump({"format": _FORMAT, "options": self._options,
+                        "files": {name: list(entry) for name, entry
+                                  in self._files.items()}},
+                       fp, separators=(",", ":"))
+        _os.replace(temporary, self._path)
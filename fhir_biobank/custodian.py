@@ -1,18 +1,29 @@
 from fhir_biobank._Constants import CUSTODIAN_URL
 from fhir_biobank.helperFunctions import Helper
+from fhir_biobank._cache import LRUCache as _LRUCache
+from fhir_biobank._json import encode as _encode, reference as _reference
 
-import fhirclient.models.extension as _fhirclient_extension
+from fhir_biobank._lazy import lazy_import as _lazy_import
+
+_fhirclient_extension = _lazy_import("fhirclient.models.extension")
 
 __all__ = ["Custodian"]
 
+_INTERNED = _LRUCache(1024)
+
 
 class Custodian:
     """
      This class represents reference to a Organization from which a specimen
      comes from. URL of the extension is already provided.
+
+     Instances are immutable and shared - creating Custodian with the same
+     reference returns the same instance from a bounded cache.
     """
 
-    def __init__(self, reference: str):
+    __slots__ = ("_reference", "_url", "_JSONFragment")
+
+    def __new__(cls, reference: str):
         """
         :param string reference:  short url of a resource, same as in
             Entry Resource defined in bundle. For example custodian/0
@@ -23,21 +34,73 @@ class Custodian:
         if not isinstance(reference, str):
             raise TypeError("reference needs to be a string!")
 
-        self._reference = reference
-        self._url = CUSTODIAN_URL
-        extension = _fhirclient_extension.Extension()
-        extension.url = self._url
-        extension.valueReference = Helper.create_fhir_reference(reference)
-        self._extension = extension
+        instance = _INTERNED.get(reference)
+        if instance is not None:
+            return instance
+
+        instance = object.__new__(cls)
+        object.__setattr__(instance, "_reference", reference)
+        object.__setattr__(instance, "_url", CUSTODIAN_URL)
+        object.__setattr__(instance, "_JSONFragment",
+                           '{"url":' + _encode(CUSTODIAN_URL) +
+                           ',"valueReference":' + _reference(reference) + '}')
+        return _INTERNED.put(reference, instance)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Custodian is immutable!")
+
+    def __delattr__(self, name):
+        raise AttributeError("Custodian is immutable!")
+
+    def __reduce__(self):
+        return Custodian, (self._reference,)
+
+    @staticmethod
+    def cache_info():
+        """
+        Method that returns statistics of the cache of shared instances.
+
+        :return: CacheInfo(hits, misses, evictions, maxsize, currsize)
+        """
+        return _INTERNED.info()
+
+    @staticmethod
+    def cache_clear():
+        """
+        Method that empties the cache of shared instances
+        and resets its statistics.
+        """
+        _INTERNED.clear()
+
+    @staticmethod
+    def set_cache_size(maxsize: int):
+        """
+        Method that changes the maximal number of shared instances.
+
+        :param int maxsize: maximal number of cached instances
+        """
+        _INTERNED.resize(maxsize)
 
     @property
     def fhirExtension(self):
         """
         Getter for a Custodian extension interpreted as a FHIR extension
 
-        :return: FHIR Custodian extension in a correct FHIR representation
+        :return: FHIR Custodian extension in a correct FHIR representation.
+            A new extension is created on every call, so it can be
+            changed without affecting other users of the instance.
+        """
+        return self._convert_to_FHIR()
+
+    @property
+    def JSONFragment(self):
+        """
+        Getter for a JSON representation of the extension,
+        created once and reused by JSONSerializer.
+
+        :return: JSON representation of the FHIR extension
         """
-        return self._extension
+        return self._JSONFragment
 
     @property
     def reference(self):
@@ -56,6 +119,19 @@ class Custodian:
         """
         return self._url
 
+    def _convert_to_FHIR(self):
+        """
+        private function to create a FHIR representation of the extension
+        used in self.fhirExtension
+
+        :return: fhirclient.models.extension.Extension
+        """
+        extension = _fhirclient_extension.Extension()
+        extension.url = self._url
+        extension.valueReference = Helper.create_fhir_reference(
+            self._reference)
+        return extension
+
 
 def __dir__():
     return ['Custodian']
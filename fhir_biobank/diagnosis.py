@@ -2,20 +2,33 @@ from fhir_biobank._Constants import DIAGNOSIS_EXTENSION_URL as \
     _DIAGNOSIS_EXTENSION_URL
 from fhir_biobank._Constants import ICD_CODING_SYSTEM as _ICD_CODING_SYSTEM
 from fhir_biobank.helperFunctions import Helper
+from fhir_biobank._cache import LRUCache as _LRUCache
+from fhir_biobank._json import encode as _encode, \
+    codeable_concept as _codeable_concept
 
-import fhirclient.models.extension as _fhirclient_extension
+from fhir_biobank._lazy import lazy_import as _lazy_import
+
+_fhirclient_extension = _lazy_import("fhirclient.models.extension")
 
 __all__ = ["Diagnosis"]
 
+_INTERNED = _LRUCache(4096)
+
 
 class Diagnosis:
     """
         This class represents extension that specifies code of diagnosis that
         the patient (from which the sample was taken) has. URL of the extension
         is already provided.
+
+        Instances are immutable and shared - creating Diagnosis with the same
+        code returns the same instance from a bounded cache.
     """
 
-    def __init__(self, diagnosis_code: str):
+    __slots__ = ("_diagnosisCode", "_diagnosisUrl",
+                 "_JSONFragment")
+
+    def __new__(cls, diagnosis_code: str):
         """
         :param diagnosis_code: code of the diagnosis that the patient has.
             System which defines these codes is ICD-10. You can look up
@@ -24,19 +37,54 @@ class Diagnosis:
         if not isinstance(diagnosis_code, str):
             raise TypeError("diagnosis_code has to be string!")
 
-        self._diagnosisCode = diagnosis_code
-        self._diagnosisUrl = _DIAGNOSIS_EXTENSION_URL
+        instance = _INTERNED.get(diagnosis_code)
+        if instance is not None:
+            return instance
 
-        diagnosis_coding = Helper.create_coding(diagnosis_code,
-                                                _ICD_CODING_SYSTEM,
-                                                user_selected=False)
+        instance = object.__new__(cls)
+        object.__setattr__(instance, "_diagnosisCode", diagnosis_code)
+        object.__setattr__(instance, "_diagnosisUrl",
+                           _DIAGNOSIS_EXTENSION_URL)
+        object.__setattr__(instance, "_JSONFragment",
+                           '{"url":' + _encode(_DIAGNOSIS_EXTENSION_URL) +
+                           ',"valueCodeableConcept":' + _codeable_concept(
+                               diagnosis_code, _ICD_CODING_SYSTEM) + '}')
+        return _INTERNED.put(diagnosis_code, instance)
 
-        diagnosis_codeable_concept = Helper.create_codeable_concept(
-            [diagnosis_coding])
+    def __setattr__(self, name, value):
+        raise AttributeError("Diagnosis is immutable!")
+
+    def __delattr__(self, name):
+        raise AttributeError("Diagnosis is immutable!")
 
-        self._extension = _fhirclient_extension.Extension()
-        self._extension.url = self._diagnosisUrl
-        self._extension.valueCodeableConcept = diagnosis_codeable_concept
+    def __reduce__(self):
+        return Diagnosis, (self._diagnosisCode,)
+
+    @staticmethod
+    def cache_info():
+        """
+        Method that returns statistics of the cache of shared instances.
+
+        :return: CacheInfo(hits, misses, evictions, maxsize, currsize)
+        """
+        return _INTERNED.info()
+
+    @staticmethod
+    def cache_clear():
+        """
+        Method that empties the cache of shared instances
+        and resets its statistics.
+        """
+        _INTERNED.clear()
+
+    @staticmethod
+    def set_cache_size(maxsize: int):
+        """
+        Method that changes the maximal number of shared instances.
+
+        :param int maxsize: maximal number of cached instances
+        """
+        _INTERNED.resize(maxsize)
 
     @property
     def fhirExtension(self):
@@ -44,8 +92,20 @@ class Diagnosis:
         Getter for a Diagnosis extension interpreted as a FHIR extension.
 
         :return: FHIR Diagnosis extension in a correct FHIR representation.
+            A new extension is created on every call, so it can be
+            changed without affecting other users of the instance.
         """
-        return self._extension
+        return self._convert_to_FHIR()
+
+    @property
+    def JSONFragment(self):
+        """
+        Getter for a JSON representation of the extension,
+        created once and reused by JSONSerializer.
+
+        :return: JSON representation of the FHIR extension
+        """
+        return self._JSONFragment
 
     @property
     def diagnosisCode(self):
@@ -65,3 +125,22 @@ class Diagnosis:
         :return: URL to a definition of a diagnosis extension.
         """
         return self._diagnosisUrl
+
+    def _convert_to_FHIR(self):
+        """
+        private function to create a FHIR representation of the extension
+        used in self.fhirExtension
+
+        :return: fhirclient.models.extension.Extension
+        """
+        diagnosis_coding = Helper.create_coding(self._diagnosisCode,
+                                                _ICD_CODING_SYSTEM,
+                                                user_selected=False)
+
+        diagnosis_codeable_concept = Helper.create_codeable_concept(
+            [diagnosis_coding])
+
+        extension = _fhirclient_extension.Extension()
+        extension.url = self._diagnosisUrl
+        extension.valueCodeableConcept = diagnosis_codeable_concept
+        return extension
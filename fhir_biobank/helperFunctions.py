@@ -1,17 +1,108 @@
 from typing import List
 
-import fhirclient.models.coding as _fhirclient_coding
-import fhirclient.models.codeableconcept as _fhirclient_codeableconcept
-import fhirclient.models.identifier as _fhirclient_identifier
-import fhirclient.models.fhirreference as _fhirclient_fhirreference
+from fhir_biobank._lazy import lazy_import as _lazy_import
 from fhir_biobank._Constants import IDENTIFIER_USE as _IDENTIFIER_USE
 from fhir_biobank._Constants import IDENTIFIER_TYPE_CODES as \
     _IDENTIFIER_TYPE_CODES
 from fhir_biobank._Constants import IDENTIFIER_CODES_SYSTEM as \
     _IDENTIFIER_CODES_SYSTEM
+from fhir_biobank._cache import LRUCache as _LRUCache
+
+_fhirclient_coding = _lazy_import("fhirclient.models.coding")
+_fhirclient_codeableconcept = _lazy_import(
+    "fhirclient.models.codeableconcept")
+_fhirclient_identifier = _lazy_import("fhirclient.models.identifier")
+_fhirclient_fhirreference = _lazy_import(
+    "fhirclient.models.fhirreference")
 
 __all__ = ["Helper"]
 
+_IDENTIFIER_USE_SET = frozenset(_IDENTIFIER_USE)
+_IDENTIFIER_TYPE_CODES_SET = frozenset(_IDENTIFIER_TYPE_CODES)
+
+_CODING_CACHE = _LRUCache(1024)
+_CODEABLE_CONCEPT_CACHE = _LRUCache(1024)
+_IDENTIFIER_CACHE = _LRUCache(1024)
+
+
+class _FrozenList(list):
+    """
+    List that can not be changed, used for lists inside cached objects.
+    """
+
+    def _immutable(self, *args, **kwargs):
+        raise AttributeError("list shared by the cache cannot be changed!")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = \
+        _immutable
+
+    def __reduce__(self):
+        return _FrozenList, (list(self),)
+
+
+class _FrozenElement:
+    """
+    Mixin that makes a fhirclient element read-only once it is frozen.
+    """
+
+    _frozen = False
+
+    def __setattr__(self, name, value):
+        if self._frozen and not name.startswith("_"):
+            raise AttributeError(
+                "{} shared by the cache cannot be changed!".format(
+                    type(self).__name__))
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        if self._frozen and not name.startswith("_"):
+            raise AttributeError(
+                "{} shared by the cache cannot be changed!".format(
+                    type(self).__name__))
+        super().__delattr__(name)
+
+
+# modules of the fhirclient elements that can be frozen, by class name
+_FROZEN_MODULES = {
+    "Coding": _fhirclient_coding,
+    "CodeableConcept": _fhirclient_codeableconcept,
+    "Identifier": _fhirclient_identifier,
+}
+_FROZEN_CLASSES = {}
+
+
+def _frozen_class(name):
+    """
+    Returns read-only subclass of the fhirclient element class. Frozen
+    subclasses are created on the first use, so that fhirclient is not
+    imported before it is needed.
+    """
+    frozen_class = _FROZEN_CLASSES.get(name)
+    if frozen_class is None:
+        cls = getattr(_FROZEN_MODULES[name], name)
+        frozen_class = _FROZEN_CLASSES[name] = type(
+            "_Frozen" + name, (_FrozenElement, cls), {"__module__": __name__})
+    return frozen_class
+
+
+def __getattr__(name):
+    # pickle looks the frozen classes up in the module, also in a process
+    # that has not created them yet
+    if name.startswith("_Frozen") and name[7:] in _FROZEN_MODULES:
+        return _frozen_class(name[7:])
+    raise AttributeError("module {} has no attribute {}".format(__name__,
+                                                                name))
+
+
+def _freeze(element):
+    """
+    Makes the fhirclient element read-only.
+    """
+    element.__class__ = _frozen_class(type(element).__name__)
+    object.__setattr__(element, "_frozen", True)
+    return element
+
 
 class Helper:
     """
@@ -73,7 +164,7 @@ class Helper:
 
     @staticmethod
     def create_codeable_concept(
-            list_of_codings: List[_fhirclient_coding.Coding],
+            list_of_codings: "List[_fhirclient_coding.Coding]",
             text: str = None):
         """
         This method creates a CodeableConcept - reference to a terminology
@@ -146,7 +237,7 @@ class Helper:
             raise TypeError("value has to be a string!")
         if not isinstance(use, str):
             raise TypeError("use has to be a string!")
-        if use not in _IDENTIFIER_USE:
+        if use not in _IDENTIFIER_USE_SET:
             raise Exception(
                 "{} in use is not a correct type!"
                 "use type has to be one of the following".format(
@@ -157,7 +248,7 @@ class Helper:
         if not isinstance(identifier_type, str):
             raise TypeError("identifier_type has to be a string!")
 
-        if identifier_type not in _IDENTIFIER_TYPE_CODES:
+        if identifier_type not in _IDENTIFIER_TYPE_CODES_SET:
             raise Exception(
                 "{} in identifier_type is not a correct type!"
                 "identifier type has to be one of the following".format(
@@ -177,6 +268,134 @@ class Helper:
 
         return identifier
 
+    @staticmethod
+    def cached_coding(code: str, system: str = None, version: str = None,
+                      display: str = None, user_selected: bool = True):
+        """
+        This method works the same as create_coding, but returns a frozen
+        Coding shared by all calls with the same arguments. Codings are kept
+        in a bounded cache that evicts the least recently used ones,
+        see cache_info() and set_cache_size().
+
+        :return: frozen FHIR Coding resource
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided
+        """
+        if not isinstance(user_selected, bool):
+            raise TypeError("user_selected has to be a boolean!")
+
+        key = (code, system, version, display, user_selected)
+        coding = _CODING_CACHE.get(key)
+        if coding is None:
+            coding = _CODING_CACHE.put(key, _freeze(
+                Helper.create_coding(code, system, version, display,
+                                     user_selected)))
+        return coding
+
+    @staticmethod
+    def cached_codeable_concept(code: str, system: str = None,
+                                version: str = None, display: str = None,
+                                user_selected: bool = False,
+                                text: str = None):
+        """
+        This method creates a frozen CodeableConcept containing a single
+        coding created by cached_coding. CodeableConcepts are shared by
+        all calls with the same arguments and kept in a bounded cache,
+        see cache_info() and set_cache_size().
+
+        :param string code: Symbol in syntax defined by the system.
+        :param string system: the identification of the code system
+        :param string version: the version of the code system
+        :param string display: representation of the meaning of the code
+        :param bool user_selected: true/false value indicating if the coding
+            was chosen by user directly. Default value is False.
+        :param string text: A human language representation of the code
+
+        :return: frozen FHIR CodeableConcept
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided
+        """
+        if not isinstance(user_selected, bool):
+            raise TypeError("user_selected has to be a boolean!")
+
+        key = (code, system, version, display, user_selected, text)
+        codeable_concept = _CODEABLE_CONCEPT_CACHE.get(key)
+        if codeable_concept is None:
+            codeable_concept = Helper.create_codeable_concept(
+                _FrozenList([Helper.cached_coding(code, system, version,
+                                                  display, user_selected)]),
+                text)
+            codeable_concept = _CODEABLE_CONCEPT_CACHE.put(
+                key, _freeze(codeable_concept))
+        return codeable_concept
+
+    @staticmethod
+    def cached_identifier(value: str, use: str = "usual",
+                          identifier_type: str = "ACSN"):
+        """
+        This method works the same as create_identifier, but returns
+        a frozen Identifier shared by all calls with the same arguments.
+        Identifiers are kept in a bounded cache,
+        see cache_info() and set_cache_size().
+
+        :return: frozen Identifier used in resources
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided
+
+        :raise ValueError: This exception is raised when incorrect
+                           value in argument is provided
+        """
+        key = (value, use, identifier_type)
+        identifier = _IDENTIFIER_CACHE.get(key)
+        if identifier is None:
+            identifier = Helper.create_identifier(value, use, identifier_type)
+            identifier.type = Helper.cached_codeable_concept(
+                identifier_type, _IDENTIFIER_CODES_SYSTEM, user_selected=True)
+            identifier = _IDENTIFIER_CACHE.put(key, _freeze(identifier))
+        return identifier
+
+    @staticmethod
+    def cache_info():
+        """
+        This method returns statistics of caches used by cached_coding,
+        cached_codeable_concept and cached_identifier.
+
+        :return: dictionary mapping "coding", "codeable_concept" and
+            "identifier" to CacheInfo(hits, misses, evictions, maxsize,
+            currsize)
+        """
+        return {"coding": _CODING_CACHE.info(),
+                "codeable_concept": _CODEABLE_CONCEPT_CACHE.info(),
+                "identifier": _IDENTIFIER_CACHE.info()}
+
+    @staticmethod
+    def cache_clear():
+        """
+        This method empties all caches and resets their statistics.
+        """
+        _CODING_CACHE.clear()
+        _CODEABLE_CONCEPT_CACHE.clear()
+        _IDENTIFIER_CACHE.clear()
+
+    @staticmethod
+    def set_cache_size(maxsize: int):
+        """
+        This method changes the maximal number of items of every cache.
+
+        :param int maxsize: maximal number of items in each cache
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided
+        :raise ValueError: This exception is raised when incorrect
+                           value in argument is provided
+        """
+        _CODING_CACHE.resize(maxsize)
+        _CODEABLE_CONCEPT_CACHE.resize(maxsize)
+        _IDENTIFIER_CACHE.resize(maxsize)
+
     @staticmethod
     def create_fhir_reference(reference: str):
         """
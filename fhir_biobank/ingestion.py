@@ -0,0 +1,338 @@
+import fnmatch as _fnmatch
+import io as _io
+import json as _json
+import os as _os
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
+from functools import partial as _partial
+from typing import Dict
+
+from fhir_biobank.bundle import Entry
+from fhir_biobank.bundleWriter import BundleWriter
+from fhir_biobank import __version__
+from fhir_biobank.conversionCache import ConversionCache
+from fhir_biobank.conversionManifest import ConversionManifest
+from fhir_biobank.ndjsonExporter import NDJSONExporter
+from fhir_biobank.serializer import JSONSerializer
+from fhir_biobank.xmlReader import PatientXMLReader
+from fhir_biobank._Constants import SPECIMEN_TYPE as _SPECIMEN_TYPE
+
+__all__ = ["DirectoryIngestor"]
+
+
+def _convert_file_to_ndjson(path, default_material_code, material_codes,
+                            cache=None):
+    """
+    Worker function, converts a single XML file into serialized resources.
+
+    :return: list of tuples of resource type and serialized resource
+    """
+    lines = []
+    reader = PatientXMLReader(path, default_material_code, material_codes)
+    if cache is not None:
+        for record in reader.records():
+            lines.extend(cache.convert(reader, record))
+        return lines
+    for patient, specimens in reader:
+        lines.append(("Patient", JSONSerializer.dumps(patient)))
+        for specimen in specimens:
+            lines.append(("Specimen", JSONSerializer.dumps(specimen)))
+    return lines
+
+
+def _convert_file_to_entries(path, default_material_code, material_codes,
+                             base_url, cache=None):
+    """
+    Worker function, converts a single XML file into serialized entries.
+
+    :return: list of serialized entries
+    """
+    entries = []
+    reader = PatientXMLReader(path, default_material_code, material_codes)
+    if cache is not None:
+        for record in reader.records():
+            entries.extend(entry_json for _, entry_json in
+                           cache.convert(reader, record, base_url))
+        return entries
+    for patient, specimens in reader:
+        entries.append(JSONSerializer.dumps(
+            Entry.from_resource(patient, base_url)))
+        for specimen in specimens:
+            entries.append(JSONSerializer.dumps(
+                Entry.from_resource(specimen, base_url)))
+    return entries
+
+
+def _convert_changed_file(item, default_material_code, material_codes,
+                          base_url, cache=None):
+    """
+    Worker function, converts a single XML file into serialized entries
+    unless its content has the given digest.
+
+    :return: tuple of size, modification time and digest of the file,
+        serialized entries and relative urls of their resources, entries
+        and urls are None if the content is unchanged
+    """
+    path, known_digest = item
+    # stat before reading, a file modified meanwhile is read again next time
+    stat = _os.stat(path)
+    with open(path, "rb") as fp:
+        data = fp.read()
+    digest = ConversionManifest.digest(data)
+    if digest == known_digest:
+        return stat.st_size, stat.st_mtime_ns, digest, None, None
+
+    entries, urls = [], []
+    reader = PatientXMLReader(_io.BytesIO(data), default_material_code,
+                              material_codes)
+    if cache is not None:
+        for record in reader.records():
+            for _, entry_json in cache.convert(reader, record, base_url):
+                entries.append(entry_json)
+                urls.append(_json.loads(entry_json)["request"]["url"])
+        return stat.st_size, stat.st_mtime_ns, digest, entries, urls
+    for patient, specimens in reader:
+        for resource in [patient] + list(specimens):
+            entry = Entry.from_resource(resource, base_url)
+            entries.append(JSONSerializer.dumps(entry))
+            urls.append(entry.resourceShortUrl)
+    return stat.st_size, stat.st_mtime_ns, digest, entries, urls
+
+
+class DirectoryIngestor:
+    """
+    This class converts a directory of BBMRI.cz patient exports (usually one
+    BBM*.XML file per patient) into NDJSON files or a single Bundle. Files
+    are converted in parallel by a pool of processes, results are written
+    in the order of sorted file names, so the output is deterministic.
+    """
+
+    def __init__(self, workers: int = None, chunk_size: int = 16,
+                 pattern: str = "BBM*.XML",
+                 default_material_code: str = "whole-blood",
+                 material_codes: Dict[str, str] = None,
+                 cache: ConversionCache = None):
+        """
+        :param Optional[int] workers:
+            number of worker processes. None uses the number of processors,
+            1 converts the files in the current process.
+        :param Optional[int] chunk_size:
+            number of files sent to a worker process at once.
+        :param Optional[string] pattern:
+            shell-style pattern of the file names to convert.
+        :param Optional[string] default_material_code:
+            specimen material code, see PatientXMLReader
+        :param Optional[Dict[str, str]] material_codes:
+            mapping of BBMRI.cz material types to specimen material codes,
+            see PatientXMLReader
+        :param Optional[ConversionCache] cache:
+            cache of converted records, records found in the cache
+            are not converted again
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when incorrect
+                           value inside argument is provided.
+        """
+        if workers is not None:
+            if not isinstance(workers, int) or isinstance(workers, bool):
+                raise TypeError("workers has to be int!")
+            if workers < 1:
+                raise ValueError("workers has to be greater than 0!")
+
+        if not isinstance(chunk_size, int) or isinstance(chunk_size, bool):
+            raise TypeError("chunk_size has to be int!")
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size has to be greater than 0!")
+
+        if not isinstance(pattern, str):
+            raise TypeError("pattern has to be a string!")
+
+        if not isinstance(default_material_code, str):
+            raise TypeError("default_material_code has to be a string!")
+
+        if default_material_code not in _SPECIMEN_TYPE:
+            raise ValueError(
+                "{} in default_material_code is not correct "
+                "code for specimen.".format(default_material_code))
+
+        if material_codes is not None and not isinstance(material_codes,
+                                                         dict):
+            raise TypeError("material_codes has to be a dictionary!")
+
+        if cache is not None and not isinstance(cache, ConversionCache):
+            raise TypeError("cache has to be a ConversionCache!")
+
+        self._workers = workers
+        self._chunkSize = chunk_size
+        self._pattern = pattern
+        self._defaultMaterialCode = default_material_code
+        self._materialCodes = material_codes
+        self._cache = cache
+
+    @property
+    def workers(self):
+        """
+        Getter for a number of worker processes.
+
+        :return: number of worker processes, None for number of processors
+        """
+        return self._workers
+
+    @property
+    def chunkSize(self):
+        """
+        Getter for a number of files sent to a worker process at once.
+
+        :return: chunk size
+        """
+        return self._chunkSize
+
+    def files(self, directory: str):
+        """
+        Method that lists files of the directory matching the pattern.
+
+        :param string directory: directory containing XML exports
+
+        :return: sorted list of paths
+        """
+        if not isinstance(directory, str):
+            raise TypeError("directory has to be a string!")
+        return [_os.path.join(directory, name)
+                for name in sorted(_os.listdir(directory))
+                if _fnmatch.fnmatchcase(name, self._pattern)]
+
+    def to_ndjson(self, directory: str, output_directory: str,
+                  compress: bool = False, max_part_bytes: int = None):
+        """
+        Method that converts all matching files of the directory into
+        Patient.ndjson and Specimen.ndjson files, see NDJSONExporter.
+
+        :param string directory: directory containing XML exports
+        :param string output_directory: directory for NDJSON files
+        :param Optional[bool] compress: gzip-compress the files
+        :param Optional[int] max_part_bytes: maximal size of a single file
+
+        :return: NDJSONExporter used to write the files, with paths of written
+            files and number of written resources
+        """
+        worker = _partial(_convert_file_to_ndjson,
+                          default_material_code=self._defaultMaterialCode,
+                          material_codes=self._materialCodes,
+                          cache=self._cache)
+        with NDJSONExporter(output_directory, compress,
+                            max_part_bytes) as exporter:
+            for lines in self._map(worker, self.files(directory)):
+                for resource_type, resource_json in lines:
+                    exporter.write_serialized(resource_type, resource_json)
+        return exporter
+
+    def to_bundle(self, directory: str, fp, bundle_id: str, base_url: str,
+                  bundle_type: str = "transaction",
+                  manifest: ConversionManifest = None):
+        """
+        Method that converts all matching files of the directory into
+        a single Bundle written into a binary file-like object,
+        see BundleWriter.
+
+        With a manifest, only files that are new or changed since
+        the manifest was saved are converted, and the Bundle also deletes
+        resources whose source file disappeared or no longer contains them.
+        The manifest is updated in memory only. The caller saves it by
+        manifest.save() after the Bundle was uploaded successfully. When
+        the upload fails, the manifest is not saved, so the next run writes
+        the same changes again.
+
+        :param string directory: directory containing XML exports
+        :param fp: binary file-like object
+        :param string bundle_id: Internal id that represents unique Bundle
+        :param string base_url: url of the FHIR server used for entry urls
+        :param Optional[string] bundle_type: type of the Bundle
+        :param Optional[ConversionManifest] manifest: manifest of previously
+            converted files
+
+        :return: number of entries written
+        """
+        if not isinstance(base_url, str):
+            raise TypeError("base_url has to be a string!")
+
+        if manifest is not None and not isinstance(manifest,
+                                                   ConversionManifest):
+            raise TypeError("manifest has to be a ConversionManifest!")
+
+        if manifest is not None:
+            with BundleWriter(fp, bundle_id, bundle_type) as writer:
+                self._write_changes(directory, writer, base_url, manifest)
+            return writer.entryCount
+
+        worker = _partial(_convert_file_to_entries,
+                          default_material_code=self._defaultMaterialCode,
+                          material_codes=self._materialCodes,
+                          base_url=base_url, cache=self._cache)
+        with BundleWriter(fp, bundle_id, bundle_type) as writer:
+            for entries in self._map(worker, self.files(directory)):
+                for entry_json in entries:
+                    writer.write_serialized(entry_json)
+        return writer.entryCount
+
+    def _write_changes(self, directory, writer, base_url, manifest):
+        """
+        Writes entries of new and changed files and entries deleting
+        resources that are no longer converted, and updates the manifest.
+        """
+        options = [__version__, self._defaultMaterialCode,
+                   self._materialCodes, base_url]
+        # files converted with other options have to be converted again
+        reconvert = not manifest.matches(options)
+        paths = {}
+        changed = []
+        for path in self.files(directory):
+            name = _os.path.basename(path)
+            paths[name] = path
+            if reconvert:
+                changed.append((path, None))
+            elif not manifest.is_unchanged(name, _os.stat(path)):
+                previous = manifest.get(name)
+                changed.append((path, previous and previous.digest))
+
+        removed = []
+        for name in manifest:
+            if name not in paths:
+                removed.extend(manifest.remove(name).resources)
+
+        worker = _partial(_convert_changed_file,
+                          default_material_code=self._defaultMaterialCode,
+                          material_codes=self._materialCodes,
+                          base_url=base_url, cache=self._cache)
+        for (path, _), (size, mtime_ns, digest, entries, urls) in zip(
+                changed, self._map(worker, changed)):
+            name = _os.path.basename(path)
+            previous = manifest.get(name)
+            if entries is None:
+                urls = previous.resources
+            else:
+                for entry_json in entries:
+                    writer.write_serialized(entry_json)
+                if previous is not None:
+                    removed.extend(previous.resources)
+            manifest.record(name, size, mtime_ns, digest, urls)
+        manifest.set_options(options)
+
+        if removed:
+            # resources may move between files
+            converted = manifest.resources()
+            for url in dict.fromkeys(removed):
+                if url not in converted:
+                    writer.write_serialized(JSONSerializer.dumps(
+                        Entry.delete(url, base_url)))
+
+    def _map(self, worker, paths):
+        """
+        Applies worker on every path, keeping the order of paths.
+        """
+        if self._workers == 1:
+            for path in paths:
+                yield worker(path)
+            return
+        with _ProcessPoolExecutor(max_workers=self._workers) as executor:
+            yield from executor.map(worker, paths, chunksize=self._chunkSize)
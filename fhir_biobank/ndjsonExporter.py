@@ -0,0 +1,285 @@
+import gzip as _gzip
+import os as _os
+from functools import partial as _partial
+from typing import Iterable, Union
+
+from fhir_biobank.condition import ConditionResource
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.specimen import SpecimenResource
+from fhir_biobank.serializer import JSONSerializer
+
+__all__ = ["NDJSONExporter"]
+
+_RESOURCE_TYPES = {
+    PatientResource: "Patient",
+    SpecimenResource: "Specimen",
+    ConditionResource: "Condition",
+}
+
+
+class _PartWriter:
+    """
+    Writes lines of a single resource type, opening a new part every time
+    the size cap would be exceeded. part_path returns the path of a part
+    from its number, paths of opened parts are appended to files.
+    """
+
+    def __init__(self, part_path, files, max_part_bytes, compress,
+                 compress_level):
+        self._partPath = part_path
+        self._files = files
+        self._maxPartBytes = max_part_bytes
+        self._compress = compress
+        self._compressLevel = compress_level
+        self._fp = None
+        self._partNumber = 0
+        self._partBytes = 0
+
+    def write(self, line):
+        if self._fp is None or (self._maxPartBytes is not None
+                                and self._partBytes
+                                and self._partBytes + len(line) >
+                                self._maxPartBytes):
+            self._open_next_part()
+        self._fp.write(line)
+        self._partBytes += len(line)
+
+    def _open_next_part(self):
+        self.close()
+        self._partNumber += 1
+        path = self._partPath(self._partNumber)
+        if self._compress:
+            self._fp = _gzip.open(path, "wb",
+                                  compresslevel=self._compressLevel)
+        else:
+            self._fp = open(path, "wb")
+        self._partBytes = 0
+        self._files.append(path)
+
+    def close(self):
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+
+class NDJSONExporter:
+    """
+    This class exports resources in the FHIR Bulk Data NDJSON format - one
+    file per resource type (Patient.ndjson, Specimen.ndjson,
+    Condition.ndjson) containing one resource per line.
+
+    NDJSONExporter is used as a context manager::
+
+        with NDJSONExporter("export", compress=True) as exporter:
+            exporter.export(patients, specimens, conditions)
+    """
+
+    def __init__(self, directory: str, compress: bool = False,
+                 max_part_bytes: int = None, compress_level: int = 6):
+        """
+        :param string directory:
+            directory the files are written to. It is created
+            if it does not exist.
+        :param Optional[bool] compress:
+            true/false value that indicates if the files should be
+            gzip-compressed. Compressed files have suffix .ndjson.gz
+        :param Optional[int] max_part_bytes:
+            maximal size of a single file in bytes, measured before
+            the compression. When provided, files are split into numbered
+            parts, for example Patient.1.ndjson, Patient.2.ndjson.
+            A resource larger than the limit gets a part of its own.
+        :param Optional[int] compress_level:
+            gzip compression level from 1 (fastest) to 9 (smallest).
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when incorrect
+                           value inside argument is provided.
+        """
+        if not isinstance(directory, str):
+            raise TypeError("directory has to be a string!")
+
+        if not isinstance(compress, bool):
+            raise TypeError("compress has to be a boolean!")
+
+        if max_part_bytes is not None:
+            if not isinstance(max_part_bytes, int) \
+                    or isinstance(max_part_bytes, bool):
+                raise TypeError("max_part_bytes has to be int!")
+            if max_part_bytes <= 0:
+                raise ValueError("max_part_bytes has to be greater than 0!")
+
+        if not isinstance(compress_level, int) \
+                or isinstance(compress_level, bool):
+            raise TypeError("compress_level has to be int!")
+
+        if not 1 <= compress_level <= 9:
+            raise ValueError("compress_level has to be between 1 and 9!")
+
+        _os.makedirs(directory, exist_ok=True)
+
+        self._directory = directory
+        self._compress = compress
+        self._maxPartBytes = max_part_bytes
+        self._compressLevel = compress_level
+        self._writers = {}
+        self._files = []
+        self._counts = {}
+        self._closed = False
+
+    @property
+    def directory(self):
+        """
+        Getter for a directory the files are written to.
+
+        :return: path of the directory
+        """
+        return self._directory
+
+    @property
+    def compress(self):
+        """
+        Getter for a True/False value that indicates if the files
+        are gzip-compressed.
+
+        :return: True/False value indicating compression
+        """
+        return self._compress
+
+    @property
+    def maxPartBytes(self):
+        """
+        Getter for a maximal size of a single file.
+
+        :return: maximal size of a file in bytes, or None
+        """
+        return self._maxPartBytes
+
+    @property
+    def compressLevel(self):
+        """
+        Getter for a gzip compression level.
+
+        :return: compression level from 1 to 9
+        """
+        return self._compressLevel
+
+    @property
+    def files(self):
+        """
+        Getter for paths of all files written so far.
+
+        :return: list of paths in order in which they were created
+        """
+        return list(self._files)
+
+    @property
+    def counts(self):
+        """
+        Getter for a number of resources written for each resource type.
+
+        :return: dictionary mapping resource type to number of resources
+        """
+        return dict(self._counts)
+
+    def write(self, resource: Union[PatientResource, SpecimenResource,
+                                    ConditionResource]):
+        """
+        Method that writes a single resource into the file of its type.
+
+        :param resource: PatientResource, SpecimenResource
+            or ConditionResource
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when the exporter
+                           is already closed.
+        """
+        resource_type = _RESOURCE_TYPES.get(type(resource))
+        if resource_type is None:
+            for resource_class, name in _RESOURCE_TYPES.items():
+                if isinstance(resource, resource_class):
+                    resource_type = name
+                    break
+            else:
+                raise TypeError(
+                    "resource type has to be one of the following: "
+                    "PatientResource, SpecimenResource or"
+                    " ConditionResource")
+        self.write_serialized(resource_type, JSONSerializer.dumps(resource))
+
+    def write_serialized(self, resource_type: str, resource_json: bytes):
+        """
+        Method that writes an already serialized resource, for example one
+        created by JSONSerializer.dumps() in another process.
+
+        :param string resource_type: "Patient", "Specimen" or "Condition"
+        :param bytes resource_json: UTF-8 encoded JSON without line breaks
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when incorrect
+                           value inside argument is provided or the exporter
+                           is already closed.
+        """
+        if self._closed:
+            raise ValueError("NDJSONExporter is closed, resources cannot "
+                             "be written anymore!")
+        if resource_type not in _RESOURCE_TYPES.values():
+            raise ValueError(
+                "{} in resource_type is not correct resource type! "
+                "resource_type has to be one of the following: ".format(
+                    resource_type) + " ".join(_RESOURCE_TYPES.values()))
+        if not isinstance(resource_json, bytes):
+            raise TypeError("resource_json has to be bytes!")
+
+        writer = self._writers.get(resource_type)
+        if writer is None:
+            writer = _PartWriter(_partial(self._part_path, resource_type),
+                                 self._files, self._maxPartBytes,
+                                 self._compress, self._compressLevel)
+            self._writers[resource_type] = writer
+        writer.write(resource_json + b"\n")
+        self._counts[resource_type] = self._counts.get(resource_type, 0) + 1
+
+    def export(self,
+               patients: Iterable[PatientResource] = (),
+               specimens: Iterable[SpecimenResource] = (),
+               conditions: Iterable[ConditionResource] = ()):
+        """
+        Method that writes all given resources. Iterables are consumed one
+        resource at a time, so generators can be used.
+
+        :param Iterable[PatientResource] patients: patients to export
+        :param Iterable[SpecimenResource] specimens: specimens to export
+        :param Iterable[ConditionResource] conditions: conditions to export
+
+        :return: list of paths of all files written so far.
+        """
+        for resources in (patients, specimens, conditions):
+            for resource in resources:
+                self.write(resource)
+        return self.files
+
+    def close(self):
+        """
+        Method that closes all opened files. It is called automatically
+        when the exporter is used as a context manager. Files are not
+        opened again, writing after close() raises ValueError.
+        """
+        self._closed = True
+        for writer in self._writers.values():
+            writer.close()
+
+    def _part_path(self, resource_type, part_number):
+        name = resource_type
+        if self._maxPartBytes is not None:
+            name += "." + str(part_number)
+        name += ".ndjson.gz" if self._compress else ".ndjson"
+        return _os.path.join(self._directory, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
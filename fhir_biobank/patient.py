@@ -1,16 +1,22 @@
 from datetime import date as _date
 from typing import List, Optional
-import fhirclient.models.patient as _fhirclient_patient
-import fhirclient.models.fhirdate as _fhirclient_date
-import fhirclient.models.meta as _fhirclient_meta
+from fhir_biobank._lazy import lazy_import as _lazy_import
 
 from fhir_biobank.helperFunctions import Helper as _Helper
+import fhir_biobank.validation as _validation
+from fhir_biobank._schema import Schema as _Schema, Type as _Type, \
+    Choice as _Choice, NotFuture as _NotFuture, Rule as _Rule, \
+    Items as _Items
 
 from fhir_biobank._Constants import PATIENT_GENDER as _PATIENT_GENDER
 from fhir_biobank._Constants import META_PROFILE_URL as _META_PROFILE_URL
 from fhir_biobank._Constants import IDENTIFIER_TYPE_CODES as \
     _IDENTIFIER_TYPE_CODES
 
+_fhirclient_patient = _lazy_import("fhirclient.models.patient")
+_fhirclient_date = _lazy_import("fhirclient.models.fhirdate")
+_fhirclient_meta = _lazy_import("fhirclient.models.meta")
+
 
 class PatientResource:
     """
@@ -18,6 +24,11 @@ class PatientResource:
     health care services.
     """
 
+    __slots__ = ("_patientId", "_identifier", "_gender", "_birthDate",
+                 "_deceasedBoolean", "_deceasedDatetime",
+                 "_multipleBirthBoolean", "_multipleBirthInteger", "_link",
+                 "_identifierType", "_FHIR_Patient")
+
     def __init__(self, patient_id: str, identifier: str,
                  gender: str = "unknown", birth_date: _date = None,
                  deceased_boolean: bool = False,
@@ -25,7 +36,7 @@ class PatientResource:
                  multiple_birth_boolean: bool = False,
                  multiple_birth_int: int = None,
                  patient_links: Optional[List["PatientResource"]] = None,
-                 identifier_type: str = "ACSN"):
+                 identifier_type: str = "ACSN", validation: str = None):
         """
         :param string patient_id:
             Internal id that represents unique Patient,
@@ -61,6 +72,9 @@ class PatientResource:
             "PLAC", "FILL", "JHN".
             For more info see
             https://simplifier.net/packages/hl7.fhir.r4.core/4.0.1/files/82653
+        :param Optional[string] validation:
+            validation mode of this call, "strict", "trusted" or "deferred",
+            see fhir_biobank.validation. None uses the current mode.
 
         :raise TypeError: This exception is raised when incorrect
                           types of arguments are provided
@@ -68,85 +82,15 @@ class PatientResource:
         :raise ValueError: This exception is raised when incorrect
                            value in argument is provided
         """
-        if not isinstance(patient_id, str):
-            raise TypeError("condition_id has to be a string!")
-
-        if not isinstance(identifier, str):
-            raise TypeError("patient_id has to be string!")
-
-        if not isinstance(gender, str):
-            raise TypeError("gender has to be string!")
-
-        if gender not in _PATIENT_GENDER:
-            raise ValueError(
-                "{} in variable gender is not correct "
-                "code for gender."
-                "code has to be one of the following".format(
-                    gender) +
-                " ".join(["{}"] * len(_PATIENT_GENDER)).format(
-                    *_PATIENT_GENDER))
-
-        if birth_date is not None and not isinstance(birth_date, _date):
-            raise TypeError("birth_date has to be date!")
-
-        if birth_date is not None and birth_date > _date.today():
-            raise ValueError(
-                "Patient birth date cannot be greater than today's date!")
-
-        if not isinstance(deceased_boolean, bool):
-            raise TypeError("deceased_boolean has to be bool!")
-
-        if deceased_datetime is not None and not isinstance(deceased_datetime,
-                                                            _date):
-            raise TypeError("deceased_datetime has to be date!")
-
-        if not deceased_boolean and deceased_datetime is not None:
-            raise ValueError(
-                "deceased_boolean is set to False,"
-                " but deceased_datetime is not None! ")
-
-        if deceased_datetime is not None and deceased_datetime > _date.today():
-            raise ValueError(
-                "Patient deceased datetime date cannot be "
-                "greater than today's date!")
-
-        if birth_date is not None and deceased_datetime is not None \
-                and deceased_datetime < birth_date:
-            raise ValueError("Patient cannot be deceased before being born!")
-
-        if not isinstance(multiple_birth_boolean, bool):
-            raise TypeError("multiple_birth_boolean has to be bool!")
-
-        if multiple_birth_int is not None and not isinstance(
-                multiple_birth_int,
-                int):
-            raise TypeError("multiple_birth_int has to be int!")
-
-        if not multiple_birth_boolean and multiple_birth_int is not None:
-            raise ValueError(
-                "multiple_birth_boolean set to False, "
-                "but multiple_birth_int is not None!")
-
-        if patient_links is not None:
-            if not isinstance(patient_links, list):
-                raise TypeError("patient_links have to be list of patients!")
-            else:
-                for patient in patient_links:
-                    if not isinstance(patient, PatientResource):
-                        raise TypeError(
-                            "patient_links have to be list of patients!")
-
-        if not isinstance(identifier_type, str):
-            raise TypeError("identifier_type has to be a string!")
-
-        if identifier_type not in _IDENTIFIER_TYPE_CODES:
-            raise Exception(
-                "{} in identifier_type is not a correct type!"
-                "identifier type has to be one of the following".format(
-                    identifier_type) +
-                " ".join(
-                    ["{}"] * len(_IDENTIFIER_TYPE_CODES)).format(
-                    *_IDENTIFIER_TYPE_CODES))
+        mode = _validation._resolve(validation)
+        if mode != _validation.TRUSTED:
+            try:
+                _check_arguments(patient_id, identifier, gender, birth_date,
+                                 deceased_boolean, deceased_datetime,
+                                 multiple_birth_boolean, multiple_birth_int,
+                                 patient_links, identifier_type)
+            except Exception as error:
+                _validation._report(error, mode)
 
         self._patientId = patient_id
 
@@ -260,7 +204,7 @@ class PatientResource:
 
         :return: type of identifier that identifies the patient
         """
-        return self.identifierType
+        return self._identifierType
 
     @property
     def FHIRInterpretation(self):
@@ -349,3 +293,44 @@ def __dir__():
 
 
 __all__ = ["PatientResource"]
+
+
+_check_arguments = _Schema(PatientResource, [
+    _Type("patient_id", str, "condition_id has to be a string!"),
+    _Type("identifier", str, "patient_id has to be string!"),
+    _Type("gender", str, "gender has to be string!"),
+    _Choice("gender", _PATIENT_GENDER,
+            "{} in variable gender is not correct code for gender."
+            "code has to be one of the following"),
+    _Type("birth_date", _date, "birth_date has to be date!", optional=True),
+    _NotFuture("birth_date",
+               "Patient birth date cannot be greater than today's date!"),
+    _Type("deceased_boolean", bool, "deceased_boolean has to be bool!"),
+    _Type("deceased_datetime", _date, "deceased_datetime has to be date!",
+          optional=True),
+    _Rule("not deceased_boolean and deceased_datetime is not None",
+          "deceased_boolean is set to False,"
+          " but deceased_datetime is not None! "),
+    _NotFuture("deceased_datetime",
+               "Patient deceased datetime date cannot be "
+               "greater than today's date!"),
+    _Rule("birth_date is not None and deceased_datetime is not None "
+          "and deceased_datetime < birth_date",
+          "Patient cannot be deceased before being born!"),
+    _Type("multiple_birth_boolean", bool,
+          "multiple_birth_boolean has to be bool!"),
+    _Type("multiple_birth_int", int, "multiple_birth_int has to be int!",
+          optional=True),
+    _Rule("not multiple_birth_boolean and multiple_birth_int is not None",
+          "multiple_birth_boolean set to False, "
+          "but multiple_birth_int is not None!"),
+    _Type("patient_links", list, "patient_links have to be list of patients!",
+          optional=True),
+    _Items("patient_links", PatientResource,
+           "patient_links have to be list of patients!", optional=True),
+    _Type("identifier_type", str, "identifier_type has to be a string!"),
+    _Choice("identifier_type", _IDENTIFIER_TYPE_CODES,
+            "{} in identifier_type is not a correct type!"
+            "identifier type has to be one of the following",
+            exception=Exception),
+]).check
@@ -0,0 +1,352 @@
+import asyncio as _asyncio
+import io as _io
+import os as _os
+import uuid as _uuid
+from collections import namedtuple as _namedtuple
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from functools import partial as _partial
+from typing import Dict, Iterable, Union
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.ingestion import DirectoryIngestor
+from fhir_biobank.serializer import JSONSerializer
+from fhir_biobank.uploadJournal import UploadJournal
+from fhir_biobank.uploader import BundleUploader
+from fhir_biobank.xmlReader import PatientXMLReader
+from fhir_biobank._Constants import BUNDLE_REQUEST_METHOD as \
+    _BUNDLE_REQUEST_METHOD
+
+__all__ = ["UploadPipeline", "PipelineStats"]
+
+PipelineStats = _namedtuple("PipelineStats", ["files", "patients",
+                                              "resources", "bundles",
+                                              "bytes", "skipped"])
+PipelineStats.__doc__ = """
+Statistics of a pipeline run: number of read files, converted patients,
+converted resources (patients and specimens), uploaded Bundles, bytes
+of uploaded Bundles before compression and resources skipped because
+the journal recorded them as committed.
+"""
+
+_DONE = object()
+
+
+def _read_file(path):
+    with open(path, "rb") as fp:
+        return fp.read()
+
+
+def _convert_export(data, default_material_code, material_codes, base_url,
+                    request_method):
+    """
+    Worker function, converts an XML export into entries.
+
+    :return: list of lists of entries, one list per patient
+    """
+    groups = []
+    reader = PatientXMLReader(_io.BytesIO(data), default_material_code,
+                              material_codes)
+    for patient, specimens in reader:
+        group = [Entry.from_resource(patient, base_url, request_method)]
+        for specimen in specimens:
+            group.append(Entry.from_resource(specimen, base_url,
+                                             request_method))
+        groups.append(group)
+    return groups
+
+
+def _serialize(bundle):
+    entries = bundle.sourceEntries
+    return bundle.id, [entry.resourceFullUrl for entry in entries], \
+        [UploadJournal.digest(entry) for entry in entries], \
+        JSONSerializer.dumps(bundle)
+
+
+class UploadPipeline:
+    """
+    This class converts BBMRI.cz patient exports and uploads them to a FHIR
+    server as transaction Bundles. The work is done by asyncio stages
+    connected by bounded queues:
+
+    - read: reads the files, in a pool of threads
+    - convert: converts the exports into entries, in the executor
+    - bundle: collects entries into Bundles of bundle_size entries, entries
+      of a patient are always in the same Bundle
+    - serialize: serializes the Bundles, in the executor
+    - upload: uploads the Bundles by BundleUploader, in a pool of
+      `uploader.concurrency` threads
+
+    A stage waits when the queue of the next stage is full, so a slow
+    server slows down reading instead of filling the memory.
+
+    Example::
+
+        with BundleUploader("https://example.com/fhir") as uploader:
+            stats = UploadPipeline(uploader).upload("exports")
+
+    Converting is CPU bound, pass a ProcessPoolExecutor as the executor to
+    convert files in parallel.
+    """
+
+    def __init__(self, uploader: BundleUploader, base_url: str = None,
+                 bundle_size: int = 500, readers: int = 2,
+                 converters: int = None, serializers: int = 2,
+                 queue_size: int = 16, executor=None,
+                 pattern: str = "BBM*.XML",
+                 default_material_code: str = "whole-blood",
+                 material_codes: Dict[str, str] = None,
+                 request_method: str = "PUT",
+                 bundle_id_prefix: str = "bundle-",
+                 journal: UploadJournal = None):
+        """
+        :param BundleUploader uploader:
+            uploader of the Bundles
+        :param Optional[str] base_url:
+            url of the FHIR server used for entry urls, base url of the
+            uploader if None
+        :param Optional[int] bundle_size:
+            maximal number of entries of a Bundle, a patient with more
+            specimens gets a larger Bundle of its own. If the uploader has
+            an AdaptiveController, the size chosen by the controller is used
+            instead.
+        :param Optional[int] readers:
+            number of files read at once
+        :param Optional[int] converters:
+            number of files converted at once, number of processors if None
+        :param Optional[int] serializers:
+            number of Bundles serialized at once
+        :param Optional[int] queue_size:
+            maximal number of items waiting between two stages
+        :param executor:
+            concurrent.futures.Executor used for converting and serializing,
+            a pool of `converters` threads if None. The executor is not
+            shut down by the pipeline.
+        :param Optional[string] pattern:
+            shell-style pattern of the file names uploaded from a directory
+        :param Optional[string] default_material_code:
+            specimen material code, see PatientXMLReader
+        :param Optional[Dict[str, str]] material_codes:
+            mapping of BBMRI.cz material types to specimen material codes,
+            see PatientXMLReader
+        :param Optional[str] request_method:
+            request method of entries
+        :param Optional[str] bundle_id_prefix:
+            ids of Bundles are the prefix followed by a random id of the run
+            and the number of the Bundle, for example bundle-1f0c2a9e4b7d-0,
+            so Bundles of different runs recorded by a journal have
+            different ids
+        :param Optional[UploadJournal] journal:
+            journal recording uploaded entries. Entries recorded by
+            a previous run with the same content are not uploaded again.
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when incorrect
+                           value inside argument is provided.
+        """
+        if not isinstance(uploader, BundleUploader):
+            raise TypeError("uploader has to be a BundleUploader!")
+
+        if base_url is not None and not isinstance(base_url, str):
+            raise TypeError("base_url has to be a string!")
+
+        if converters is None:
+            converters = _os.cpu_count() or 1
+
+        for name, value in (("bundle_size", bundle_size),
+                            ("readers", readers),
+                            ("converters", converters),
+                            ("serializers", serializers),
+                            ("queue_size", queue_size)):
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise TypeError("{} has to be int!".format(name))
+            if value < 1:
+                raise ValueError("{} has to be greater than 0!".format(name))
+
+        if request_method not in _BUNDLE_REQUEST_METHOD:
+            raise TypeError(
+                "{} in request_method is not correct method!".format(
+                    request_method))
+
+        if not isinstance(bundle_id_prefix, str):
+            raise TypeError("bundle_id_prefix has to be a string!")
+
+        if journal is not None and not isinstance(journal, UploadJournal):
+            raise TypeError("journal has to be an UploadJournal!")
+
+        self._uploader = uploader
+        self._bundleSize = bundle_size
+        self._readers = readers
+        self._converters = converters
+        self._serializers = serializers
+        self._queueSize = queue_size
+        self._executor = executor
+        self._ingestor = DirectoryIngestor(
+            workers=1, pattern=pattern,
+            default_material_code=default_material_code,
+            material_codes=material_codes)
+        self._convert = _partial(
+            _convert_export, default_material_code=default_material_code,
+            material_codes=material_codes,
+            base_url=base_url if base_url is not None else uploader.baseUrl,
+            request_method=request_method)
+        self._bundleIdPrefix = bundle_id_prefix
+        self._journal = journal
+
+    @property
+    def bundleSize(self):
+        """
+        Getter for the maximal number of entries of a Bundle.
+
+        :return: number of entries
+        """
+        return self._bundleSize
+
+    def _pending(self, groups):
+        """
+        Removes entries recorded by the journal from the groups.
+        """
+        pending = []
+        for group in groups:
+            group = self._journal.pending_entries(group)
+            if group:
+                pending.append(group)
+        return pending
+
+    def _upload(self, bundle_id, full_urls, digests, body):
+        self._uploader.upload(body, bundle_id)
+        if self._journal is not None:
+            self._journal.record(bundle_id, full_urls, digests)
+
+    @staticmethod
+    async def _stage(function, source, target, workers):
+        """
+        Runs workers applying the function on items of the source queue
+        until the end of the queue, results are put into the target queue.
+        """
+        async def work():
+            while True:
+                item = await source.get()
+                if item is _DONE:
+                    # let the other workers of the stage finish as well
+                    await source.put(_DONE)
+                    return
+                result = await function(item)
+                if target is not None:
+                    await target.put(result)
+
+        await _asyncio.gather(*(work() for _ in range(workers)))
+        if target is not None:
+            await target.put(_DONE)
+
+    async def run(self, source: Union[str, Iterable[str]]):
+        """
+        Coroutine that converts and uploads the exports.
+
+        :param source: directory containing XML exports, or an iterable
+            of paths of XML exports
+
+        :return: PipelineStats
+
+        :raise UploadError: This exception is raised when a Bundle cannot be
+                            uploaded. The pipeline is stopped, Bundles that
+                            are not sent yet are not uploaded.
+        """
+        paths = self._ingestor.files(source) if isinstance(source, str) \
+            else source
+        loop = _asyncio.get_running_loop()
+        counts = [0, 0, 0, 0, 0, 0]
+        bundle_id_prefix = self._bundleIdPrefix + \
+            _uuid.uuid4().hex[:12] + "-"
+        queues = [_asyncio.Queue(self._queueSize) for _ in range(5)]
+        readers = _ThreadPoolExecutor(self._readers)
+        uploaders = _ThreadPoolExecutor(self._uploader.concurrency)
+        executor = self._executor if self._executor is not None else \
+            _ThreadPoolExecutor(self._converters)
+
+        async def produce():
+            for path in paths:
+                await queues[0].put(path)
+            await queues[0].put(_DONE)
+
+        async def read(path):
+            data = await loop.run_in_executor(readers, _read_file, path)
+            counts[0] += 1
+            return data
+
+        async def convert(data):
+            groups = await loop.run_in_executor(executor, self._convert,
+                                                data)
+            counts[1] += len(groups)
+            resources = sum(len(group) for group in groups)
+            counts[2] += resources
+            if self._journal is not None:
+                groups = await loop.run_in_executor(readers, self._pending,
+                                                    groups)
+                counts[5] += resources - sum(len(group) for group in groups)
+            return groups
+
+        async def collect():
+            controller = self._uploader.controller
+            entries = []
+            while True:
+                groups = await queues[2].get()
+                if groups is _DONE:
+                    break
+                for group in groups:
+                    bundle_size = controller.bundleSize \
+                        if controller is not None else self._bundleSize
+                    if entries and len(entries) + len(group) > bundle_size:
+                        await queues[3].put(Bundle(
+                            bundle_id_prefix + str(counts[3]), entries))
+                        counts[3] += 1
+                        entries = []
+                    entries.extend(group)
+            if entries:
+                await queues[3].put(Bundle(
+                    bundle_id_prefix + str(counts[3]), entries))
+                counts[3] += 1
+            await queues[3].put(_DONE)
+
+        async def serialize(bundle):
+            return await loop.run_in_executor(executor, _serialize, bundle)
+
+        async def upload(serialized):
+            await loop.run_in_executor(uploaders, self._upload, *serialized)
+            counts[4] += len(serialized[3])
+
+        tasks = [_asyncio.ensure_future(coroutine) for coroutine in (
+            produce(),
+            self._stage(read, queues[0], queues[1], self._readers),
+            self._stage(convert, queues[1], queues[2], self._converters),
+            collect(),
+            self._stage(serialize, queues[3], queues[4], self._serializers),
+            self._stage(upload, queues[4], None,
+                        self._uploader.concurrency))]
+        try:
+            await _asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await _asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            readers.shutdown()
+            uploaders.shutdown()
+            if executor is not self._executor:
+                executor.shutdown()
+        return PipelineStats(*counts)
+
+    def upload(self, source: Union[str, Iterable[str]]):
+        """
+        Method that converts and uploads the exports, see run().
+
+        :param source: directory containing XML exports, or an iterable
+            of paths of XML exports
+
+        :return: PipelineStats
+
+        :raise UploadError: This exception is raised when a Bundle cannot be
+                            uploaded.
+        """
+        return _asyncio.run(self.run(source))
@@ -0,0 +1,205 @@
+import functools as _functools
+import threading as _threading
+import time as _time
+import tracemalloc as _tracemalloc
+from collections import namedtuple as _namedtuple
+from contextlib import contextmanager as _contextmanager
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.condition import ConditionResource
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.serializer import JSONSerializer
+from fhir_biobank.specimen import SpecimenResource
+
+__all__ = ["StageStats", "STAGES", "Profile", "enable", "disable",
+           "is_enabled", "snapshot", "reset", "profile"]
+
+StageStats = _namedtuple("StageStats", ["count", "seconds", "allocated"])
+StageStats.__doc__ = """
+Statistics of a single stage: number of calls, cumulative time in seconds
+(including time of stages called from it) and net number of bytes
+allocated by the calls, which is 0 unless allocations are traced.
+"""
+
+_INSTRUMENTED = [
+    (PatientResource, "__init__"), (SpecimenResource, "__init__"),
+    (ConditionResource, "__init__"), (Entry, "__init__"),
+    (Bundle, "__init__"),
+    (PatientResource, "_convert_to_FHIR"),
+    (SpecimenResource, "_convert_to_FHIR"),
+    (ConditionResource, "_convert_to_FHIR"), (Entry, "_convert_to_FHIR"),
+    (Bundle, "_convert_to_FHIR"), (Bundle, "bundleJSON"),
+    (JSONSerializer, "dumps"),
+]
+
+"""
+Names of all the measured stages
+"""
+STAGES = tuple("{}.{}".format(cls.__name__, name)
+               for cls, name in _INSTRUMENTED)
+
+_lock = _threading.Lock()
+# guards the statistics, updated by calls from any thread
+_statsLock = _threading.Lock()
+_stats = {stage: [0, 0.0, 0] for stage in STAGES}
+_originals = {}
+_enabled = 0
+_startedTracing = False
+
+
+def _wrap(function, stats, allocations):
+    perf_counter = _time.perf_counter
+    if allocations:
+        traced_memory = _tracemalloc.get_traced_memory
+
+        def wrapper(*args, **kwargs):
+            allocated = traced_memory()[0]
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                seconds = perf_counter() - start
+                allocated = traced_memory()[0] - allocated
+                with _statsLock:
+                    stats[0] += 1
+                    stats[1] += seconds
+                    stats[2] += allocated
+    else:
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                seconds = perf_counter() - start
+                with _statsLock:
+                    stats[0] += 1
+                    stats[1] += seconds
+    return _functools.wraps(function)(wrapper)
+
+
+def enable(allocations: bool = False):
+    """
+    Starts measuring the stages. Until then, the library runs without any
+    instrumentation. Calls of enable() and disable() can be nested,
+    measuring stops after the last disable().
+
+    :param bool allocations: trace allocations with tracemalloc, this
+        slows down the library considerably. Used only by the enable() call
+        that starts measuring.
+
+    :raise TypeError: This exception is raised when incorrect
+                      types of arguments are provided
+    """
+    global _enabled, _startedTracing
+    if not isinstance(allocations, bool):
+        raise TypeError("allocations has to be a boolean!")
+    with _lock:
+        _enabled += 1
+        if _enabled > 1:
+            return
+        if allocations and not _tracemalloc.is_tracing():
+            _tracemalloc.start()
+            _startedTracing = True
+        for (cls, name), stage in zip(_INSTRUMENTED, STAGES):
+            original = cls.__dict__[name]
+            _originals[stage] = original
+            if isinstance(original, staticmethod):
+                wrapper = staticmethod(_wrap(original.__func__,
+                                             _stats[stage], allocations))
+            else:
+                wrapper = _wrap(original, _stats[stage], allocations)
+            setattr(cls, name, wrapper)
+
+
+def disable():
+    """
+    Stops measuring the stages and removes the instrumentation.
+    Collected statistics are kept until reset().
+    """
+    global _enabled, _startedTracing
+    with _lock:
+        if _enabled == 0:
+            return
+        _enabled -= 1
+        if _enabled > 0:
+            return
+        for (cls, name), stage in zip(_INSTRUMENTED, STAGES):
+            setattr(cls, name, _originals.pop(stage))
+        if _startedTracing:
+            _tracemalloc.stop()
+            _startedTracing = False
+
+
+def is_enabled():
+    """
+    :return: True if the stages are measured
+    """
+    return _enabled > 0
+
+
+def snapshot():
+    """
+    :return: dictionary mapping names of the stages to StageStats
+    """
+    with _statsLock:
+        return {stage: StageStats(*stats) for stage, stats in _stats.items()}
+
+
+def reset():
+    """
+    Sets all the collected statistics to zero.
+    """
+    with _statsLock:
+        for stats in _stats.values():
+            stats[:] = [0, 0.0, 0]
+
+
+def _difference(after, before):
+    return {stage: StageStats(*(now - then for now, then in zip(
+        after[stage], before[stage]))) for stage in STAGES}
+
+
+class Profile:
+    """
+    Statistics measured inside a profile() block.
+    """
+
+    __slots__ = ("_before", "_after")
+
+    def __init__(self):
+        self._before = snapshot()
+        self._after = None
+
+    def _stop(self):
+        self._after = snapshot()
+
+    def snapshot(self):
+        """
+        :return: dictionary mapping names of the stages to StageStats
+            measured inside the block so far, or in the whole block
+            after it ended
+        """
+        after = self._after if self._after is not None else snapshot()
+        return _difference(after, self._before)
+
+
+@_contextmanager
+def profile(allocations: bool = False):
+    """
+    Context manager that measures the stages inside the with block::
+
+        with profile() as measured:
+            bundle.bundleJSON()
+        print(measured.snapshot()["Entry._convert_to_FHIR"])
+
+    :param bool allocations: trace allocations, see enable()
+
+    :return: Profile of the block
+    """
+    enable(allocations)
+    measured = Profile()
+    try:
+        yield measured
+    finally:
+        measured._stop()
+        disable()
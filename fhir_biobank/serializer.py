@@ -0,0 +1,250 @@
+import json as _json
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.condition import ConditionResource
+from fhir_biobank.custodian import Custodian
+from fhir_biobank.diagnosis import Diagnosis
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.specimen import SpecimenResource
+from fhir_biobank.storageTemperature import StorageTemperature
+from fhir_biobank._json import encode as _encode, \
+    codeable_concept as _codeable_concept, identifier as _identifier, \
+    reference as _reference, format_date as _format_date
+from fhir_biobank._Constants import META_PROFILE_URL as _META_PROFILE_URL
+from fhir_biobank._Constants import ICD_CODING_SYSTEM as _ICD_CODING_SYSTEM
+from fhir_biobank._Constants import SPECIMEN_TYPE_SYSTEM as \
+    _SPECIMEN_TYPE_SYSTEM
+from fhir_biobank._Constants import BODY_SITE_SYSTEM as _BODY_SITE_SYSTEM
+from fhir_biobank._Constants import SPECIMEN_QUANTITY_SYSTEM as \
+    _SPECIMEN_QUANTITY_SYSTEM
+
+__all__ = ["JSONSerializer"]
+
+
+def _meta(resource_type):
+    return '"meta":{"profile":[' + _encode(
+        _META_PROFILE_URL[resource_type]) + ']}'
+
+
+_PATIENT_META = _meta("Patient")
+_SPECIMEN_META = _meta("Specimen")
+_CONDITION_META = _meta("Condition")
+
+
+def _extension_json(extension):
+    if isinstance(extension, (Diagnosis, StorageTemperature, Custodian)):
+        return extension.JSONFragment
+    raise TypeError("extension has to be one of the following: "
+                    "StorageTemperature, Diagnosis or Custodian")
+
+
+def _patient_json(patient):
+    parts = ['{"id":', _encode(patient.patientId), ',', _PATIENT_META,
+             ',"identifier":',
+             _identifier(patient.identifier, patient.identifierType),
+             ',"gender":', _encode(patient.gender)]
+    if patient.birthDate is not None:
+        parts.append(',"birthDate":')
+        parts.append(_format_date(patient.birthDate))
+    parts.append(',"deceasedBoolean":true' if patient.deceasedBoolean
+                 else ',"deceasedBoolean":false')
+    if patient.deceasedDatetime is not None:
+        parts.append(',"deceasedDateTime":')
+        parts.append(_format_date(patient.deceasedDatetime))
+    parts.append(',"multipleBirthBoolean":true'
+                 if patient.multipleBirthBoolean
+                 else ',"multipleBirthBoolean":false')
+    if patient.multipleBirthInteger is not None:
+        parts.append(',"multipleBirthInteger":')
+        parts.append(_encode(patient.multipleBirthInteger))
+    if patient.link:
+        # mirrors PatientResource._create_patient_link
+        link = '{"other":' + _reference(
+            "patient/" + str(patient.identifier)) + ',"type":"refer"}'
+        parts.append(',"link":[')
+        parts.append(",".join([link] * len(patient.link)))
+        parts.append(']')
+    parts.append(',"resourceType":"Patient"}')
+    return "".join(parts)
+
+
+def _specimen_json(specimen):
+    parts = ['{"id":', _encode(specimen.specimenId),
+             ',"identifier":',
+             _identifier(specimen.identifier, specimen.identifierType),
+             ',', _SPECIMEN_META,
+             ',"type":', _codeable_concept(specimen.specimenMaterialCode,
+                                           _SPECIMEN_TYPE_SYSTEM),
+             ',"collection":{']
+    if specimen.bodySiteCollectionCode is not None:
+        parts.append('"bodySite":')
+        parts.append(_codeable_concept(specimen.bodySiteCollectionCode,
+                                       _BODY_SITE_SYSTEM))
+        parts.append(',')
+    parts.append('"collectedDateTime":')
+    parts.append(_format_date(specimen.collectedDateTime))
+    parts.append('},"subject":')
+    parts.append(_reference("Patient/" + specimen.subject.patientId))
+    parts.append(',"container":[{"specimenQuantity":{"value":')
+    parts.append(_encode(specimen.quantity))
+    if specimen.quantityUnit is not None:
+        parts.append(',"unit":')
+        parts.append(_encode(specimen.quantityUnit))
+    if specimen.quantityUnitCode is not None:
+        parts.append(',"code":')
+        parts.append(_encode(specimen.quantityUnitCode))
+    parts.append(',"system":')
+    parts.append(_encode(_SPECIMEN_QUANTITY_SYSTEM))
+    parts.append('}}]')
+    if specimen.extensions is not None:
+        parts.append(',"extension":[')
+        parts.append(",".join([_extension_json(extension)
+                               for extension in specimen.extensions]))
+        parts.append(']')
+    parts.append(',"resourceType":"Specimen"}')
+    return "".join(parts)
+
+
+def _condition_json(condition):
+    return '{' + _CONDITION_META + ',"code":' + _codeable_concept(
+        condition.conditionCode, _ICD_CODING_SYSTEM) + \
+           ',"onsetDateTime":' + _format_date(
+        condition.startingDateCondition) + \
+           ',"subject":' + _reference(
+        "patient/" + condition.patient.patientId) + \
+           ',"id":' + _encode(condition.conditionId) + \
+           ',"resourceType":"Condition"}'
+
+
+def _resource_json(resource):
+    serializer = _RESOURCE_SERIALIZERS.get(type(resource))
+    if serializer is None:
+        for resource_class, candidate in _RESOURCE_SERIALIZERS.items():
+            if isinstance(resource, resource_class):
+                serializer = candidate
+                break
+        else:
+            raise TypeError("resource type has to be one of the following: "
+                            "PatientResource, SpecimenResource or"
+                            " ConditionResource")
+    return serializer(resource)
+
+
+def _entry_json(entry):
+    serialized = '{"fullUrl":' + _encode(entry.resourceFullUrl) + \
+                 ',"request":{"method":' + _encode(entry.requestMethod) + \
+                 ',"url":' + _encode(entry.resourceShortUrl) + '}'
+    if entry.sourceResource is None:
+        return serialized + '}'
+    return serialized + ',"resource":' + \
+        _resource_json(entry.sourceResource) + '}'
+
+
+def _bundle_header(bundle_id):
+    return '{"id":' + _encode(bundle_id) + ',"entry":['
+
+
+def _bundle_footer(bundle_type):
+    return '],"type":' + _encode(bundle_type) + ',"resourceType":"Bundle"}'
+
+
+def _entry_bytes(entry):
+    """
+    Serialized entry, kept in the Entry so that bundles containing it
+    do not serialize it again.
+    """
+    serialized = entry._JSONBytes
+    if serialized is None:
+        serialized = _entry_json(entry).encode("utf-8")
+        entry._JSONBytes = serialized
+    return serialized
+
+
+def _bundle_bytes(bundle):
+    return _bundle_header(bundle.id).encode("utf-8") + b",".join(
+        [_entry_bytes(entry) for entry in bundle.sourceEntries]) + \
+           _bundle_footer(bundle.bundleType).encode("utf-8")
+
+
+_RESOURCE_SERIALIZERS = {
+    PatientResource: _patient_json,
+    SpecimenResource: _specimen_json,
+    ConditionResource: _condition_json,
+}
+
+
+def _to_bytes(obj):
+    if isinstance(obj, Bundle):
+        return _bundle_bytes(obj)
+    if isinstance(obj, Entry):
+        return _entry_bytes(obj)
+    if isinstance(obj, (Diagnosis, StorageTemperature, Custodian)):
+        return _extension_json(obj).encode("utf-8")
+    return _resource_json(obj).encode("utf-8")
+
+
+def _fhirclient_json(obj):
+    if isinstance(obj, (Diagnosis, StorageTemperature, Custodian)):
+        return obj.fhirExtension.as_json()
+    return obj.FHIRInterpretation.as_json()
+
+
+class JSONSerializer:
+    """
+    This class defines static methods that serialize resources, extensions,
+    entries and bundles of this library straight into JSON, without building
+    and validating fhirclient models first.
+    Serialized entries are kept in the Entry objects, so serializing
+    a Bundle again only serializes entries appended since.
+    """
+
+    @staticmethod
+    def dumps(obj, check_equivalence: bool = False):
+        """
+        This method creates JSON representation of a given object.
+
+        :param obj:
+            PatientResource, SpecimenResource, ConditionResource, Diagnosis,
+            StorageTemperature, Custodian, Entry or Bundle to serialize.
+        :param bool check_equivalence:
+            if True, the result is compared with the output of fhirclient
+            as_json() of the same object. This is slow and meant
+            for verification only.
+
+        :return: UTF-8 encoded JSON representation of the object.
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided
+        :raise ValueError: This exception is raised when check_equivalence
+                           is True and both representations differ
+        """
+        if not isinstance(check_equivalence, bool):
+            raise TypeError("check_equivalence has to be a boolean!")
+
+        serialized = _to_bytes(obj)
+
+        if check_equivalence and _json.loads(serialized) != \
+                _fhirclient_json(obj):
+            raise ValueError(
+                "JSON representation of {} differs from the one "
+                "created by fhirclient!".format(type(obj).__name__))
+        return serialized
+
+    @staticmethod
+    def dump(obj, fp, check_equivalence: bool = False):
+        """
+        This method writes JSON representation of a given object into
+        a binary file-like object.
+
+        :param obj:
+            PatientResource, SpecimenResource, ConditionResource, Diagnosis,
+            StorageTemperature, Custodian, Entry or Bundle to serialize.
+        :param fp:
+            binary file-like object with a write() method.
+        :param bool check_equivalence:
+            if True, the result is compared with the output of fhirclient
+            as_json() of the same object.
+
+        :return: number of bytes written.
+        """
+        return fp.write(JSONSerializer.dumps(obj, check_equivalence))
@@ -0,0 +1,261 @@
+import heapq as _heapq
+from typing import Iterable, Union
+
+from fhir_biobank.bundle import Entry
+from fhir_biobank.condition import ConditionResource
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.specimen import SpecimenResource
+from fhir_biobank._Constants import BUNDLE_REQUEST_METHOD as \
+    _BUNDLE_REQUEST_METHOD
+
+__all__ = ["ShardPlanner", "ShardPlan"]
+
+
+def _key(entry):
+    """
+    Returns relative url of the resource of the entry, the same as the one
+    used in references to it.
+    """
+    resource = entry.sourceResource
+    if resource is None:
+        return entry.resourceShortUrl
+    if isinstance(resource, PatientResource):
+        return "Patient/" + resource.patientId
+    if isinstance(resource, SpecimenResource):
+        return "Specimen/" + resource.specimenId
+    return "Condition/" + resource.conditionId
+
+
+def _references(entry):
+    """
+    Returns relative urls of resources the resource of the entry refers to.
+    """
+    resource = entry.sourceResource
+    if resource is None:
+        return []
+    if isinstance(resource, SpecimenResource):
+        return ["Patient/" + resource.subject.patientId]
+    if isinstance(resource, ConditionResource):
+        return ["Patient/" + resource.patient.patientId]
+    return ["Patient/" + link.patientId for link in resource.link or ()]
+
+
+class ShardPlan:
+    """
+    This class contains the result of ShardPlanner.plan(): entries in
+    topological order, grouped into levels and into independent shards.
+    """
+
+    __slots__ = ("_order", "_levels", "_shards", "_missingReferences")
+
+    def __init__(self, order, levels, shards, missing_references):
+        self._order = order
+        self._levels = levels
+        self._shards = shards
+        self._missingReferences = missing_references
+
+    @property
+    def order(self):
+        """
+        Getter for all the entries in topological order, every entry comes
+        after the entries it refers to.
+
+        :return: list of Entries
+        """
+        return self._order
+
+    @property
+    def levels(self):
+        """
+        Getter for levels of entries. Entries of a level refer only to
+        entries of previous levels, so a level can be uploaded concurrently
+        once the previous levels are uploaded. Entries of reference cycles
+        (patients linking each other) form the last level.
+
+        :return: list of lists of Entries
+        """
+        return self._levels
+
+    @property
+    def shards(self):
+        """
+        Getter for shards of entries. No entry refers to an entry of another
+        shard, so shards can be uploaded concurrently. Entries of a shard are
+        in topological order.
+
+        :return: list of lists of Entries
+        """
+        return self._shards
+
+    @property
+    def missingReferences(self):
+        """
+        Getter for references to resources that are not planned, these
+        have to exist on the server before the upload.
+
+        :return: set of relative urls, for example {"Patient/0"}
+        """
+        return self._missingReferences
+
+
+class ShardPlanner:
+    """
+    This class plans concurrent upload of resources. It builds the graph
+    of references between the resources (specimens and conditions refer
+    to their patients, patients to their linked patients), orders it
+    topologically and splits it into shards with no references between
+    them, balanced by number of entries.
+
+    Example::
+
+        plan = ShardPlanner(shards=4, base_url="https://example.com").plan(
+            resources)
+        for shard in plan.shards:
+            executor.submit(upload, shard)
+    """
+
+    def __init__(self, shards: int = 1, base_url: str = None,
+                 request_method: str = "PUT"):
+        """
+        :param Optional[int] shards:
+            maximal number of shards
+        :param Optional[str] base_url:
+            url of the FHIR server used to create entries for resources
+            that are given without an Entry, see Entry.from_resource.
+        :param Optional[str] request_method:
+            request method of entries created for resources
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when incorrect
+                           value inside argument is provided.
+        """
+        if not isinstance(shards, int) or isinstance(shards, bool):
+            raise TypeError("shards has to be int!")
+
+        if shards < 1:
+            raise ValueError("shards has to be greater than 0!")
+
+        if base_url is not None and not isinstance(base_url, str):
+            raise TypeError("base_url has to be a string!")
+
+        if request_method not in _BUNDLE_REQUEST_METHOD:
+            raise TypeError(
+                "{} in request_method is not correct method!".format(
+                    request_method))
+
+        self._shards = shards
+        self._baseUrl = base_url
+        self._requestMethod = request_method
+
+    @property
+    def shards(self):
+        """
+        Getter for the maximal number of shards.
+
+        :return: number of shards
+        """
+        return self._shards
+
+    def _entry(self, item):
+        if isinstance(item, Entry):
+            return item
+        if not isinstance(item, (PatientResource, SpecimenResource,
+                                 ConditionResource)):
+            raise TypeError("items have to be Entries, PatientResources, "
+                            "SpecimenResources or ConditionResources!")
+        if self._baseUrl is None:
+            raise ValueError(
+                "base_url has to be provided to plan resources "
+                "without an Entry!")
+        return Entry.from_resource(item, self._baseUrl, self._requestMethod)
+
+    def plan(self, items: Iterable[Union[Entry, PatientResource,
+                                         SpecimenResource,
+                                         ConditionResource]]):
+        """
+        Method that plans the upload of the items.
+
+        :param items: iterable of Entries or resources
+
+        :return: ShardPlan
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of items are provided.
+        :raise ValueError: This exception is raised when resources are
+                           given without an Entry and base_url is None.
+        """
+        entries = [self._entry(item) for item in items]
+        nodes = {}
+        for index, entry in enumerate(entries):
+            nodes.setdefault(_key(entry), []).append(index)
+
+        # dependents[index] are indexes of entries referring to the entry,
+        # pending[index] is the number of entries the entry refers to
+        dependents = [[] for _ in entries]
+        pending = [0] * len(entries)
+        parents = list(range(len(entries)))
+        missing = set()
+
+        def find(index):
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+
+        for index, entry in enumerate(entries):
+            for reference in _references(entry):
+                targets = nodes.get(reference)
+                if targets is None:
+                    missing.add(reference)
+                    continue
+                for target in targets:
+                    if target == index:
+                        continue
+                    dependents[target].append(index)
+                    pending[index] += 1
+                    parents[find(index)] = find(target)
+
+        levels = []
+        level = [index for index in range(len(entries)) if not pending[index]]
+        ordered = 0
+        position = [len(entries)] * len(entries)
+        while level:
+            levels.append(level)
+            following = []
+            for index in level:
+                position[index] = ordered
+                ordered += 1
+                for dependent in dependents[index]:
+                    pending[dependent] -= 1
+                    if not pending[dependent]:
+                        following.append(dependent)
+            level = sorted(following)
+        cycles = [index for index in range(len(entries)) if pending[index]]
+        if cycles:
+            levels.append(cycles)
+            for index in cycles:
+                position[index] = ordered
+                ordered += 1
+
+        components = {}
+        for index in range(len(entries)):
+            components.setdefault(find(index), []).append(index)
+        shard_count = min(self._shards, len(components)) or 1
+        loads = [(0, shard) for shard in range(shard_count)]
+        shards = [[] for _ in range(shard_count)]
+        for component in sorted(components.values(),
+                                key=lambda component: (-len(component),
+                                                       component[0])):
+            load, shard = _heapq.heappop(loads)
+            shards[shard].extend(component)
+            _heapq.heappush(loads, (load + len(component), shard))
+
+        order = sorted(range(len(entries)), key=position.__getitem__)
+        return ShardPlan(
+            [entries[index] for index in order],
+            [[entries[index] for index in level] for level in levels],
+            [[entries[index] for index in sorted(shard,
+                                                 key=position.__getitem__)]
+             for shard in shards if shard],
+            missing)
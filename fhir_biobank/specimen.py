@@ -1,4 +1,4 @@
-from datetime import date, datetime
+from datetime import date
 from typing import List, Union
 
 from fhir_biobank.custodian import Custodian
@@ -14,12 +14,18 @@ from fhir_biobank._Constants import SPECIMEN_TYPE_SYSTEM as \
     _SPECIMEN_TYPE_SYSTEM
 from fhir_biobank._Constants import IDENTIFIER_TYPE_CODES as \
     _IDENTIFIER_TYPE_CODES
-import fhirclient.models.specimen as _fhirclient_specimen
-import fhirclient.models.meta as _fhirclient_meta
-import fhirclient.models.fhirdate as _fhirclient_date
-import fhirclient.models.quantity as _fhirclient_quantity
+from fhir_biobank._lazy import lazy_import as _lazy_import
 
 from fhir_biobank.helperFunctions import Helper as _Helper
+import fhir_biobank.validation as _validation
+from fhir_biobank._schema import Schema as _Schema, Type as _Type, \
+    Choice as _Choice, NotFuture as _NotFuture, Rule as _Rule, \
+    Items as _Items
+
+_fhirclient_specimen = _lazy_import("fhirclient.models.specimen")
+_fhirclient_meta = _lazy_import("fhirclient.models.meta")
+_fhirclient_date = _lazy_import("fhirclient.models.fhirdate")
+_fhirclient_quantity = _lazy_import("fhirclient.models.quantity")
 
 __all__ = ["SpecimenResource"]
 
@@ -30,6 +36,11 @@ class SpecimenResource:
     be used for analysis.
     """
 
+    __slots__ = ("_specimenId", "_identifier", "_specimenMaterialCode",
+                 "_subject", "_bodySiteCollectionCode", "_collectedDate",
+                 "_quantity", "_quantityUnit", "_quantityUnitCode",
+                 "_extensions", "_identifierType", "_FHIRSpecimen")
+
     def __init__(self, specimen_id: str, identifier: str,
                  specimen_material_code: str,
                  subject: PatientResource,
@@ -40,7 +51,7 @@ class SpecimenResource:
                  quantity_unit_code: str = None,
                  extensions: List[Union[
                      Diagnosis, Custodian, StorageTemperature]] = None,
-                 identifier_type: str = "ACSN"):
+                 identifier_type: str = "ACSN", validation: str = None):
         """
         :param string specimen_id:
             Internal id that represents unique specimen,
@@ -85,76 +96,26 @@ class SpecimenResource:
             "NIIP","PRN", "MD", "DR", "ACSN", "UDI", "SNO", "SB", "PLAC",
             "FILL", "JHN". For more info see
             https://simplifier.net/packages/hl7.fhir.r4.core/4.0.1/files/82653
+        :param Optional[string] validation:
+            validation mode of this call, "strict", "trusted" or "deferred",
+            see fhir_biobank.validation. None uses the current mode.
 
         :raise TypeError: This exception is raised when incorrect
             types of arguments are provided
         :raise ValueError: This exception is raised when incorrect
             value in argument is provided
         """
-        if not isinstance(specimen_id, str):
-            raise TypeError("condition_id has to be a string!")
-
-        if not isinstance(identifier, str):
-            raise TypeError("identifier has to be string!")
-        if not isinstance(specimen_material_code, str):
-            raise TypeError("specimen_material_code has to be a string!")
-        if specimen_material_code not in _SPECIMEN_TYPE:
-            raise ValueError(
-                "{} in specimen_type_codeable_concept.coding is not correct "
-                "code for specimen."
-                "code has to be one of the following".format(
-                    specimen_material_code) +
-                " ".join(["{}"] * len(_SPECIMEN_TYPE)).format(*_SPECIMEN_TYPE))
-
-        if not isinstance(subject, PatientResource):
-            raise TypeError(
-                "subject has to be Patient_Resource - patient from which "
-                "specimen was taken!")
-        if body_site_collection_code is not None and not isinstance(
-                body_site_collection_code, str):
-            raise TypeError("body_site_collection_code has to be a string!")
-
-        if not isinstance(collected_date, date):
-            raise TypeError("collected_date_time has to be a datetime!")
-
-        if collected_date > datetime.today().date():
-            raise ValueError(
-                "collected_date_time cannot be greater than today's date! ")
-        if not isinstance(quantity, float):
-            raise TypeError("quantity has to be a float!")
-
-        if quantity_unit is not None and not isinstance(quantity_unit, str):
-            raise TypeError("quantity_unit has to be a string!")
-
-        if quantity_unit_code is not None and not isinstance(
-                quantity_unit_code,
-                str):
-            raise TypeError("quantity_unit_code has to be a string!")
-
-        if extensions is not None and not isinstance(extensions, List):
-            raise TypeError("extensions has to be List or None!")
-        if extensions is not None:
-            if len(extensions) == 0:
-                raise ValueError("extensions cannot be an empty list!")
-            for extension in extensions:
-                if not isinstance(extension, StorageTemperature) \
-                        and not isinstance(extension, Diagnosis) \
-                        and not isinstance(extension, Custodian):
-                    raise TypeError(
-                        "Extensions have to be one of the following:"
-                        " StorageTemperature, Diagnosis or Custodian")
-
-        if not isinstance(identifier_type, str):
-            raise TypeError("identifier_type has to be a string!")
-
-        if identifier_type not in _IDENTIFIER_TYPE_CODES:
-            raise Exception(
-                "{} in identifier_type is not a correct type!"
-                "identifier type has to be one of the following".format(
-                    identifier_type) +
-                " ".join(
-                    ["{}"] * len(_IDENTIFIER_TYPE_CODES)).format(
-                    *_IDENTIFIER_TYPE_CODES))
+        mode = _validation._resolve(validation)
+        if mode != _validation.TRUSTED:
+            try:
+                _check_arguments(specimen_id, identifier,
+                                 specimen_material_code, subject,
+                                 collected_date, quantity,
+                                 body_site_collection_code, quantity_unit,
+                                 quantity_unit_code, extensions,
+                                 identifier_type)
+            except Exception as error:
+                _validation._report(error, mode)
 
         self._specimenId = specimen_id
         self._identifier = identifier
@@ -273,7 +234,7 @@ class SpecimenResource:
 
         :return: code for the type of identifier
         """
-        return self.identifierType
+        return self._identifierType
 
     @property
     def FHIRInterpretation(self):
@@ -360,3 +321,40 @@ class SpecimenResource:
         FHIR_specimen.container = [container]
         FHIR_specimen.extension = extensions
         return FHIR_specimen
+
+
+_check_arguments = _Schema(SpecimenResource, [
+    _Type("specimen_id", str, "condition_id has to be a string!"),
+    _Type("identifier", str, "identifier has to be string!"),
+    _Type("specimen_material_code", str,
+          "specimen_material_code has to be a string!"),
+    _Choice("specimen_material_code", _SPECIMEN_TYPE,
+            "{} in specimen_type_codeable_concept.coding is not correct "
+            "code for specimen."
+            "code has to be one of the following"),
+    _Type("subject", PatientResource,
+          "subject has to be Patient_Resource - patient from which "
+          "specimen was taken!"),
+    _Type("body_site_collection_code", str,
+          "body_site_collection_code has to be a string!", optional=True),
+    _Type("collected_date", date, "collected_date_time has to be a datetime!"),
+    _NotFuture("collected_date",
+               "collected_date_time cannot be greater than today's date! "),
+    _Type("quantity", float, "quantity has to be a float!"),
+    _Type("quantity_unit", str, "quantity_unit has to be a string!",
+          optional=True),
+    _Type("quantity_unit_code", str, "quantity_unit_code has to be a string!",
+          optional=True),
+    _Type("extensions", list, "extensions has to be List or None!",
+          optional=True),
+    _Rule("extensions is not None and len(extensions) == 0",
+          "extensions cannot be an empty list!"),
+    _Items("extensions", (StorageTemperature, Diagnosis, Custodian),
+           "Extensions have to be one of the following:"
+           " StorageTemperature, Diagnosis or Custodian", optional=True),
+    _Type("identifier_type", str, "identifier_type has to be a string!"),
+    _Choice("identifier_type", _IDENTIFIER_TYPE_CODES,
+            "{} in identifier_type is not a correct type!"
+            "identifier type has to be one of the following",
+            exception=Exception),
+]).check
@@ -0,0 +1,274 @@
+from array import array as _array
+from datetime import date as _date
+from typing import List, Optional
+
+from fhir_biobank.diagnosis import Diagnosis
+from fhir_biobank.serializer import _SPECIMEN_META
+from fhir_biobank._json import encode as _encode, \
+    identifier as _identifier, codeable_concept as _codeable_concept, \
+    reference as _reference
+from fhir_biobank._Constants import SPECIMEN_TYPE as _SPECIMEN_TYPE
+from fhir_biobank._Constants import SPECIMEN_TYPE_SYSTEM as \
+    _SPECIMEN_TYPE_SYSTEM
+from fhir_biobank._Constants import SPECIMEN_QUANTITY_SYSTEM as \
+    _SPECIMEN_QUANTITY_SYSTEM
+from fhir_biobank._Constants import IDENTIFIER_TYPE_CODES as \
+    _IDENTIFIER_TYPE_CODES
+from fhir_biobank._Constants import BUNDLE_REQUEST_METHOD as \
+    _BUNDLE_REQUEST_METHOD
+
+__all__ = ["SpecimenBatch"]
+
+_MATERIAL_INDEX = {code: index for index, code in enumerate(_SPECIMEN_TYPE)}
+_QUANTITY_SYSTEM = _encode(_SPECIMEN_QUANTITY_SYSTEM)
+
+
+def _check_strings(column, name, optional=False):
+    types = set(map(type, column))
+    if optional:
+        types.discard(type(None))
+    if not types <= {str}:
+        raise TypeError("{} has to contain strings only!".format(name))
+
+
+class SpecimenBatch:
+    """
+    This class stores many specimens column by column instead of one
+    SpecimenResource per specimen. Columns are validated at once and
+    specimens are serialized straight from the columns, producing the same
+    JSON as JSONSerializer does for equivalent SpecimenResources.
+
+    Material codes, collection dates and quantities are kept in compact
+    arrays of the standard array module.
+    """
+
+    def __init__(self, specimen_ids: List[str], identifiers: List[str],
+                 specimen_material_codes: List[str], subject_ids: List[str],
+                 collected_dates: List[_date], quantities: List[float],
+                 diagnosis_codes: List[Optional[str]] = None,
+                 identifier_type: str = "ACSN"):
+        """
+        :param List[string] specimen_ids:
+            Internal ids that represent unique specimens
+        :param List[string] identifiers:
+            identifiers of the specimens
+        :param List[string] specimen_material_codes:
+            Types of material that form the specimens,
+            see SpecimenResource for correct values.
+        :param List[string] subject_ids:
+            internal ids of PatientResources the specimens come from.
+        :param List[date] collected_dates:
+            dates when the specimens were collected
+        :param List[float] quantities:
+            quantities of the specimens
+        :param Optional[List[Optional[string]]] diagnosis_codes:
+            ICD-10 codes of the Diagnosis extension of each specimen,
+            None for specimens without a diagnosis.
+        :param Optional[string] identifier_type:
+            a coded type of the identifiers, see SpecimenResource.
+
+        :raise TypeError: This exception is raised when incorrect
+            types of arguments are provided
+        :raise ValueError: This exception is raised when incorrect
+            value in argument is provided
+        """
+        columns = [specimen_ids, identifiers, specimen_material_codes,
+                   subject_ids, collected_dates, quantities]
+        if diagnosis_codes is not None:
+            columns.append(diagnosis_codes)
+        for column in columns:
+            if not isinstance(column, (list, tuple)):
+                raise TypeError("columns have to be lists!")
+        if len(set(map(len, columns))) > 1:
+            raise ValueError("all columns have to be of the same length!")
+
+        _check_strings(specimen_ids, "specimen_ids")
+        _check_strings(identifiers, "identifiers")
+        _check_strings(specimen_material_codes, "specimen_material_codes")
+        _check_strings(subject_ids, "subject_ids")
+        if diagnosis_codes is not None:
+            _check_strings(diagnosis_codes, "diagnosis_codes", optional=True)
+
+        incorrect_codes = set(specimen_material_codes).difference(
+            _MATERIAL_INDEX)
+        if incorrect_codes:
+            raise ValueError(
+                "{} in specimen_material_codes are not correct codes for "
+                "specimen.".format(", ".join(sorted(incorrect_codes))))
+
+        if not set(map(type, quantities)) <= {float}:
+            raise TypeError("quantities have to contain floats only!")
+
+        for collected_date in collected_dates:
+            if not isinstance(collected_date, _date):
+                raise TypeError("collected_dates have to contain dates only!")
+        ordinals = _array("l", map(_date.toordinal, collected_dates))
+        if ordinals and max(ordinals) > _date.today().toordinal():
+            raise ValueError(
+                "collected_dates cannot be greater than today's date!")
+
+        if identifier_type not in _IDENTIFIER_TYPE_CODES:
+            raise ValueError(
+                "{} in identifier_type is not a correct type!".format(
+                    identifier_type))
+
+        self._specimenIds = list(specimen_ids)
+        self._identifiers = list(identifiers)
+        self._materialCodes = _array("B", map(_MATERIAL_INDEX.__getitem__,
+                                              specimen_material_codes))
+        self._subjectIds = list(subject_ids)
+        self._collectedDates = ordinals
+        self._quantities = _array("d", quantities)
+        self._diagnosisCodes = list(diagnosis_codes) \
+            if diagnosis_codes is not None else None
+        self._identifierType = identifier_type
+
+    def __len__(self):
+        return len(self._specimenIds)
+
+    @property
+    def specimenIds(self):
+        """
+        Getter for internal ids of the specimens.
+
+        :return: list of internal ids
+        """
+        return self._specimenIds
+
+    @property
+    def identifiers(self):
+        """
+        Getter for identifiers of the specimens.
+
+        :return: list of identifiers
+        """
+        return self._identifiers
+
+    @property
+    def specimenMaterialCodes(self):
+        """
+        Getter for material codes of the specimens.
+
+        :return: list of material codes
+        """
+        return [_SPECIMEN_TYPE[index] for index in self._materialCodes]
+
+    @property
+    def subjectIds(self):
+        """
+        Getter for internal ids of patients the specimens come from.
+
+        :return: list of patient ids
+        """
+        return self._subjectIds
+
+    @property
+    def collectedDates(self):
+        """
+        Getter for collection dates of the specimens.
+
+        :return: list of dates
+        """
+        return [_date.fromordinal(ordinal)
+                for ordinal in self._collectedDates]
+
+    @property
+    def quantities(self):
+        """
+        Getter for quantities of the specimens.
+
+        :return: array of quantities
+        """
+        return self._quantities
+
+    @property
+    def diagnosisCodes(self):
+        """
+        Getter for diagnosis codes of the specimens.
+
+        :return: list of diagnosis codes, or None
+        """
+        return self._diagnosisCodes
+
+    def iter_json(self):
+        """
+        Method that serializes the specimens one by one.
+
+        :return: generator of UTF-8 encoded JSON representations of
+            FHIR Specimen resources
+        """
+        identifier_type = self._identifierType
+        material_types = [
+            ',"type":' + _codeable_concept(code, _SPECIMEN_TYPE_SYSTEM) +
+            ',"collection":{"collectedDateTime":'
+            for code in _SPECIMEN_TYPE]
+        dates = {}
+        extensions = {}
+        diagnosis_codes = self._diagnosisCodes
+        for index, specimen_id in enumerate(self._specimenIds):
+            ordinal = self._collectedDates[index]
+            collected = dates.get(ordinal)
+            if collected is None:
+                collected = '"' + _date.fromordinal(ordinal).isoformat() + '"'
+                dates[ordinal] = collected
+            parts = ['{"id":', _encode(specimen_id), ',"identifier":',
+                     _identifier(self._identifiers[index], identifier_type),
+                     ',', _SPECIMEN_META,
+                     material_types[self._materialCodes[index]], collected,
+                     '},"subject":',
+                     _reference("Patient/" + self._subjectIds[index]),
+                     ',"container":[{"specimenQuantity":{"value":',
+                     _encode(self._quantities[index]),
+                     ',"system":', _QUANTITY_SYSTEM, '}}]']
+            if diagnosis_codes is not None and \
+                    diagnosis_codes[index] is not None:
+                code = diagnosis_codes[index]
+                extension = extensions.get(code)
+                if extension is None:
+                    extension = ',"extension":[' + \
+                                Diagnosis(code).JSONFragment + ']'
+                    extensions[code] = extension
+                parts.append(extension)
+            parts.append(',"resourceType":"Specimen"}')
+            yield "".join(parts).encode("utf-8")
+
+    def iter_entries_json(self, base_url: str, request_method: str = "PUT"):
+        """
+        Method that serializes the specimens as Bundle entries, with urls
+        created the same way as Entry.from_resource does. Entries can be
+        written with BundleWriter.write_serialized().
+
+        :param string base_url: url of the FHIR server
+        :param Optional[string] request_method: request method of entries
+
+        :return: generator of UTF-8 encoded JSON representations of entries
+        """
+        if not isinstance(base_url, str):
+            raise TypeError("base_url has to be a string!")
+        if request_method not in _BUNDLE_REQUEST_METHOD:
+            raise TypeError(
+                "{} in request_method is not correct method!".format(
+                    request_method))
+        base_url = base_url.rstrip("/") + "/"
+        method = _encode(request_method).encode("utf-8")
+        for specimen_id, specimen_json in zip(self._specimenIds,
+                                              self.iter_json()):
+            short_url = "Specimen/" + specimen_id
+            yield b'{"fullUrl":' + _encode(base_url + short_url).encode(
+                "utf-8") + b',"request":{"method":' + method + \
+                  b',"url":' + _encode(short_url).encode("utf-8") + \
+                  b'},"resource":' + specimen_json + b'}'
+
+    def write_ndjson(self, exporter):
+        """
+        Method that writes all the specimens into a NDJSONExporter.
+
+        :param NDJSONExporter exporter: exporter to write the specimens to
+
+        :return: number of written specimens
+        """
+        count = 0
+        for specimen_json in self.iter_json():
+            exporter.write_serialized("Specimen", specimen_json)
+            count += 1
+        return count
@@ -5,11 +5,18 @@ from fhir_biobank._Constants import STORAGE_TEMPERATURE_EXTENSION_URL as \
 from fhir_biobank._Constants import STORAGE_TEMPERATURE_SYSTEM as \
     _STORAGE_TEMPERATURE_SYSTEM
 from fhir_biobank.helperFunctions import Helper as _Helper
+from fhir_biobank._cache import LRUCache as _LRUCache
+from fhir_biobank._json import encode as _encode, \
+    codeable_concept as _codeable_concept
 
-import fhirclient.models.extension as _fhirclient_extension
+from fhir_biobank._lazy import lazy_import as _lazy_import
+
+_fhirclient_extension = _lazy_import("fhirclient.models.extension")
 
 __all__ = ["StorageTemperature"]
 
+_INTERNED = _LRUCache(len(_STORAGE_TEMPERATURE_CODES))
+
 
 class StorageTemperature:
     """
@@ -17,9 +24,15 @@ class StorageTemperature:
         which temperature was the sample kept at.
         It is is used in specimen resources (parameter extensions.)
         URL of the extension is already provided.
+
+        Instances are immutable and shared - creating StorageTemperature
+        with the same code returns the same instance from a bounded cache.
     """
 
-    def __init__(self, storage_temperature_code: str):
+    __slots__ = ("_storage_temperature_code", "_storage_temperature_url",
+                 "_JSONFragment")
+
+    def __new__(cls, storage_temperature_code: str):
         """
         :param string storage_temperature_code: code of the temperature that
             the sample was stored in. Available codes are at
@@ -27,6 +40,11 @@ class StorageTemperature:
         """
         if not isinstance(storage_temperature_code, str):
             raise TypeError("storage_temperature_code has to be string!")
+
+        instance = _INTERNED.get(storage_temperature_code)
+        if instance is not None:
+            return instance
+
         if storage_temperature_code not in _STORAGE_TEMPERATURE_CODES:
             raise Exception(
                 "{} in storage_temperature_code is not correct "
@@ -36,18 +54,53 @@ class StorageTemperature:
                 " ".join(["{}"] * len(_STORAGE_TEMPERATURE_CODES)).format(
                     *_STORAGE_TEMPERATURE_CODES))
 
-        self._storage_temperature_code = storage_temperature_code
-        self._storage_temperature_url = _STORAGE_TEMPERATURE_EXTENSION_URL
+        instance = object.__new__(cls)
+        object.__setattr__(instance, "_storage_temperature_code",
+                           storage_temperature_code)
+        object.__setattr__(instance, "_storage_temperature_url",
+                           _STORAGE_TEMPERATURE_EXTENSION_URL)
+        object.__setattr__(instance, "_JSONFragment",
+                           '{"url":' +
+                           _encode(_STORAGE_TEMPERATURE_EXTENSION_URL) +
+                           ',"valueCodeableConcept":' + _codeable_concept(
+                               storage_temperature_code,
+                               _STORAGE_TEMPERATURE_SYSTEM) + '}')
+        return _INTERNED.put(storage_temperature_code, instance)
 
-        storage_temp_coding = _Helper.create_coding(storage_temperature_code,
-                                                    _STORAGE_TEMPERATURE_SYSTEM
-                                                    , user_selected=False)
-        storage_temp_codeable_concept = _Helper.create_codeable_concept(
-            [storage_temp_coding])
+    def __setattr__(self, name, value):
+        raise AttributeError("StorageTemperature is immutable!")
+
+    def __delattr__(self, name):
+        raise AttributeError("StorageTemperature is immutable!")
+
+    def __reduce__(self):
+        return StorageTemperature, (self._storage_temperature_code,)
+
+    @staticmethod
+    def cache_info():
+        """
+        Method that returns statistics of the cache of shared instances.
+
+        :return: CacheInfo(hits, misses, evictions, maxsize, currsize)
+        """
+        return _INTERNED.info()
+
+    @staticmethod
+    def cache_clear():
+        """
+        Method that empties the cache of shared instances
+        and resets its statistics.
+        """
+        _INTERNED.clear()
+
+    @staticmethod
+    def set_cache_size(maxsize: int):
+        """
+        Method that changes the maximal number of shared instances.
 
-        self._extension = _fhirclient_extension.Extension()
-        self._extension.url = self._storage_temperature_url
-        self._extension.valueCodeableConcept = storage_temp_codeable_concept
+        :param int maxsize: maximal number of cached instances
+        """
+        _INTERNED.resize(maxsize)
 
     @property
     def storageTemperatureCode(self):
@@ -75,5 +128,35 @@ class StorageTemperature:
         interpreted as a FHIR extension.
 
         :return: FHIR StorageTemeperature extension in a correct FHIR representation.
+            A new extension is created on every call, so it can be
+            changed without affecting other users of the instance.
+        """
+        return self._convert_to_FHIR()
+
+    @property
+    def JSONFragment(self):
+        """
+        Getter for a JSON representation of the extension,
+        created once and reused by JSONSerializer.
+
+        :return: JSON representation of the FHIR extension
+        """
+        return self._JSONFragment
+
+    def _convert_to_FHIR(self):
+        """
+        private function to create a FHIR representation of the extension
+        used in self.fhirExtension
+
+        :return: fhirclient.models.extension.Extension
         """
-        return self._extension
+        storage_temp_coding = _Helper.create_coding(
+            self._storage_temperature_code, _STORAGE_TEMPERATURE_SYSTEM,
+            user_selected=False)
+        storage_temp_codeable_concept = _Helper.create_codeable_concept(
+            [storage_temp_coding])
+
+        extension = _fhirclient_extension.Extension()
+        extension.url = self._storage_temperature_url
+        extension.valueCodeableConcept = storage_temp_codeable_concept
+        return extension
@@ -0,0 +1,411 @@
+import codecs as _codecs
+import io as _io
+import json as _json
+import re as _re
+import sys as _sys
+from collections import namedtuple as _namedtuple
+from typing import Iterable, Union
+
+from fhir_biobank.bundle import Bundle
+
+__all__ = ["ServerVersion", "TransactionResponseIndex",
+           "TransactionResponseParser"]
+
+ServerVersion = _namedtuple("ServerVersion", ["resource_type", "id",
+                                              "version", "etag"])
+ServerVersion.__doc__ = """
+Identity of a resource on the server: its type, server-assigned id,
+version id and ETag of the version, None if the server did not report it.
+"""
+
+_DECODER = _json.JSONDecoder()
+_WHITESPACE = _re.compile(r"[ \t\n\r]*")
+_RESPONSE_TYPES = ("transaction-response", "batch-response")
+
+
+def _server_version(location, etag):
+    """
+    Parses the location of a response entry, for example
+    "Patient/123/_history/2" or an absolute url.
+    """
+    segments = [segment for segment in
+                location.split("?", 1)[0].split("/") if segment]
+    version = None
+    if len(segments) >= 4 and segments[-2] == "_history":
+        version = segments[-1]
+        segments = segments[:-2]
+    if version is None and etag:
+        version = etag[2:] if etag.startswith("W/") else etag
+        version = version.strip('"')
+    if len(segments) < 2:
+        raise ValueError("{} is not correct location!".format(location))
+    # few distinct resource types are shared by all the entries
+    return ServerVersion(_sys.intern(segments[-2]), segments[-1], version,
+                         etag)
+
+
+class _Scanner:
+    """
+    Reads JSON values one by one from a stream, keeping only the unread
+    part of the stream in memory.
+    """
+
+    def __init__(self, read, chunk_size):
+        self._read = read
+        self._chunkSize = chunk_size
+        self._decoder = _codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _fill(self):
+        """
+        Reads at least as much as is buffered, so a value spanning many
+        chunks is decoded a logarithmic number of times.
+        """
+        if self._eof:
+            return False
+        unread = self._buffer[self._position:]
+        chunk = self._read(max(self._chunkSize, len(unread)))
+        if not chunk:
+            self._eof = True
+            text = self._decoder.decode(b"", final=True)
+        elif isinstance(chunk, str):
+            text = chunk
+        else:
+            text = self._decoder.decode(chunk)
+        self._buffer = unread + text
+        self._position = 0
+        return True
+
+    def peek(self):
+        while True:
+            self._position = _WHITESPACE.match(self._buffer,
+                                               self._position).end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return None
+
+    def expect(self, character):
+        if self.peek() != character:
+            raise ValueError("transaction response is not correct JSON, "
+                             "{} expected!".format(character))
+        self._position += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._position)
+            except _json.JSONDecodeError as error:
+                if not self._fill():
+                    raise ValueError("transaction response is not correct "
+                                     "JSON: {}".format(error)) from None
+                continue
+            # a number at the end of the buffer may continue in the stream
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._position = end
+            return value
+
+
+class TransactionResponseIndex:
+    """
+    This class maps full urls of entries of uploaded Bundles
+    (Entry.resourceFullUrl) to the identity of the resources
+    on the server, see ServerVersion. The index can be written into
+    a compact tab-separated file and read back later, for example to send
+    conditional updates with the If-Match header.
+    """
+
+    __slots__ = ("_versions", "_failures")
+
+    def __init__(self):
+        self._versions = {}
+        self._failures = {}
+
+    @property
+    def failures(self):
+        """
+        Getter for entries the server did not process, mapping full urls
+        to the status of the response entry, for example "404 Not Found".
+        Only batch responses contain failed entries.
+
+        :return: dictionary of failed entries
+        """
+        return self._failures
+
+    def __len__(self):
+        return len(self._versions)
+
+    def __contains__(self, full_url):
+        return full_url in self._versions
+
+    def __iter__(self):
+        return iter(self._versions)
+
+    def __getitem__(self, full_url):
+        return self._versions[full_url]
+
+    def get(self, full_url: str, default=None):
+        """
+        :param string full_url: full url of an entry
+
+        :return: ServerVersion of the entry, or default
+        """
+        return self._versions.get(full_url, default)
+
+    def items(self):
+        """
+        :return: view of pairs of full urls and ServerVersions
+        """
+        return self._versions.items()
+
+    def add(self, full_url: str, location: str, etag: str = None):
+        """
+        Method that adds an entry.
+
+        :param string full_url: full url of the entry
+        :param string location: location of the resource from the response
+        :param Optional[str] etag: ETag of the resource from the response
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when the location
+                           is not correct.
+        """
+        if not isinstance(full_url, str):
+            raise TypeError("full_url has to be a string!")
+
+        if not isinstance(location, str):
+            raise TypeError("location has to be a string!")
+
+        if etag is not None and not isinstance(etag, str):
+            raise TypeError("etag has to be a string!")
+
+        self._versions[full_url] = _server_version(location, etag)
+        self._failures.pop(full_url, None)
+
+    def remove(self, full_url: str):
+        """
+        Method that forgets an entry, for example a deleted resource.
+
+        :param string full_url: full url of the entry
+
+        :return: removed ServerVersion, None if the entry is not known
+        """
+        self._failures.pop(full_url, None)
+        return self._versions.pop(full_url, None)
+
+    def if_match(self, full_url: str):
+        """
+        :param string full_url: full url of an entry
+
+        :return: value of the If-Match header updating the known version
+            of the entry, or None if the version is not known
+        """
+        version = self._versions.get(full_url)
+        if version is None:
+            return None
+        if version.etag is not None:
+            return version.etag
+        if version.version is not None:
+            return 'W/"{}"'.format(version.version)
+        return None
+
+    def dump(self, fp):
+        """
+        Method that writes the index into a text file-like object,
+        one tab-separated line per entry.
+
+        :param fp: text file-like object with a write() method
+        """
+        for full_url, version in self._versions.items():
+            fp.write("\t".join([full_url] + [
+                "" if value is None else value for value in version]) + "\n")
+
+    @classmethod
+    def load(cls, fp):
+        """
+        Method that reads an index written by dump().
+
+        :param fp: text file-like object
+
+        :return: TransactionResponseIndex
+        """
+        index = cls()
+        for line in fp:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) != 5:
+                raise ValueError("{} is not correct index line!".format(line))
+            index._versions[fields[0]] = ServerVersion(
+                *(value or None for value in fields[1:]))
+        return index
+
+
+class TransactionResponseParser:
+    """
+    This class reads transaction-response and batch-response Bundles.
+    The response is streamed, only a single response entry is decoded
+    at once, without fhirclient. Entries of the response are in the order
+    of the entries of the request Bundle, which gives their full urls::
+
+        result = uploader.upload(bundle)
+        index = TransactionResponseParser().parse(result.body, bundle)
+        index.if_match(bundle.sourceEntries[0].resourceFullUrl)
+    """
+
+    def __init__(self, chunk_size: int = 64 * 1024):
+        """
+        :param Optional[int] chunk_size:
+            number of bytes read from the response at once
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when incorrect
+                           value inside argument is provided.
+        """
+        if not isinstance(chunk_size, int) or isinstance(chunk_size, bool):
+            raise TypeError("chunk_size has to be int!")
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size has to be greater than 0!")
+
+        self._chunkSize = chunk_size
+
+    def entries(self, source):
+        """
+        Method that streams entries of a response Bundle.
+
+        :param source: response as bytes, string, or binary or text
+            file-like object
+
+        :return: generator of response entries as dictionaries
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when the response
+                           is not a transaction-response or batch-response
+                           Bundle.
+        """
+        if isinstance(source, bytes):
+            source = _io.BytesIO(source)
+        elif isinstance(source, str):
+            source = _io.StringIO(source)
+        elif not hasattr(source, "read"):
+            raise TypeError("source has to be bytes, a string or "
+                            "a file-like object!")
+
+        scanner = _Scanner(source.read, self._chunkSize)
+        scanner.expect("{")
+        while True:
+            character = scanner.peek()
+            if character == "}":
+                return
+            if character == ",":
+                scanner.expect(",")
+                continue
+            key = scanner.value()
+            scanner.expect(":")
+            if key != "entry":
+                value = scanner.value()
+                if key == "resourceType" and value != "Bundle" or \
+                        key == "type" and value not in _RESPONSE_TYPES:
+                    raise ValueError("{} is not a transaction-response or "
+                                     "batch-response Bundle!".format(value))
+                continue
+            scanner.expect("[")
+            while True:
+                character = scanner.peek()
+                if character == "]":
+                    scanner.expect("]")
+                    break
+                if character == ",":
+                    scanner.expect(",")
+                    continue
+                yield scanner.value()
+
+    def parse(self, source, request: Union[Bundle, Iterable[str]],
+              index: TransactionResponseIndex = None):
+        """
+        Method that adds entries of a response Bundle into an index.
+        Successful entries without a location, the responses to DELETE
+        requests, remove their full urls from the index. The index
+        is updated only after the whole response was read, so it is
+        not changed when the response is not correct.
+
+        :param source: response as bytes, string, or binary or text
+            file-like object
+        :param request: request Bundle, or full urls of its entries
+            in the order of the entries
+        :param Optional[TransactionResponseIndex] index: index to update,
+            a new index if None
+
+        :return: TransactionResponseIndex
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when the response
+                           is not correct or does not match the request.
+        """
+        if isinstance(request, Bundle):
+            full_urls = [entry.resourceFullUrl
+                         for entry in request.sourceEntries]
+        else:
+            full_urls = list(request)
+            if not all(isinstance(full_url, str) for full_url in full_urls):
+                raise TypeError("request has to be a Bundle or full urls "
+                                "of its entries!")
+
+        if index is None:
+            index = TransactionResponseIndex()
+        elif not isinstance(index, TransactionResponseIndex):
+            raise TypeError("index has to be a TransactionResponseIndex!")
+
+        # the type of the response may follow its entries
+        changes = []
+        count = 0
+        for count, entry in enumerate(self.entries(source), 1):
+            if count > len(full_urls):
+                raise ValueError("response has more entries than "
+                                 "the request!")
+            full_url = full_urls[count - 1]
+            response = entry.get("response") or {}
+            status = response.get("status", "")
+            if not status.startswith("2"):
+                changes.append((full_url, None, status))
+                continue
+            location = response.get("location")
+            etag = response.get("etag")
+            resource = entry.get("resource")
+            if location is None and resource and "id" in resource:
+                # the server returned the resource instead of its location
+                location = "{}/{}".format(resource.get("resourceType"),
+                                          resource["id"])
+                version = (resource.get("meta") or {}).get("versionId")
+                if etag is None and version is not None:
+                    etag = 'W/"{}"'.format(version)
+            if location is not None:
+                if not isinstance(location, str) or \
+                        etag is not None and not isinstance(etag, str):
+                    raise ValueError("response entry {} is not correct!"
+                                     .format(count))
+                # the location is checked before the index is changed
+                changes.append((full_url, _server_version(location, etag),
+                                None))
+            else:
+                changes.append((full_url, None, None))
+        if count != len(full_urls):
+            raise ValueError("response has {} entries, request has {}!"
+                             .format(count, len(full_urls)))
+
+        for full_url, version, status in changes:
+            if status is not None:
+                index.failures[full_url] = status
+            elif version is not None:
+                index._versions[full_url] = version
+                index.failures.pop(full_url, None)
+            else:
+                index.remove(full_url)
+        return index
@@ -0,0 +1,277 @@
+import hashlib as _hashlib
+import sqlite3 as _sqlite3
+import threading as _threading
+import time as _time
+from typing import Iterable, List, Union
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.serializer import _entry_bytes
+
+__all__ = ["UploadJournal"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bundles (
+    id TEXT PRIMARY KEY,
+    entries INTEGER NOT NULL,
+    committed REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    full_url TEXT PRIMARY KEY,
+    bundle_id TEXT NOT NULL,
+    digest TEXT
+) WITHOUT ROWID;
+"""
+
+
+class UploadJournal:
+    """
+    This class is a durable record of committed Bundles, stored
+    in an SQLite database. After every uploaded Bundle, its id and full urls
+    of its entries are written in a single transaction, so a restarted
+    upload can skip whatever was committed before it failed. The database
+    uses write-ahead logging, which keeps a record to a single append
+    to the log in most cases.
+
+    UploadJournal is used as a context manager::
+
+        with UploadJournal("upload.journal") as journal, \\
+                BundleUploader("https://example.com/fhir") as uploader:
+            for result in uploader.upload_all(bundles, journal=journal):
+                print(result.bundleId)
+
+    Bundles are skipped by their id, so ids have to identify the same
+    entries between runs. When the Bundles are created differently
+    in every run, for example by UploadPipeline, pending_entries() skips
+    committed entries instead. An entry is recorded with a digest of its
+    content and skipped only while the content is the same, so a changed
+    resource is uploaded again. UploadPipeline gives Bundles of every run
+    different ids, so records of previous runs are kept. Use clear()
+    to forget all the records, for example before a full upload
+    to an emptied server.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param string path: path of the database file, created if it
+            does not exist
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        """
+        if not isinstance(path, str):
+            raise TypeError("path has to be a string!")
+
+        self._path = path
+        self._lock = _threading.Lock()
+        self._connection = _sqlite3.connect(path, check_same_thread=False,
+                                            isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        columns = [row[1] for row in self._connection.execute(
+            "PRAGMA table_info(entries)")]
+        if "digest" not in columns:
+            # journals written before digests were recorded
+            self._connection.execute(
+                "ALTER TABLE entries ADD COLUMN digest TEXT")
+
+    @property
+    def path(self):
+        """
+        Getter for the path of the database file.
+
+        :return: path
+        """
+        return self._path
+
+    @property
+    def bundleCount(self):
+        """
+        Getter for the number of recorded Bundles.
+
+        :return: number of Bundles
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM bundles").fetchone()[0]
+
+    @property
+    def entryCount(self):
+        """
+        Getter for the number of recorded entries.
+
+        :return: number of entries
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def clear(self):
+        """
+        Method that forgets all recorded Bundles and entries.
+        """
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN")
+            try:
+                connection.execute("DELETE FROM entries")
+                connection.execute("DELETE FROM bundles")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    @staticmethod
+    def digest(entry: Entry):
+        """
+        :param Entry entry: entry of a Bundle
+
+        :return: hexadecimal SHA-256 digest of the serialized entry
+        """
+        return _hashlib.sha256(_entry_bytes(entry)).hexdigest()
+
+    def record(self, bundle: Union[Bundle, str], full_urls: List[str] = None,
+               digests: List[str] = None):
+        """
+        Method that records a committed Bundle. Recording a Bundle id
+        again replaces the previous record of the id.
+
+        :param bundle: Bundle, or id of the Bundle
+        :param Optional[List[str]] full_urls: full urls of the entries
+            of the Bundle, taken from the Bundle if None
+        :param Optional[List[str]] digests: digests of the entries
+            in the order of full_urls, see digest(). Taken from the Bundle
+            if both full_urls and digests are None. Entries recorded
+            without a digest are skipped by pending_entries() whatever
+            their content is.
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when the number
+                           of digests and full urls differ.
+        """
+        if isinstance(bundle, Bundle):
+            bundle_id = bundle.id
+            if full_urls is None:
+                full_urls = [entry.resourceFullUrl
+                             for entry in bundle.sourceEntries]
+                if digests is None:
+                    digests = [self.digest(entry)
+                               for entry in bundle.sourceEntries]
+        elif isinstance(bundle, str):
+            bundle_id = bundle
+        else:
+            raise TypeError("bundle has to be a Bundle or a string!")
+
+        full_urls = list(full_urls or ())
+        if not all(isinstance(full_url, str) for full_url in full_urls):
+            raise TypeError("full_urls have to be strings!")
+
+        if digests is None:
+            digests = [None] * len(full_urls)
+        else:
+            digests = list(digests)
+            if not all(isinstance(digest, str) for digest in digests):
+                raise TypeError("digests have to be strings!")
+            if len(digests) != len(full_urls):
+                raise ValueError("digests and full_urls have to have "
+                                 "the same length!")
+
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO bundles VALUES (?, ?, ?)",
+                    (bundle_id, len(full_urls), _time.time()))
+                connection.executemany(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                    ((full_url, bundle_id, digest)
+                     for full_url, digest in zip(full_urls, digests)))
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def is_committed(self, bundle_id: str):
+        """
+        :param string bundle_id: id of a Bundle
+
+        :return: True if the Bundle was recorded
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT 1 FROM bundles WHERE id = ?",
+                (bundle_id,)).fetchone() is not None
+
+    def __contains__(self, bundle_id):
+        return self.is_committed(bundle_id)
+
+    def _digests(self, full_urls):
+        """
+        Returns a dictionary of recorded full urls and their digests.
+        """
+        full_urls = list(full_urls)
+        digests = {}
+        with self._lock:
+            # stay below the limit of SQLite on the number of parameters
+            for start in range(0, len(full_urls), 500):
+                part = full_urls[start:start + 500]
+                digests.update(self._connection.execute(
+                    "SELECT full_url, digest FROM entries "
+                    "WHERE full_url IN ({})"
+                    .format(", ".join("?" * len(part))), part))
+        return digests
+
+    def committed_urls(self, full_urls: Iterable[str]):
+        """
+        :param full_urls: iterable of full urls of entries
+
+        :return: set of the given full urls that were recorded
+        """
+        return set(self._digests(full_urls))
+
+    def pending_bundles(self, bundles: Iterable[Bundle]):
+        """
+        Method that skips recorded Bundles.
+
+        :param bundles: iterable of Bundles
+
+        :return: generator of Bundles that were not recorded
+        """
+        for bundle in bundles:
+            if not self.is_committed(bundle.id):
+                yield bundle
+
+    def pending_entries(self, entries: Iterable[Entry]):
+        """
+        Method that skips entries recorded with the same content.
+
+        :param entries: list of Entries
+
+        :return: list of Entries that were not recorded, or were recorded
+            with a different digest
+        """
+        entries = list(entries)
+        committed = self._digests(entry.resourceFullUrl for entry in entries)
+        pending = []
+        for entry in entries:
+            if entry.resourceFullUrl in committed:
+                digest = committed[entry.resourceFullUrl]
+                if digest is None or digest == self.digest(entry):
+                    continue
+            pending.append(entry)
+        return pending
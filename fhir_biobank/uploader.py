@@ -0,0 +1,437 @@
+import collections as _collections
+import gzip as _gzip
+import http.client as _http_client
+import queue as _queue
+import random as _random
+import threading as _threading
+import time as _time
+from collections import namedtuple as _namedtuple
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from typing import Iterable, Union
+from urllib.parse import urlsplit as _urlsplit
+
+from fhir_biobank.adaptiveController import AdaptiveController
+from fhir_biobank.bundle import Bundle
+from fhir_biobank.serializer import JSONSerializer
+from fhir_biobank.uploadJournal import UploadJournal
+
+__all__ = ["BundleUploader", "UploadResult", "UploadMetrics", "UploadError",
+           "RETRY_STATUSES"]
+
+"""
+HTTP statuses of responses that are retried, together with other 5xx
+statuses and connection errors
+"""
+RETRY_STATUSES = frozenset([408, 429])
+
+UploadResult = _namedtuple("UploadResult", ["bundleId", "status", "body",
+                                            "attempts", "latency"])
+UploadResult.__doc__ = """
+Result of a successful upload of a Bundle: id of the Bundle, HTTP status
+and body of the response, number of sent requests and latency of the last
+request in seconds.
+"""
+
+UploadMetrics = _namedtuple("UploadMetrics", [
+    "requests", "retries", "failures", "bytes_sent", "bytes_received",
+    "latency_mean", "latency_p50", "latency_p95", "latency_max"])
+UploadMetrics.__doc__ = """
+Metrics of an uploader: number of sent requests, retried requests and
+failed uploads, number of sent (compressed) and received bytes and
+statistics of latencies of the last 10000 requests in seconds, which are
+None until a request is sent.
+"""
+
+
+class UploadError(Exception):
+    """
+    This exception is raised when a Bundle cannot be uploaded, either
+    because the server rejected it or because all retries failed.
+    """
+
+    def __init__(self, message, bundle_id=None, status=None, body=None):
+        super().__init__(message)
+        self.bundleId = bundle_id
+        self.status = status
+        self.body = body
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class _ConnectionPool:
+    """
+    Keep-alive connections to a single host, a connection is reused
+    by the next request once the previous response is read.
+    """
+
+    def __init__(self, scheme, host, port, timeout, ssl_context):
+        self._scheme = scheme
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._sslContext = ssl_context
+        self._idle = _queue.LifoQueue()
+
+    def get(self):
+        try:
+            return self._idle.get_nowait()
+        except _queue.Empty:
+            pass
+        if self._scheme == "https":
+            return _http_client.HTTPSConnection(
+                self._host, self._port, timeout=self._timeout,
+                context=self._sslContext)
+        return _http_client.HTTPConnection(self._host, self._port,
+                                           timeout=self._timeout)
+
+    def put(self, connection):
+        self._idle.put(connection)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except _queue.Empty:
+                return
+
+
+class _Limiter:
+    """
+    Limits the number of concurrent requests to the result of limit(),
+    which can change between requests.
+    """
+
+    def __init__(self, limit):
+        self._limit = limit
+        self._active = 0
+        self._condition = _threading.Condition()
+
+    def __enter__(self):
+        with self._condition:
+            while self._active >= self._limit():
+                self._condition.wait()
+            self._active += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+
+class BundleUploader:
+    """
+    This class uploads Bundles to a FHIR server. Bundles are sent by POST
+    to the base url over keep-alive connections, at most `concurrency`
+    at once. Requests that fail with a connection error, 408, 429 or 5xx
+    are retried with exponential backoff, the Retry-After header
+    of the response is respected. With an AdaptiveController, the number
+    of concurrent requests is chosen by the controller.
+
+    BundleUploader is used as a context manager::
+
+        with BundleUploader("https://example.com/fhir", concurrency=8) \\
+                as uploader:
+            for result in uploader.upload_all(bundles):
+                print(result.bundleId, result.status)
+            print(uploader.metrics())
+    """
+
+    def __init__(self, base_url: str, concurrency: int = 4,
+                 max_retries: int = 5, backoff: float = 0.5,
+                 max_backoff: float = 30.0, compress: bool = True,
+                 timeout: float = 60.0, headers: dict = None,
+                 ssl_context=None,
+                 controller: AdaptiveController = None):
+        """
+        :param string base_url:
+            base url of the FHIR server, "http" and "https" are supported
+        :param Optional[int] concurrency:
+            maximal number of concurrent requests and of open connections
+        :param Optional[int] max_retries:
+            maximal number of retries of a single Bundle
+        :param Optional[float] backoff:
+            delay before the first retry in seconds, doubled with every
+            next retry and randomized by up to a half
+        :param Optional[float] max_backoff:
+            maximal delay before a retry in seconds
+        :param Optional[bool] compress:
+            send gzip compressed request bodies
+        :param Optional[float] timeout:
+            timeout of connections in seconds
+        :param Optional[dict] headers:
+            additional headers of requests, for example Authorization
+        :param ssl_context:
+            ssl.SSLContext used for https connections, default context
+            if None
+        :param Optional[AdaptiveController] controller:
+            controller choosing the number of concurrent requests, which
+            is still limited by `concurrency`
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when incorrect
+                           value inside argument is provided.
+        """
+        if not isinstance(base_url, str):
+            raise TypeError("base_url has to be a string!")
+
+        url = _urlsplit(base_url)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError("base_url has to be an http or https url!")
+
+        for name, value in (("concurrency", concurrency),
+                            ("max_retries", max_retries)):
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise TypeError("{} has to be int!".format(name))
+
+        if concurrency < 1:
+            raise ValueError("concurrency has to be greater than 0!")
+
+        if max_retries < 0:
+            raise ValueError("max_retries cannot be negative!")
+
+        for name, value in (("backoff", backoff), ("max_backoff", max_backoff),
+                            ("timeout", timeout)):
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                raise TypeError("{} has to be a number!".format(name))
+            if value < 0:
+                raise ValueError("{} cannot be negative!".format(name))
+
+        if not isinstance(compress, bool):
+            raise TypeError("compress has to be a boolean!")
+
+        if headers is not None and not isinstance(headers, dict):
+            raise TypeError("headers has to be a dictionary!")
+
+        if controller is not None and not isinstance(controller,
+                                                     AdaptiveController):
+            raise TypeError("controller has to be an AdaptiveController!")
+
+        self._baseUrl = base_url
+        self._path = url.path or "/"
+        self._concurrency = concurrency
+        self._maxRetries = max_retries
+        self._backoff = backoff
+        self._maxBackoff = max_backoff
+        self._compress = compress
+        self._headers = {"Content-Type": "application/fhir+json",
+                         "Accept": "application/fhir+json",
+                         "Connection": "keep-alive"}
+        if compress:
+            self._headers["Content-Encoding"] = "gzip"
+        self._headers.update(headers or {})
+        self._pool = _ConnectionPool(url.scheme, url.hostname, url.port,
+                                     timeout, ssl_context)
+        self._controller = controller
+        self._slots = _Limiter(
+            (lambda: min(concurrency, controller.concurrency))
+            if controller is not None else (lambda: concurrency))
+        self._lock = _threading.Lock()
+        self._counters = [0, 0, 0, 0, 0]
+        self._latencies = _collections.deque(maxlen=10000)
+
+    @property
+    def baseUrl(self):
+        """
+        Getter for the base url of the FHIR server.
+
+        :return: base url
+        """
+        return self._baseUrl
+
+    @property
+    def concurrency(self):
+        """
+        Getter for the maximal number of concurrent requests.
+
+        :return: number of concurrent requests
+        """
+        return self._concurrency
+
+    @property
+    def controller(self):
+        """
+        Getter for the controller choosing the number of concurrent requests.
+
+        :return: AdaptiveController, or None
+        """
+        return self._controller
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes idle connections.
+        """
+        self._pool.close()
+
+    def _count(self, requests=0, retries=0, failures=0, sent=0, received=0):
+        with self._lock:
+            counters = self._counters
+            counters[0] += requests
+            counters[1] += retries
+            counters[2] += failures
+            counters[3] += sent
+            counters[4] += received
+
+    def _send(self, body):
+        """
+        Sends a single request over a pooled connection.
+
+        :return: tuple of status, headers and body of the response
+        """
+        connection = self._pool.get()
+        start = _time.perf_counter()
+        try:
+            connection.request("POST", self._path, body, self._headers)
+            response = connection.getresponse()
+            content = response.read()
+        except BaseException:
+            connection.close()
+            raise
+        latency = _time.perf_counter() - start
+        if response.will_close:
+            connection.close()
+        else:
+            self._pool.put(connection)
+        with self._lock:
+            self._latencies.append(latency)
+        self._count(requests=1, sent=len(body), received=len(content))
+        return response.status, response.headers, content, latency
+
+    def _delay(self, attempt, headers):
+        retry_after = headers.get("Retry-After") if headers else None
+        if retry_after is not None and retry_after.strip().isdigit():
+            return min(self._maxBackoff, float(retry_after))
+        delay = min(self._maxBackoff, self._backoff * 2 ** attempt)
+        return delay * (0.5 + _random.random() / 2)
+
+    def upload(self, bundle: Union[Bundle, bytes], bundle_id: str = None):
+        """
+        Method that uploads a single Bundle, waiting for a free slot if
+        `concurrency` requests are already being sent.
+
+        :param bundle: Bundle, or Bundle already serialized to UTF-8
+            encoded JSON
+        :param Optional[str] bundle_id: id of the Bundle used in the result,
+            id of the Bundle if None
+
+        :return: UploadResult
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise UploadError: This exception is raised when the server rejects
+                            the Bundle or all the retries fail.
+        """
+        if isinstance(bundle, Bundle):
+            if bundle_id is None:
+                bundle_id = bundle.id
+            body = JSONSerializer.dumps(bundle)
+        elif isinstance(bundle, bytes):
+            body = bundle
+        else:
+            raise TypeError("bundle has to be a Bundle or bytes!")
+
+        if bundle_id is not None and not isinstance(bundle_id, str):
+            raise TypeError("bundle_id has to be a string!")
+
+        if self._compress:
+            body = _gzip.compress(body, compresslevel=6)
+
+        attempt = 0
+        while True:
+            headers = None
+            with self._slots:
+                start = _time.perf_counter()
+                try:
+                    status, headers, content, latency = self._send(body)
+                except (OSError, _http_client.HTTPException) as error:
+                    status, content = None, None
+                    latency = _time.perf_counter() - start
+                    reason = "{}: {}".format(type(error).__name__, error)
+                retry = status is None or status in RETRY_STATUSES or \
+                    status >= 500
+                # rejected requests say nothing about the load of the server
+                if self._controller is not None and (retry or status < 300):
+                    self._controller.observe(latency, retry, len(body))
+            if status is not None:
+                if status < 300:
+                    return UploadResult(bundle_id, status, content,
+                                        attempt + 1, latency)
+                reason = "HTTP {}".format(status)
+            if not retry or attempt >= self._maxRetries:
+                self._count(failures=1)
+                raise UploadError(
+                    "upload of bundle {} failed after {} attempts: {}".format(
+                        bundle_id, attempt + 1, reason), bundle_id, status,
+                    content)
+            self._count(retries=1)
+            _time.sleep(self._delay(attempt, headers))
+            attempt += 1
+
+    def _upload_recorded(self, bundle, journal):
+        result = self.upload(bundle)
+        journal.record(bundle)
+        return result
+
+    def upload_all(self, bundles: Iterable[Union[Bundle, bytes]],
+                   journal: UploadJournal = None):
+        """
+        Method that uploads Bundles concurrently. Bundles are read from
+        the iterable only as fast as they are uploaded.
+
+        :param bundles: iterable of Bundles or serialized Bundles
+        :param Optional[UploadJournal] journal: journal recording uploaded
+            Bundles. Bundles recorded by a previous run are skipped and have
+            no result. Only Bundles, not serialized Bundles, can be uploaded
+            with a journal.
+
+        :return: generator of UploadResults in the order of the Bundles
+
+        :raise TypeError: This exception is raised by the generator when
+                          serialized Bundles are uploaded with a journal.
+        :raise UploadError: This exception is raised by the generator when
+                            a Bundle cannot be uploaded. Bundles that are
+                            not sent yet are not uploaded.
+        """
+        if journal is not None and not isinstance(journal, UploadJournal):
+            raise TypeError("journal has to be an UploadJournal!")
+
+        pending = _collections.deque()
+        with _ThreadPoolExecutor(self._concurrency) as executor:
+            try:
+                for bundle in bundles:
+                    if journal is None:
+                        pending.append(executor.submit(self.upload, bundle))
+                    elif not isinstance(bundle, Bundle):
+                        raise TypeError("bundles have to be Bundles to be "
+                                        "uploaded with a journal!")
+                    elif not journal.is_committed(bundle.id):
+                        pending.append(executor.submit(
+                            self._upload_recorded, bundle, journal))
+                    if len(pending) >= 2 * self._concurrency:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def metrics(self):
+        """
+        :return: UploadMetrics of all the uploads of this uploader
+        """
+        with self._lock:
+            counters = list(self._counters)
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return UploadMetrics(*counters, None, None, None, None)
+        return UploadMetrics(*counters, sum(latencies) / len(latencies),
+                             _percentile(latencies, 0.5),
+                             _percentile(latencies, 0.95), latencies[-1])
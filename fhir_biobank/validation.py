@@ -0,0 +1,227 @@
+from contextlib import contextmanager as _contextmanager
+from contextvars import ContextVar as _ContextVar
+
+from fhir_biobank._schema import SCHEMAS as _SCHEMAS
+
+__all__ = ["STRICT", "TRUSTED", "DEFERRED", "VALIDATION_MODES",
+           "ValidationError", "set_validation_mode", "get_validation_mode",
+           "validation_mode", "deferred_errors", "raise_deferred_errors",
+           "validate_many", "create_many"]
+
+"""
+Arguments are checked and the first incorrect argument raises an exception.
+"""
+STRICT = "strict"
+
+"""
+Arguments are not checked at all. Use only for data that was already
+validated, for example by a previous run of the same pipeline.
+"""
+TRUSTED = "trusted"
+
+"""
+Arguments are checked, but exceptions are collected instead of raised,
+so errors of a whole batch can be reported together.
+"""
+DEFERRED = "deferred"
+
+VALIDATION_MODES = (STRICT, TRUSTED, DEFERRED)
+
+_globalMode = STRICT
+_MODE = _ContextVar("fhir_biobank_validation_mode", default=None)
+_ERRORS = _ContextVar("fhir_biobank_deferred_errors", default=None)
+
+
+class ValidationError(Exception):
+    """
+    This exception is raised with all the errors collected
+    in the deferred validation mode.
+    """
+
+    def __init__(self, errors):
+        """
+        :param List[Exception] errors: collected exceptions
+        """
+        super().__init__("{} validation error(s): {}".format(
+            len(errors), "; ".join(
+                "{}: {}".format(type(error).__name__, error)
+                for error in errors)))
+        self.errors = list(errors)
+
+
+def _check_mode(mode):
+    if not isinstance(mode, str):
+        raise TypeError("mode has to be a string!")
+    if mode not in VALIDATION_MODES:
+        raise ValueError(
+            "{} in mode is not a correct validation mode! mode has to be "
+            "one of the following ".format(mode) + " ".join(VALIDATION_MODES))
+
+
+def set_validation_mode(mode: str):
+    """
+    Sets the validation mode used by constructors of resources, Entry and
+    Bundle, unless the mode is overridden by validation_mode() or by
+    the validation argument of the constructor.
+
+    :param string mode: "strict" (default), "trusted" or "deferred"
+
+    :raise TypeError: This exception is raised when incorrect
+                      types of arguments are provided
+    :raise ValueError: This exception is raised when incorrect
+                       value in argument is provided
+    """
+    global _globalMode
+    _check_mode(mode)
+    _globalMode = mode
+
+
+def get_validation_mode():
+    """
+    :return: validation mode currently used by constructors
+    """
+    return _MODE.get() or _globalMode
+
+
+@_contextmanager
+def validation_mode(mode: str, raise_errors: bool = True):
+    """
+    Context manager that sets the validation mode inside the with block.
+    In the deferred mode, errors are collected into a new list that
+    is yielded, and ValidationError with all of them is raised at
+    the end of the block, unless raise_errors is False.
+
+    Example::
+
+        with validation_mode(DEFERRED):
+            patients = [PatientResource(*row) for row in rows]
+
+    :param string mode: "strict", "trusted" or "deferred"
+    :param Optional[bool] raise_errors: raise collected errors at the end
+        of the block
+
+    :return: list of errors collected inside the block
+
+    :raise ValidationError: This exception is raised at the end of the
+                            block when errors were collected
+    """
+    _check_mode(mode)
+    errors = []
+    mode_token = _MODE.set(mode)
+    errors_token = _ERRORS.set(errors)
+    try:
+        yield errors
+    finally:
+        _MODE.reset(mode_token)
+        _ERRORS.reset(errors_token)
+    if errors and raise_errors:
+        error = ValidationError(errors)
+        errors.clear()
+        raise error
+
+
+def deferred_errors():
+    """
+    Errors collected outside validation_mode() blocks belong to the current
+    context, a thread or an asyncio task, and are kept until
+    raise_deferred_errors() is called.
+
+    :return: list of errors collected in the deferred mode, either inside
+        the current validation_mode() block or in the current context
+    """
+    errors = _ERRORS.get()
+    if errors is None:
+        errors = []
+        _ERRORS.set(errors)
+    return errors
+
+
+def raise_deferred_errors():
+    """
+    Raises errors collected in the deferred mode and forgets them.
+
+    :raise ValidationError: This exception is raised when errors
+                            were collected
+    """
+    errors = deferred_errors()
+    if errors:
+        collected = list(errors)
+        errors.clear()
+        raise ValidationError(collected)
+
+
+def _schema(cls):
+    schema = _SCHEMAS.get(cls)
+    if schema is None:
+        raise TypeError("{} has no validation schema!".format(cls))
+    return schema
+
+
+def validate_many(cls, records):
+    """
+    Checks arguments of many instances of a class in one call, with
+    the same checks and exceptions as the constructor of the class.
+
+    Example::
+
+        errors = validate_many(PatientResource,
+                               [("0", "4816522", "female"),
+                                {"patient_id": "1", "identifier": "4816523"}])
+
+    :param cls: PatientResource, SpecimenResource, ConditionResource,
+        Entry or Bundle
+    :param records: iterable of tuples of positional arguments or
+        dictionaries of keyword arguments of the constructor
+
+    :return: list of tuples of index of an incorrect record and
+        the exception it raised, empty when all records are correct
+
+    :raise TypeError: This exception is raised when the class
+                      has no validation schema
+    """
+    return _schema(cls).check_many(records)
+
+
+def create_many(cls, records):
+    """
+    Creates many instances of a class. Records are checked in one call
+    by validate_many() and instances are then created without
+    checking them again. In the trusted mode, records are not checked.
+
+    :param cls: PatientResource, SpecimenResource, ConditionResource,
+        Entry or Bundle
+    :param records: sequence of tuples of positional arguments or
+        dictionaries of keyword arguments of the constructor
+
+    :return: list of created instances
+
+    :raise ValidationError: This exception is raised with errors of all
+                            incorrect records
+    """
+    schema = _schema(cls)
+    if get_validation_mode() != TRUSTED:
+        errors = schema.check_many(records)
+        if errors:
+            raise ValidationError([error for _, error in errors])
+    return [cls(validation=TRUSTED, **record) if isinstance(record, dict)
+            else cls(*record, validation=TRUSTED) for record in records]
+
+
+def _resolve(mode):
+    """
+    Returns the validation mode used by a single constructor call.
+    """
+    if mode is None:
+        return _MODE.get() or _globalMode
+    _check_mode(mode)
+    return mode
+
+
+def _report(error, mode):
+    """
+    Raises the error in the strict mode, collects it in the deferred mode.
+    """
+    if mode == DEFERRED:
+        deferred_errors().append(error)
+    else:
+        raise error
@@ -0,0 +1,208 @@
+import xml.etree.ElementTree as _ET
+from datetime import date as _date
+from typing import Dict
+
+from fhir_biobank.diagnosis import Diagnosis
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.specimen import SpecimenResource
+from fhir_biobank._Constants import PATIENT_GENDER as _PATIENT_GENDER
+from fhir_biobank._Constants import SPECIMEN_TYPE as _SPECIMEN_TYPE
+from fhir_biobank._Constants import BBMRI_CZ_NAMESPACE as \
+    _BBMRI_CZ_NAMESPACE
+
+__all__ = ["PatientXMLReader"]
+
+_NS = "{" + _BBMRI_CZ_NAMESPACE + "}"
+_PATIENT_TAG = _NS + "patient"
+_TISSUE_TAG = _NS + "tissue"
+_DIAGNOSIS_MATERIAL_TAG = _NS + "diagnosisMaterial"
+_SAMPLE_TAGS = {_TISSUE_TAG: "tissue",
+                _DIAGNOSIS_MATERIAL_TAG: "diagnosisMaterial"}
+_FIELD_TAGS = {_NS + name: name for name in
+               ("samplesNo", "availableSamplesNo", "materialType", "pTNM",
+                "morphology", "diagnosis", "cutTime", "freezeTime",
+                "takingDate", "retrieved")}
+_COLLECTION_TIME_FIELDS = {"tissue": "cutTime",
+                           "diagnosisMaterial": "takingDate"}
+
+
+class PatientXMLReader:
+    """
+    This class reads BBMRI.cz patient exports (one or more patient elements
+    with LTS tissues and STS diagnosis materials) with iterparse. Elements
+    are cleared as soon as they are processed, so memory usage does not
+    depend on the size of the export.
+
+    Iterating over the reader yields tuples of PatientResource and a list
+    of SpecimenResources of the patient::
+
+        for patient, specimens in PatientXMLReader("export.xml"):
+            ...
+    """
+
+    def __init__(self, source, default_material_code: str = "whole-blood",
+                 material_codes: Dict[str, str] = None):
+        """
+        :param source:
+            path to the XML file or a binary file-like object.
+        :param Optional[string] default_material_code:
+            specimen material code used for samples whose materialType
+            is not in material_codes.
+        :param Optional[Dict[str, str]] material_codes:
+            mapping of BBMRI.cz materialType values to specimen material
+            codes, for example {"S": "blood-serum"}.
+
+        :raise TypeError: This exception is raised when incorrect
+                          types of arguments are provided.
+        :raise ValueError: This exception is raised when incorrect
+                           value inside argument is provided.
+        """
+        if not isinstance(source, str) and not hasattr(source, "read"):
+            raise TypeError(
+                "source has to be a path or a binary file-like object!")
+
+        if not isinstance(default_material_code, str):
+            raise TypeError("default_material_code has to be a string!")
+
+        if default_material_code not in _SPECIMEN_TYPE:
+            raise ValueError(
+                "{} in default_material_code is not correct "
+                "code for specimen.".format(default_material_code))
+
+        if material_codes is not None:
+            if not isinstance(material_codes, dict):
+                raise TypeError("material_codes has to be a dictionary!")
+            for code in material_codes.values():
+                if code not in _SPECIMEN_TYPE:
+                    raise ValueError(
+                        "{} in material_codes is not correct "
+                        "code for specimen.".format(code))
+
+        self._source = source
+        self._defaultMaterialCode = default_material_code
+        self._materialCodes = dict(material_codes or {})
+
+    @property
+    def source(self):
+        """
+        Getter for a source of the XML export.
+
+        :return: path or file-like object
+        """
+        return self._source
+
+    @property
+    def defaultMaterialCode(self):
+        """
+        Getter for the specimen material code of unknown material types.
+
+        :return: specimen material code
+        """
+        return self._defaultMaterialCode
+
+    @property
+    def materialCodes(self):
+        """
+        Getter for the mapping of BBMRI.cz material types to specimen
+        material codes.
+
+        :return: dictionary of material codes
+        """
+        return self._materialCodes
+
+    def records(self):
+        """
+        Method that streams the export and yields one plain dictionary per
+        patient, containing the attributes of the patient element
+        and list of its samples under the key "samples". Every sample is
+        a dictionary of its attributes and child element texts, with its
+        element name under the key "kind".
+
+        :return: generator of patient records
+        """
+        context = _ET.iterparse(self._source, events=("start", "end"))
+        root = None
+        samples = []
+        for event, element in context:
+            if event == "start":
+                if root is None:
+                    root = element
+                continue
+
+            tag = element.tag
+            kind = _SAMPLE_TAGS.get(tag)
+            if kind is not None:
+                sample = dict(element.attrib)
+                sample["kind"] = kind
+                for child in element:
+                    name = _FIELD_TAGS.get(child.tag)
+                    if name is not None:
+                        sample[name] = child.text.strip() \
+                            if child.text is not None else None
+                samples.append(sample)
+                element.clear()
+            elif tag == _PATIENT_TAG:
+                record = dict(element.attrib)
+                record["samples"] = samples
+                samples = []
+                element.clear()
+                if root is not element:
+                    # aggregated export, drop already processed patients
+                    root.clear()
+                yield record
+
+    def convert_record(self, record: dict):
+        """
+        Method that converts a patient record created by records()
+        into resources.
+
+        :param dict record: patient record
+
+        :return: tuple of PatientResource and list of SpecimenResources
+
+        :raise ValueError: This exception is raised when the patient
+                           or a sample has no id, or a sample has
+                           no collection time.
+        """
+        patient_id = record.get("id")
+        if not patient_id:
+            raise ValueError("patient element has no id!")
+        gender = record.get("sex")
+        if gender not in _PATIENT_GENDER:
+            gender = "unknown"
+        birth_date = None
+        if record.get("year"):
+            month = record.get("month")
+            birth_date = _date(int(record["year"]),
+                               int(month[2:]) if month else 1, 1)
+        patient = PatientResource(patient_id, patient_id, gender, birth_date)
+
+        specimens = []
+        for index, sample in enumerate(record["samples"]):
+            sample_id = sample.get("sampleId")
+            if not sample_id:
+                raise ValueError(
+                    "{} element of patient {} has no sampleId!".format(
+                        sample["kind"], patient_id))
+            collection_time = sample.get(
+                _COLLECTION_TIME_FIELDS[sample["kind"]])
+            if not collection_time:
+                raise ValueError(
+                    "sample {} has no collection time!".format(sample_id))
+            quantity = sample.get("availableSamplesNo")
+            extensions = None
+            if sample.get("diagnosis"):
+                extensions = [Diagnosis(sample["diagnosis"])]
+            specimens.append(SpecimenResource(
+                patient_id + "-" + str(index), sample_id,
+                self._materialCodes.get(sample.get("materialType"),
+                                        self._defaultMaterialCode),
+                patient,
+                _date.fromisoformat(collection_time[:10]),
+                float(quantity) if quantity else 1.0,
+                extensions=extensions))
+        return patient, specimens
+
+    def __iter__(self):
+        for record in self.records():
+            yield self.convert_record(record)
@@ -0,0 +1,80 @@
+import pytest
+
+from fhir_biobank.adaptiveController import AdaptiveController
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.uploader import BundleUploader, UploadError
+from tests.uploader_test import StubFHIRServer
+
+BASE_URL = "https://example.com"
+
+
+def test_controller_additive_increase():
+    controller = AdaptiveController(bundle_size=50, concurrency=2,
+                                    max_concurrency=3, window=2)
+    for _ in range(6):
+        controller.observe(0.1, size=1000)
+    metrics = controller.metrics()
+    assert controller.bundleSize == 80 and controller.concurrency == 3 \
+           and metrics.increases == 3 and metrics.decreases == 0 \
+           and metrics.error_rate == 0.0 \
+           and metrics.latency_mean == pytest.approx(0.1) \
+           and metrics.bytes_per_second > 0
+
+
+def test_controller_multiplicative_decrease():
+    controller = AdaptiveController(bundle_size=100, min_bundle_size=30,
+                                    concurrency=8, target_latency=1.0,
+                                    window=4)
+    for _ in range(4):
+        controller.observe(3.0)
+    assert controller.bundleSize == 50 and controller.concurrency == 8
+    for _ in range(8):
+        controller.observe(3.0)
+    assert controller.bundleSize == 30
+    for error in (True, False, False, False):
+        controller.observe(0.1, error)
+    assert controller.concurrency == 4 and controller.bundleSize == 30 \
+           and controller.metrics().decreases == 3 \
+           and controller.metrics().error_rate == 0.25
+
+
+def test_controller_incomplete_window():
+    controller = AdaptiveController(window=8)
+    controller.observe(0.1)
+    assert controller.metrics() == (100, 2, None, None, None, 0, 0)
+
+
+def test_uploader_reports_to_controller():
+    server = StubFHIRServer([503, 503, 200, 400])
+    controller = AdaptiveController(concurrency=4, window=2)
+    bundles = [Bundle(str(index), [Entry.from_resource(
+        PatientResource(str(index), "4816522"), BASE_URL)])
+               for index in range(2)]
+    try:
+        with BundleUploader(server.url, concurrency=4, backoff=0.0,
+                            controller=controller) as uploader:
+            uploader.upload(bundles[0])
+            with pytest.raises(UploadError):
+                uploader.upload(bundles[1])
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert controller.concurrency == 2 \
+           and controller.metrics().error_rate == 1.0 \
+           and uploader.controller is controller
+
+
+def test_controller_arguments():
+    with pytest.raises(TypeError):
+        AdaptiveController(bundle_size="100")
+    with pytest.raises(ValueError):
+        AdaptiveController(window=0)
+    with pytest.raises(ValueError):
+        AdaptiveController(bundle_size=5)
+    with pytest.raises(ValueError):
+        AdaptiveController(concurrency=20)
+    with pytest.raises(ValueError):
+        AdaptiveController(decrease=1.0)
+    with pytest.raises(TypeError):
+        BundleUploader(BASE_URL, controller=object())
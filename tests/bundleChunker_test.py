@@ -0,0 +1,97 @@
+from datetime import date
+
+import pytest
+
+from fhir_biobank.bundle import Entry
+from fhir_biobank.bundleChunker import BundleChunker
+from fhir_biobank.condition import ConditionResource
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.serializer import JSONSerializer
+from fhir_biobank.specimen import SpecimenResource
+
+BASE_URL = "https://example.com"
+
+
+def _resources(patients, specimens):
+    resources = []
+    for patient_index in range(patients):
+        patient = PatientResource(str(patient_index), "4816522")
+        resources.append(patient)
+        for index in range(specimens):
+            resources.append(SpecimenResource(
+                "{}-{}".format(patient_index, index), "BBM:1", "dna",
+                patient, date(2021, 11, 4), 1.0))
+    return resources
+
+
+def _patient_ids(bundle):
+    ids = set()
+    for entry in bundle.sourceEntries:
+        resource = entry.sourceResource
+        ids.add(resource.patientId if isinstance(resource, PatientResource)
+                else resource.subject.patientId)
+    return ids
+
+
+def test_chunker_max_entries_keeps_patients_together():
+    bundles = list(BundleChunker(max_entries=7, base_url=BASE_URL).chunks(
+        _resources(5, 2)))
+    assert [len(bundle) for bundle in bundles] == [6, 6, 3] \
+           and [_patient_ids(bundle) for bundle in bundles] == \
+           [{"0", "1"}, {"2", "3"}, {"4"}] \
+           and [bundle.id for bundle in bundles] == \
+           ["chunk-0", "chunk-1", "chunk-2"]
+
+
+def test_chunker_max_bytes():
+    resources = _resources(6, 3)
+    single = len(JSONSerializer.dumps(next(BundleChunker(
+        max_entries=4, base_url=BASE_URL).chunks(resources))))
+    bundles = list(BundleChunker(max_bytes=2 * single,
+                                 base_url=BASE_URL).chunks(resources))
+    assert all(len(JSONSerializer.dumps(bundle)) <= 2 * single
+               for bundle in bundles) \
+           and [len(bundle) for bundle in bundles] == [8, 8, 8]
+
+
+def test_chunker_oversized_patient_gets_own_bundle():
+    bundles = list(BundleChunker(max_entries=2, base_url=BASE_URL).chunks(
+        _resources(2, 3)))
+    assert [len(bundle) for bundle in bundles] == [4, 4]
+
+
+def test_chunker_groups_scattered_entries_patient_first():
+    patient = PatientResource("0", "4816522")
+    other = PatientResource("1", "4816523")
+    condition = ConditionResource("0", "C509", date(2021, 1, 1), patient)
+    entries = [Entry.from_resource(resource, BASE_URL)
+               for resource in (condition, other, patient)]
+    bundles = list(BundleChunker(max_entries=2).chunks(entries))
+    assert [[entry.resourceShortUrl for entry in bundle.sourceEntries]
+            for bundle in bundles] == \
+           [["Patient/0", "Condition/0"], ["Patient/1"]]
+
+
+def test_chunker_grouped_input_is_streamed():
+    def resources():
+        yield from _resources(3, 1)
+        raise RuntimeError("input read too far")
+
+    chunks = BundleChunker(max_entries=2, base_url=BASE_URL,
+                           grouped=True).chunks(resources())
+    assert len(next(chunks)) == 2
+
+
+def test_chunker_resources_without_base_url():
+    with pytest.raises(ValueError):
+        list(BundleChunker().chunks(_resources(1, 0)))
+
+
+def test_chunker_incorrect_value_max_entries():
+    with pytest.raises(ValueError):
+        BundleChunker(max_entries=0)
+
+
+def test_chunker_incorrect_type_max_bytes():
+    with pytest.raises(TypeError):
+        BundleChunker(max_bytes="1MB")
@@ -0,0 +1,139 @@
+import io
+import json
+from datetime import date
+
+import pytest
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.bundleDiff import BundleDiff
+from fhir_biobank.ndjsonExporter import NDJSONExporter
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.serializer import JSONSerializer
+from fhir_biobank.specimen import SpecimenResource
+
+BASE_URL = "https://example.com"
+
+
+def _snapshot(material_code="bone-marrow", count=4):
+    patients = [PatientResource(str(index), "2441") for index in range(3)]
+    specimens = [SpecimenResource(str(index), "442", material_code,
+                                  patients[0], date(2012, 2, 28), 4.0)
+                 for index in range(count)]
+    return patients, specimens
+
+
+def _bundle(bundle_id, resources, request_method="PUT"):
+    patients, specimens = resources
+    return Bundle(bundle_id, [
+        Entry.from_resource(resource, BASE_URL, request_method)
+        for resource in patients + specimens])
+
+
+def _requests(delta):
+    return [(entry["request"]["method"], entry["request"]["url"])
+            for entry in json.loads(delta)["entry"]]
+
+
+def test_diff_bundles():
+    old = _bundle("old", _snapshot())
+    patients, specimens = _snapshot(count=3)
+    specimens[1] = SpecimenResource("1", "442", "buffy-coat", patients[0],
+                                    date(2012, 2, 28), 4.0)
+    specimens.append(SpecimenResource("9", "442", "bone-marrow", patients[0],
+                                      date(2012, 2, 28), 4.0))
+    new = _bundle("new", (patients, specimens), "POST")
+    delta = BundleDiff().to_bundle(old, new, "delta")
+    assert [(entry.requestMethod, entry.resourceShortUrl)
+            for entry in delta.sourceEntries] == \
+           [("PUT", "Specimen/1"), ("PUT", "Specimen/9"),
+            ("DELETE", "Specimen/3")] \
+           and delta.sourceEntries[2].resourceFullUrl == \
+           "https://example.com/Specimen/3" \
+           and delta.bundleType == "transaction"
+    fp = io.BytesIO()
+    stats = BundleDiff().write(old, new, fp, "delta")
+    assert stats == (1, 1, 1, 5) \
+           and fp.getvalue() == JSONSerializer.dumps(delta)
+
+
+def test_diff_same_snapshots():
+    old = _bundle("old", _snapshot())
+    new = _bundle("new", _snapshot(), "POST")
+    fp = io.BytesIO()
+    stats = BundleDiff().write(old, new, fp, "delta")
+    assert BundleDiff().to_bundle(old, new, "delta") is None \
+           and stats == (0, 0, 0, 7) \
+           and json.loads(fp.getvalue()) == {
+               "id": "delta", "type": "transaction",
+               "resourceType": "Bundle"}
+
+
+def test_diff_ndjson(tmp_path):
+    old, new = tmp_path / "old", tmp_path / "new"
+    with NDJSONExporter(str(old), compress=True) as exporter:
+        exporter.export(*_snapshot())
+    with NDJSONExporter(str(new)) as exporter:
+        exporter.export(*_snapshot("buffy-coat", 3))
+    fp = io.BytesIO()
+    stats = BundleDiff(BASE_URL).write(str(old), str(new), fp, "delta")
+    delta = json.loads(fp.getvalue())
+    assert stats == (0, 3, 1, 3) \
+           and _requests(fp.getvalue()) == \
+           [("PUT", "Specimen/0"), ("PUT", "Specimen/1"),
+            ("PUT", "Specimen/2"), ("DELETE", "Specimen/3")] \
+           and delta["entry"][0]["fullUrl"] == \
+           "https://example.com/Specimen/0" \
+           and delta["entry"][0]["resource"]["type"]["coding"][0][
+               "code"] == "buffy-coat"
+    with pytest.raises(ValueError):
+        BundleDiff().write(str(old), str(new), io.BytesIO(), "delta")
+
+
+def test_diff_bundle_and_ndjson_by_resource_type_and_id(tmp_path):
+    patients, specimens = _snapshot()
+    old = Bundle("old", [
+        Entry(resource, BASE_URL + "/" + short_url, short_url, "PUT")
+        for resource, short_url in zip(
+            patients + specimens, ["patient/0", "patient/1", "patient/2",
+                                   "specimen/0", "specimen/1",
+                                   "specimen/2", "specimen/3"])])
+    new = tmp_path / "new"
+    with NDJSONExporter(str(new)) as exporter:
+        exporter.export(patients, specimens[:3])
+    fp = io.BytesIO()
+    stats = BundleDiff(BASE_URL).write(old, str(new), fp, "delta")
+    assert stats == (0, 0, 1, 6) \
+           and _requests(fp.getvalue()) == [("DELETE", "Specimen/3")]
+    fp = io.BytesIO()
+    stats = BundleDiff(BASE_URL).write(str(new), old, fp, "delta")
+    assert stats == (1, 0, 0, 6) \
+           and _requests(fp.getvalue()) == [("PUT", "specimen/3")]
+
+
+def test_diff_ignores_key_order_and_server_meta(tmp_path):
+    bundle = _bundle("old", _snapshot())
+    path = tmp_path / "Patient.ndjson"
+    lines = []
+    entries = json.loads(JSONSerializer.dumps(bundle))["entry"]
+    for entry in entries[:3]:
+        resource = entry["resource"]
+        resource["meta"]["versionId"] = "7"
+        lines.append(json.dumps(dict(reversed(list(resource.items())))))
+    path.write_text("\n".join(lines) + "\n")
+    fp = io.BytesIO()
+    stats = BundleDiff(BASE_URL).write([str(path)], bundle, fp, "delta")
+    assert stats == (4, 0, 0, 3) \
+           and _requests(fp.getvalue()) == \
+           [("PUT", "Specimen/{}".format(index)) for index in range(4)]
+
+
+def test_diff_arguments():
+    with pytest.raises(TypeError):
+        BundleDiff(1)
+    bundle = _bundle("old", _snapshot())
+    with pytest.raises(TypeError):
+        BundleDiff().to_bundle(bundle, 1, "delta")
+    with pytest.raises(TypeError):
+        BundleDiff().write(bundle, [1], io.BytesIO(), "delta")
+    with pytest.raises(TypeError):
+        BundleDiff().to_bundle(bundle, "new", "delta")
@@ -0,0 +1,103 @@
+import io
+import json
+from datetime import date
+
+import pytest
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.bundleWriter import BundleWriter
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.serializer import JSONSerializer
+from fhir_biobank.specimen import SpecimenResource
+
+
+def _resources():
+    patient = PatientResource("0", "2441")
+    yield patient
+    for index in range(3):
+        yield SpecimenResource(str(index), "442" + str(index), "bone-marrow",
+                               patient, date(2012, 2, 28), 4.0)
+
+
+def test_bundle_writer_same_output_as_serializer():
+    entries = [Entry.from_resource(resource, "https://example.com")
+               for resource in _resources()]
+    fp = io.BytesIO()
+    with BundleWriter(fp, "6441") as writer:
+        writer.write_all(entries)
+    assert fp.getvalue() == JSONSerializer.dumps(Bundle("6441", entries))
+
+
+def test_bundle_writer_without_entries():
+    fp = io.BytesIO()
+    with BundleWriter(fp, "6441") as writer:
+        pass
+    assert writer.entryCount == 0 and json.loads(fp.getvalue()) == {
+        "id": "6441", "type": "transaction", "resourceType": "Bundle"}
+
+
+def test_bundle_writer_resources_with_base_url():
+    fp = io.BytesIO()
+    with BundleWriter(fp, "6441", "collection",
+                      base_url="https://example.com/") as writer:
+        count = writer.write_all(_resources())
+    bundle = json.loads(fp.getvalue())
+    assert count == 4 and writer.entryCount == 4 \
+           and bundle["type"] == "collection" \
+           and bundle["entry"][0]["fullUrl"] == \
+           "https://example.com/Patient/0" \
+           and bundle["entry"][1]["request"]["url"] == "Specimen/0"
+
+
+def test_bundle_writer_resource_without_base_url():
+    fp = io.BytesIO()
+    with pytest.raises(ValueError):
+        with BundleWriter(fp, "6441") as writer:
+            writer.write(PatientResource("0", "2441"))
+
+
+def test_bundle_writer_incomplete_on_exception():
+    fp = io.BytesIO()
+    with pytest.raises(RuntimeError):
+        with BundleWriter(fp, "6441", base_url="https://example.com") \
+                as writer:
+            writer.write(PatientResource("0", "2441"))
+            raise RuntimeError()
+    with pytest.raises(ValueError):
+        json.loads(fp.getvalue())
+
+
+def test_bundle_writer_write_serialized():
+    entry = Entry(PatientResource("0", "2441"), "https://example.com/0",
+                  "Patient/0")
+    fp = io.BytesIO()
+    with BundleWriter(fp, "6441") as writer:
+        writer.write_serialized(JSONSerializer.dumps(entry))
+        writer.write(entry)
+    assert len(json.loads(fp.getvalue())["entry"]) == 2
+
+
+def test_bundle_writer_write_before_open():
+    writer = BundleWriter(io.BytesIO(), "6441")
+    with pytest.raises(ValueError):
+        writer.write_serialized(b"{}")
+
+
+def test_bundle_writer_incorrect_type_bundle_id():
+    with pytest.raises(TypeError):
+        BundleWriter(io.BytesIO(), 6441)
+
+
+def test_bundle_writer_incorrect_value_bundle_type():
+    with pytest.raises(TypeError):
+        BundleWriter(io.BytesIO(), "6441", "incorrect type of bundle")
+
+
+def test_bundle_writer_incorrect_value_request_method():
+    with pytest.raises(TypeError):
+        BundleWriter(io.BytesIO(), "6441", request_method="PATCH")
+
+
+def test_entry_from_resource_incorrect_type_resource():
+    with pytest.raises(TypeError):
+        Entry.from_resource(42, "https://example.com")
@@ -214,3 +214,70 @@ def test_bundle_incorrect_value_bundle_type():
         incorrect_bundle_type = "incorrect type of bundle"
         with pytest.raises(TypeError):
             bundle = Bundle("6441", [entry_patient], incorrect_bundle_type)
+
+
+def test_entry_and_bundle_have_no_instance_dict():
+    entry = Entry(PatientResource("0", "2441"), "https:/example.com/0", "0")
+    bundle = Bundle("6441", [entry])
+    assert not hasattr(entry, "__dict__") and not hasattr(bundle, "__dict__")
+
+
+def _patient_entry(patient_id):
+    return Entry.from_resource(PatientResource(patient_id, "2441"),
+                               "https://example.com")
+
+
+def test_bundle_json_same_as_fhirclient():
+    bundle = Bundle("6441", [_patient_entry("0"), _patient_entry("1")])
+    expected = str(bundle.FHIRInterpretation.as_json()).replace(
+        "True", "true").replace("False", "false")
+    assert bundle.bundleJSON() == expected
+
+
+def test_bundle_append_entry():
+    bundle = Bundle("6441", [_patient_entry("0")])
+    bundle.bundleJSON()
+    bundle.append(_patient_entry("1"))
+    assert len(bundle) == 2 and len(bundle.entries) == 2 \
+           and "Patient/1" in bundle.bundleJSON()
+
+
+def test_bundle_json_converts_only_new_entries():
+    first = _patient_entry("0")
+    bundle = Bundle("6441", [first])
+    bundle.bundleJSON()
+    with mock.patch.object(Entry, "entryJSON",
+                           return_value={"fullUrl": "mock"}) as entry_json:
+        bundle.append(_patient_entry("1"))
+        bundle.bundleJSON()
+        entry_json.assert_called_once_with()
+
+
+def test_bundle_remove_entry():
+    first, second = _patient_entry("0"), _patient_entry("1")
+    bundle = Bundle("6441", [first, second])
+    bundle.bundleJSON()
+    bundle.remove(first)
+    assert bundle.sourceEntries == [second] \
+           and "Patient/0" not in bundle.bundleJSON() \
+           and bundle.FHIRInterpretation.entry[0].fullUrl == \
+           "https://example.com/Patient/1"
+
+
+def test_bundle_remove_last_entry():
+    entry = _patient_entry("0")
+    bundle = Bundle("6441", [entry])
+    with pytest.raises(ValueError):
+        bundle.remove(entry)
+
+
+def test_bundle_remove_missing_entry():
+    bundle = Bundle("6441", [_patient_entry("0"), _patient_entry("1")])
+    with pytest.raises(ValueError):
+        bundle.remove(_patient_entry("0"))
+
+
+def test_bundle_append_incorrect_type_entry():
+    bundle = Bundle("6441", [_patient_entry("0")])
+    with pytest.raises(TypeError):
+        bundle.append(PatientResource("1", "2441"))
@@ -0,0 +1,105 @@
+import io
+import os
+import pickle
+
+import pytest
+
+from fhir_biobank.conversionCache import ConversionCache
+from fhir_biobank.ingestion import DirectoryIngestor
+from fhir_biobank.serializer import JSONSerializer
+from fhir_biobank.xmlReader import PatientXMLReader
+
+EXPORT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                           "BBM211219230002-000079.XML")
+
+
+@pytest.fixture
+def export_directory(tmp_path):
+    with open(EXPORT_PATH, "rb") as fp:
+        export = fp.read()
+    directory = tmp_path / "exports"
+    directory.mkdir()
+    for index in range(5):
+        (directory / "BBM{}.XML".format(index)).write_bytes(
+            export.replace(b'id="4816522"', 'id="{}"'.format(index).encode()))
+    return directory
+
+
+def _record():
+    return next(PatientXMLReader(EXPORT_PATH).records())
+
+
+def test_cache_key_normalized():
+    record = _record()
+    reordered = dict(reversed(list(record.items())))
+    changed = dict(record, sex="male")
+    assert ConversionCache.key(record) == ConversionCache.key(reordered) \
+           and ConversionCache.key(record) != ConversionCache.key(changed) \
+           and ConversionCache.key(record) != \
+           ConversionCache.key(record, "whole-blood")
+
+
+def test_cache_convert_hit_and_reopen(tmp_path):
+    path = str(tmp_path / "conversion.cache")
+    reader = PatientXMLReader(io.BytesIO())
+    patient, specimens = reader.convert_record(_record())
+    expected = [("Patient", JSONSerializer.dumps(patient))] + \
+               [("Specimen", JSONSerializer.dumps(specimen))
+                for specimen in specimens]
+    with ConversionCache(path) as cache:
+        assert cache.hit_rate() is None
+        first = cache.convert(reader, _record())
+        second = cache.convert(reader, _record())
+        assert first == second == expected and cache.hit_rate() == 0.5
+    with ConversionCache(path) as cache:
+        assert cache.convert(reader, _record()) == expected \
+               and cache.cache_info().hits == 1 \
+               and cache.convert(reader, _record(),
+                                 "https://example.com") != expected \
+               and cache.cache_info().misses == 1
+
+
+def test_cache_eviction(tmp_path):
+    reader = PatientXMLReader(io.BytesIO())
+    with ConversionCache(str(tmp_path / "conversion.cache"),
+                         max_bytes=10000) as cache:
+        for index in range(20):
+            cache.convert(reader, dict(_record(), id=str(index)))
+        info = cache.cache_info()
+        assert info.evictions > 0 and info.currsize <= 10000 \
+               and info.maxsize == 10000 \
+               and cache.get(ConversionCache.key(
+                   dict(_record(), id="0"), reader.defaultMaterialCode,
+                   reader.materialCodes, None)) is None
+        cache.clear()
+        assert cache.cache_info().currsize == 0
+
+
+def test_cache_ingestion(export_directory, tmp_path):
+    expected = tmp_path / "expected"
+    DirectoryIngestor(workers=1).to_ndjson(str(export_directory),
+                                           str(expected))
+    path = str(tmp_path / "conversion.cache")
+    for workers, output in ((1, "first"), (2, "second"), (1, "third")):
+        with ConversionCache(path) as cache:
+            DirectoryIngestor(workers=workers, cache=cache).to_ndjson(
+                str(export_directory), str(tmp_path / output))
+            info = cache.cache_info()
+        for name in ("Patient.ndjson", "Specimen.ndjson"):
+            assert (tmp_path / output / name).read_bytes() == \
+                   (expected / name).read_bytes()
+    # the last run converts in this process and finds every record
+    assert info.hits == 5 and info.misses == 0
+
+
+def test_cache_pickle_and_arguments(tmp_path):
+    path = str(tmp_path / "conversion.cache")
+    with ConversionCache(path, 1000) as cache:
+        copy = pickle.loads(pickle.dumps(cache))
+        assert copy.path == path and copy.maxBytes == 1000
+    with pytest.raises(TypeError):
+        ConversionCache(1)
+    with pytest.raises(ValueError):
+        ConversionCache(path, 0)
+    with pytest.raises(TypeError):
+        DirectoryIngestor(cache=path)
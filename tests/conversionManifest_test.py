@@ -0,0 +1,134 @@
+import io
+import json
+import os
+
+import pytest
+
+from fhir_biobank.bundle import Entry
+from fhir_biobank.conversionCache import ConversionCache
+from fhir_biobank.conversionManifest import ConversionManifest
+from fhir_biobank.ingestion import DirectoryIngestor
+from fhir_biobank.serializer import JSONSerializer
+
+BASE_URL = "https://example.com"
+EXPORT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                           "BBM211219230002-000079.XML")
+
+
+@pytest.fixture
+def export_directory(tmp_path):
+    with open(EXPORT_PATH, "rb") as fp:
+        export = fp.read()
+    directory = tmp_path / "exports"
+    directory.mkdir()
+    for index in range(4):
+        (directory / "BBM{}.XML".format(index)).write_bytes(
+            export.replace(b'id="4816522"', 'id="{}"'.format(index).encode()))
+    return directory
+
+
+def _changes(directory, manifest, ingestor=None, uploaded=True):
+    fp = io.BytesIO()
+    (ingestor or DirectoryIngestor(workers=1)).to_bundle(
+        str(directory), fp, "changes", BASE_URL, manifest=manifest)
+    if uploaded:
+        manifest.save()
+    return [(entry["request"]["method"], entry["request"]["url"])
+            for entry in json.loads(fp.getvalue()).get("entry", [])]
+
+
+def test_manifest_converts_only_changes(export_directory, tmp_path):
+    path = str(tmp_path / "exports.manifest")
+    first = _changes(export_directory, ConversionManifest(path))
+    assert len(first) == 24 and ("PUT", "Patient/3") in first
+    assert _changes(export_directory, ConversionManifest(path)) == []
+
+    export = export_directory / "BBM1.XML"
+    export.write_bytes(export.read_bytes().replace(b'id="1"', b'id="7"'))
+    # the same content with a new modification time is not converted
+    os.utime(str(export_directory / "BBM2.XML"), ns=(0, 0))
+    os.remove(str(export_directory / "BBM3.XML"))
+    manifest = ConversionManifest(path)
+    changes = _changes(export_directory, manifest)
+    assert ("PUT", "Patient/7") in changes \
+           and ("DELETE", "Patient/1") in changes \
+           and ("DELETE", "Patient/3") in changes \
+           and not any(url == "Patient/2" for _, url in changes) \
+           and len([change for change in changes
+                    if change[0] == "PUT"]) == 6 \
+           and len(manifest) == 3 and "BBM3.XML" not in manifest \
+           and manifest.get("BBM2.XML").mtime_ns == 0 \
+           and "Patient/7" in manifest.get("BBM1.XML").resources
+    assert _changes(export_directory, ConversionManifest(path)) == []
+
+
+def test_manifest_not_saved_by_to_bundle(export_directory, tmp_path):
+    path = str(tmp_path / "exports.manifest")
+    manifest = ConversionManifest(path)
+    # the upload of the changes failed, the manifest is not saved
+    assert len(_changes(export_directory, manifest, uploaded=False)) == 24 \
+           and len(manifest) == 4 and not os.path.exists(path)
+    assert len(_changes(export_directory, ConversionManifest(path))) == 24
+    assert _changes(export_directory, ConversionManifest(path)) == []
+
+
+def test_manifest_other_options_convert_again(export_directory, tmp_path):
+    path = str(tmp_path / "exports.manifest")
+    _changes(export_directory, ConversionManifest(path))
+    changes = _changes(export_directory, ConversionManifest(path),
+                       DirectoryIngestor(workers=1,
+                                         default_material_code="blood-serum"))
+    assert len(changes) == 24 \
+           and all(method == "PUT" for method, _ in changes)
+
+
+def test_manifest_with_cache_and_processes(export_directory, tmp_path):
+    path = str(tmp_path / "exports.manifest")
+    with ConversionCache(str(tmp_path / "cache.sqlite")) as cache:
+        ingestor = DirectoryIngestor(workers=2, chunk_size=1, cache=cache)
+        assert len(_changes(export_directory, ConversionManifest(path),
+                            ingestor)) == 24
+        os.remove(str(export_directory / "BBM0.XML"))
+        changes = _changes(export_directory, ConversionManifest(path),
+                           ingestor)
+        assert len(changes) == 6 and changes[0] == ("DELETE", "Patient/0") \
+               and all(method == "DELETE" for method, _ in changes)
+
+
+def test_manifest_save_and_load(tmp_path):
+    path = str(tmp_path / "exports.manifest")
+    manifest = ConversionManifest(path)
+    manifest.set_options(["0.1.3", {"DNA": "dna"}])
+    manifest.record("BBM0.XML", 10, 20, manifest.digest(b"export"),
+                    ["Patient/0"])
+    manifest.save()
+    loaded = ConversionManifest(path)
+    assert loaded.matches(["0.1.3", {"DNA": "dna"}]) \
+           and not loaded.matches(["0.1.3", None]) \
+           and loaded.get("BBM0.XML").resources == ["Patient/0"] \
+           and loaded.resources() == {"Patient/0"} \
+           and list(loaded) == ["BBM0.XML"] \
+           and loaded.remove("BBM0.XML").size == 10 and len(loaded) == 0
+
+
+def test_manifest_delete_entry():
+    entry = Entry.delete("Patient/0", BASE_URL + "/")
+    assert entry.resource is None and entry.requestMethod == "DELETE" \
+           and json.loads(JSONSerializer.dumps(entry)) == {
+               "fullUrl": "https://example.com/Patient/0",
+               "request": {"method": "DELETE", "url": "Patient/0"}} \
+           and entry.entryJSON() == json.loads(JSONSerializer.dumps(entry))
+    with pytest.raises(TypeError):
+        Entry(None, BASE_URL + "/Patient/0", "Patient/0", "PUT")
+
+
+def test_manifest_arguments(tmp_path):
+    with pytest.raises(TypeError):
+        ConversionManifest(1)
+    path = tmp_path / "exports.manifest"
+    path.write_text("[]")
+    with pytest.raises(ValueError):
+        ConversionManifest(str(path))
+    with pytest.raises(TypeError):
+        DirectoryIngestor().to_bundle(str(tmp_path), io.BytesIO(), "b",
+                                      BASE_URL, manifest=object())
@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from fhir_biobank.custodian import Custodian
+
+
+def test_custodian_correct_reference():
+    custodian = Custodian("Organization/0")
+    assert custodian.reference == "Organization/0"
+
+
+def test_custodian_incorrect_type_reference():
+    with pytest.raises(TypeError):
+        Custodian(42)
+
+
+def test_custodian_same_reference_shared_instance():
+    assert Custodian("Organization/0") is Custodian("Organization/0")
+
+
+def test_custodian_json_fragment():
+    custodian = Custodian("Organization/0")
+    assert json.loads(custodian.JSONFragment) == \
+           custodian.fhirExtension.as_json()
+
+
+def test_custodian_extension_changes_not_shared():
+    extension = Custodian("Organization/0").fhirExtension
+    extension.url = "x"
+    extension.valueReference.reference = "Organization/1"
+    assert Custodian("Organization/0").fhirExtension.valueReference \
+           .reference == "Organization/0"
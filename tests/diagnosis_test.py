@@ -1,3 +1,6 @@
+import json
+import pickle
+
 import pytest
 from fhir_biobank.diagnosis import Diagnosis
 
@@ -12,3 +15,65 @@ def test_diagnosis_incorrect_type_code():
     code = 42
     with pytest.raises(TypeError):
         Diagnosis(code)
+
+
+def test_diagnosis_has_no_instance_dict():
+    assert not hasattr(Diagnosis("C42.5"), "__dict__")
+
+
+def test_diagnosis_fhir_extension_created_on_every_call():
+    diagnosis = Diagnosis("C42.5")
+    assert diagnosis.fhirExtension is not diagnosis.fhirExtension \
+           and diagnosis.fhirExtension.valueCodeableConcept.coding[0].code \
+           == "C42.5"
+
+
+def test_diagnosis_same_code_shared_instance():
+    assert Diagnosis("C42.5") is Diagnosis("C42.5") \
+           and Diagnosis("C42.5") is not Diagnosis("C42.6")
+
+
+def test_diagnosis_cache_info():
+    Diagnosis.cache_clear()
+    Diagnosis("C42.5")
+    Diagnosis("C42.5")
+    info = Diagnosis.cache_info()
+    assert info.hits == 1 and info.misses == 1 and info.currsize == 1
+
+
+def test_diagnosis_cache_eviction():
+    Diagnosis.cache_clear()
+    Diagnosis.set_cache_size(2)
+    try:
+        first = Diagnosis("C1")
+        Diagnosis("C2")
+        Diagnosis("C3")
+        assert Diagnosis.cache_info().evictions == 1 \
+               and Diagnosis("C1") is not first
+    finally:
+        Diagnosis.set_cache_size(4096)
+
+
+def test_diagnosis_immutable():
+    diagnosis = Diagnosis("C42.5")
+    with pytest.raises(AttributeError):
+        diagnosis._diagnosisCode = "C50"
+
+
+def test_diagnosis_pickle_returns_shared_instance():
+    diagnosis = Diagnosis("C42.5")
+    assert pickle.loads(pickle.dumps(diagnosis)) is diagnosis
+
+
+def test_diagnosis_json_fragment():
+    assert json.loads(Diagnosis("C42.5").JSONFragment) == \
+           Diagnosis("C42.5").fhirExtension.as_json()
+
+
+def test_diagnosis_extension_changes_not_shared():
+    extension = Diagnosis("C42.5").fhirExtension
+    extension.url = "x"
+    extension.valueCodeableConcept.coding[0].display = "x"
+    assert Diagnosis("C42.5").fhirExtension.url != "x" \
+           and Diagnosis("C42.5").fhirExtension.valueCodeableConcept \
+           .coding[0].display is None
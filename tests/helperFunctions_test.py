@@ -1,4 +1,12 @@
+import os
+import pickle
+import subprocess
+import sys
+from datetime import date
+
 from fhir_biobank.helperFunctions import Helper
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.specimen import SpecimenResource
 import pytest
 from fhirclient.models.coding import Coding
 
@@ -150,4 +158,116 @@ def test_create_fhir_reference_correct_reference():
 def test_create_fhir_reference_incorrect_type_reference():
     reference  = 42
     with pytest.raises(TypeError):
-        Helper.create_fhir_reference(reference)
\ No newline at end of file
+        Helper.create_fhir_reference(reference)
+
+
+def test_cached_coding_same_instance():
+    Helper.cache_clear()
+    coding = Helper.cached_coding("C42", "http://hl7.org/fhir/sid/icd-10")
+    assert Helper.cached_coding("C42", "http://hl7.org/fhir/sid/icd-10") \
+           is coding and coding.as_json() == Helper.create_coding(
+        "C42", "http://hl7.org/fhir/sid/icd-10").as_json()
+    info = Helper.cache_info()["coding"]
+    assert info.hits == 1 and info.misses == 1
+
+
+def test_cached_coding_is_frozen():
+    coding = Helper.cached_coding("C42")
+    with pytest.raises(AttributeError):
+        coding.code = "C43"
+
+
+def test_cached_coding_incorrect_type_code():
+    with pytest.raises(TypeError):
+        Helper.cached_coding(42)
+
+
+def test_cached_coding_incorrect_type_user_selected():
+    with pytest.raises(TypeError):
+        Helper.cached_coding("C42", user_selected=1)
+
+
+def test_cached_codeable_concept_frozen_coding_list():
+    codeable_concept = Helper.cached_codeable_concept("C42", text="Cancer")
+    assert codeable_concept.text == "Cancer" \
+           and codeable_concept.coding[0].code == "C42" \
+           and codeable_concept.coding[0].userSelected is False
+    with pytest.raises(AttributeError):
+        codeable_concept.coding.append(Coding())
+
+
+def test_cached_identifier_same_instance():
+    identifier = Helper.cached_identifier("2441", identifier_type="PPN")
+    assert Helper.cached_identifier("2441", identifier_type="PPN") \
+           is identifier and identifier.type.coding[0].code == "PPN"
+
+
+def test_cached_identifier_incorrect_value_identifier_type():
+    with pytest.raises(Exception):
+        Helper.cached_identifier("2441", identifier_type="incorrect type")
+
+
+def test_cache_least_recently_used_evicted():
+    Helper.cache_clear()
+    Helper.set_cache_size(2)
+    try:
+        first = Helper.cached_coding("C42")
+        Helper.cached_coding("C43")
+        Helper.cached_coding("C42")
+        Helper.cached_coding("C44")
+        info = Helper.cache_info()["coding"]
+        assert Helper.cached_coding("C42") is first \
+               and info.evictions == 1 and info.currsize == 2
+    finally:
+        Helper.set_cache_size(1024)
+
+
+def test_set_cache_size_incorrect_value():
+    with pytest.raises(ValueError):
+        Helper.set_cache_size(0)
+
+
+def test_cached_coding_pickle():
+    coding = pickle.loads(pickle.dumps(Helper.cached_coding("C42")))
+    assert coding.code == "C42" and isinstance(coding, Coding)
+
+
+
+def test_cached_elements_unpickle_in_new_process():
+    patient = PatientResource("0", "2441")
+    specimen = SpecimenResource("0", "442", "bone-marrow", patient,
+                                date(2012, 2, 28), 4.0)
+    patient.FHIRInterpretation
+    specimen.FHIRInterpretation
+    data = pickle.dumps([Helper.cached_coding("C42"),
+                         Helper.cached_codeable_concept("C42"),
+                         patient, specimen])
+    code = ("import pickle, sys; elements = pickle.load(sys.stdin.buffer); "
+            "print(elements[0].code, elements[3].specimenId)")
+    result = subprocess.run([sys.executable, "-c", code], input=data,
+                            stdout=subprocess.PIPE, check=True,
+                            cwd=os.path.dirname(os.path.dirname(__file__)))
+    assert result.stdout.split() == [b"C42", b"0"]
+
+
+def test_created_elements_mutable():
+    identifier = Helper.create_identifier("442")
+    identifier.type.text = "sample"
+    identifier.type.coding[0].display = "Accession ID"
+    assert Helper.create_identifier("442").type.text is None \
+           and Helper.cached_codeable_concept("ACSN").text is None
+
+
+def test_fhir_interpretation_mutable():
+    patient = PatientResource("0", "2441")
+    specimen = SpecimenResource("0", "442", "bone-marrow", patient,
+                                date(2012, 2, 28), 4.0,
+                                body_site_collection_code="C42")
+    fhir_specimen = specimen.FHIRInterpretation
+    fhir_specimen.type.text = "marrow"
+    fhir_specimen.type.coding[0].display = "Bone marrow"
+    fhir_specimen.collection.bodySite.coding[0].display = "C42"
+    fhir_specimen.identifier[0].type.text = "sample"
+    assert SpecimenResource("1", "442", "bone-marrow", patient,
+                            date(2012, 2, 28), 4.0).FHIRInterpretation \
+        .type.coding[0].display is None
@@ -0,0 +1,71 @@
+import io
+import json
+import os
+
+import pytest
+
+from fhir_biobank.ingestion import DirectoryIngestor
+
+EXPORT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                           "BBM211219230002-000079.XML")
+
+
+@pytest.fixture
+def export_directory(tmp_path):
+    with open(EXPORT_PATH, "rb") as fp:
+        export = fp.read()
+    for index in range(5):
+        (tmp_path / "BBM{}.XML".format(index)).write_bytes(
+            export.replace(b'id="4816522"', 'id="{}"'.format(index).encode()))
+    (tmp_path / "notes.txt").write_bytes(b"not an export")
+    return tmp_path
+
+
+def test_ingestion_files_sorted_and_filtered(export_directory):
+    files = DirectoryIngestor().files(str(export_directory))
+    assert [os.path.basename(path) for path in files] == \
+           ["BBM{}.XML".format(index) for index in range(5)]
+
+
+def test_ingestion_to_ndjson(export_directory, tmp_path_factory):
+    output = tmp_path_factory.mktemp("output")
+    exporter = DirectoryIngestor(workers=1).to_ndjson(str(export_directory),
+                                                      str(output))
+    patients = (output / "Patient.ndjson").read_bytes().splitlines()
+    assert exporter.counts == {"Patient": 5, "Specimen": 25} \
+           and [json.loads(line)["id"] for line in patients] == \
+           ["0", "1", "2", "3", "4"]
+
+
+def test_ingestion_process_pool_same_output(export_directory,
+                                            tmp_path_factory):
+    sequential = tmp_path_factory.mktemp("sequential")
+    parallel = tmp_path_factory.mktemp("parallel")
+    DirectoryIngestor(workers=1).to_ndjson(str(export_directory),
+                                           str(sequential))
+    DirectoryIngestor(workers=2, chunk_size=2).to_ndjson(
+        str(export_directory), str(parallel))
+    for name in ("Patient.ndjson", "Specimen.ndjson"):
+        assert (sequential / name).read_bytes() == \
+               (parallel / name).read_bytes()
+
+
+def test_ingestion_to_bundle(export_directory):
+    fp = io.BytesIO()
+    count = DirectoryIngestor(workers=2).to_bundle(
+        str(export_directory), fp, "6441", "https://example.com")
+    bundle = json.loads(fp.getvalue())
+    assert count == 30 and len(bundle["entry"]) == 30 \
+           and bundle["entry"][0]["fullUrl"] == \
+           "https://example.com/Patient/0" \
+           and bundle["entry"][1]["request"]["url"] == "Specimen/0-0"
+
+
+def test_ingestion_incorrect_value_workers():
+    with pytest.raises(ValueError):
+        DirectoryIngestor(workers=0)
+
+
+def test_ingestion_incorrect_type_chunk_size():
+    with pytest.raises(TypeError):
+        DirectoryIngestor(chunk_size="16")
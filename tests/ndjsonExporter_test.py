@@ -0,0 +1,103 @@
+import gzip
+import json
+import os
+from datetime import date
+
+import pytest
+
+from fhir_biobank.condition import ConditionResource
+from fhir_biobank.ndjsonExporter import NDJSONExporter
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.serializer import JSONSerializer
+from fhir_biobank.specimen import SpecimenResource
+
+
+def _resources():
+    patient = PatientResource("0", "2441")
+    specimens = [SpecimenResource(str(index), "442", "bone-marrow", patient,
+                                  date(2012, 2, 28), 4.0)
+                 for index in range(5)]
+    conditions = [ConditionResource("0", "C509", date(2012, 5, 8), patient)]
+    return [patient], specimens, conditions
+
+
+def test_ndjson_exporter_one_file_per_resource_type(tmp_path):
+    patients, specimens, conditions = _resources()
+    with NDJSONExporter(str(tmp_path)) as exporter:
+        files = exporter.export(patients, specimens, conditions)
+    assert [os.path.basename(path) for path in files] == \
+           ["Patient.ndjson", "Specimen.ndjson", "Condition.ndjson"]
+    lines = (tmp_path / "Specimen.ndjson").read_bytes().splitlines()
+    assert lines == [JSONSerializer.dumps(specimen)
+                     for specimen in specimens]
+    assert exporter.counts == {"Patient": 1, "Specimen": 5, "Condition": 1}
+
+
+def test_ndjson_exporter_no_file_without_resources(tmp_path):
+    patients, _, _ = _resources()
+    with NDJSONExporter(str(tmp_path)) as exporter:
+        exporter.export(patients=patients)
+    assert os.listdir(str(tmp_path)) == ["Patient.ndjson"]
+
+
+def test_ndjson_exporter_compressed(tmp_path):
+    patients, _, _ = _resources()
+    with NDJSONExporter(str(tmp_path), compress=True) as exporter:
+        exporter.export(patients=patients)
+    with gzip.open(str(tmp_path / "Patient.ndjson.gz")) as fp:
+        assert json.loads(fp.readline())["id"] == "0"
+
+
+def test_ndjson_exporter_split_into_parts(tmp_path):
+    _, specimens, _ = _resources()
+    line_length = len(JSONSerializer.dumps(specimens[0])) + 1
+    with NDJSONExporter(str(tmp_path),
+                        max_part_bytes=2 * line_length) as exporter:
+        files = exporter.export(specimens=specimens)
+    assert [os.path.basename(path) for path in files] == \
+           ["Specimen.1.ndjson", "Specimen.2.ndjson", "Specimen.3.ndjson"]
+    assert len((tmp_path / "Specimen.3.ndjson").read_bytes()
+               .splitlines()) == 1
+
+
+def test_ndjson_exporter_part_larger_than_limit(tmp_path):
+    patients, _, _ = _resources()
+    with NDJSONExporter(str(tmp_path), max_part_bytes=1) as exporter:
+        files = exporter.export(patients=patients * 2)
+    assert len(files) == 2
+
+
+def test_ndjson_exporter_incorrect_type_resource(tmp_path):
+    with NDJSONExporter(str(tmp_path)) as exporter:
+        with pytest.raises(TypeError):
+            exporter.write(42)
+
+
+def test_ndjson_exporter_incorrect_value_resource_type(tmp_path):
+    with NDJSONExporter(str(tmp_path)) as exporter:
+        with pytest.raises(ValueError):
+            exporter.write_serialized("Observation", b"{}")
+
+
+def test_ndjson_exporter_incorrect_value_max_part_bytes(tmp_path):
+    with pytest.raises(ValueError):
+        NDJSONExporter(str(tmp_path), max_part_bytes=0)
+
+
+def test_ndjson_exporter_incorrect_type_compress(tmp_path):
+    with pytest.raises(TypeError):
+        NDJSONExporter(str(tmp_path), compress="yes")
+
+
+def test_ndjson_exporter_write_after_close(tmp_path):
+    patients, _, _ = _resources()
+    exporter = NDJSONExporter(str(tmp_path))
+    exporter.write(patients[0])
+    exporter.close()
+    with pytest.raises(ValueError):
+        exporter.write(PatientResource("1", "2441"))
+    exporter.close()
+    assert (tmp_path / "Patient.ndjson").read_bytes() == \
+           JSONSerializer.dumps(patients[0]) + b"\n" \
+           and exporter.counts == {"Patient": 1} \
+           and len(exporter.files) == 1
@@ -158,3 +158,7 @@ def test_patient_correct_patientJson():
         patient = PatientResource("ewa4",patient_links=[mock_patient])
         print(patient.link)
 """
+
+
+def test_patient_has_no_instance_dict():
+    assert not hasattr(PatientResource("0", "2441"), "__dict__")
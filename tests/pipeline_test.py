@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from fhir_biobank.adaptiveController import AdaptiveController
+from fhir_biobank.pipeline import UploadPipeline
+from fhir_biobank.uploader import BundleUploader, UploadError
+from tests.uploader_test import StubFHIRServer
+
+EXPORT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                           "BBM211219230002-000079.XML")
+
+
+@pytest.fixture
+def export_directory(tmp_path):
+    with open(EXPORT_PATH, "rb") as fp:
+        export = fp.read()
+    for index in range(30):
+        (tmp_path / "BBM{:02d}.XML".format(index)).write_bytes(
+            export.replace(b'id="4816522"', 'id="{}"'.format(index).encode()))
+    return tmp_path
+
+
+@pytest.fixture
+def server_factory():
+    servers = []
+
+    def create(statuses=(), delay=0.0):
+        servers.append(StubFHIRServer(statuses, delay))
+        return servers[-1]
+
+    yield create
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_pipeline_uploads_directory(export_directory, server_factory):
+    server = server_factory()
+    with BundleUploader(server.url, concurrency=3) as uploader:
+        stats = UploadPipeline(uploader, bundle_size=20, converters=2).upload(
+            str(export_directory))
+    patients = sorted(entry["resource"]["identifier"][0]["value"]
+                      for body in server.bodies for entry in body["entry"]
+                      if entry["resource"]["resourceType"] == "Patient")
+    assert stats.files == 30 and stats.patients == 30 \
+           and stats.resources == 180 and stats.bundles == 10 \
+           and len(server.bodies) == 10 \
+           and all(len(body["entry"]) == 18 and body["type"] == "transaction"
+                   for body in server.bodies) \
+           and patients == sorted(str(index) for index in range(30)) \
+           and uploader.metrics().requests == 10
+
+
+def test_pipeline_backpressure(export_directory, server_factory):
+    server = server_factory(delay=0.01)
+    paths = sorted(str(path) for path in export_directory.iterdir())
+    ahead = []
+
+    def source():
+        for path in paths:
+            ahead.append(len(ahead) - len(server.bodies))
+            yield path
+
+    with BundleUploader(server.url, concurrency=1) as uploader:
+        stats = UploadPipeline(uploader, bundle_size=1, readers=1,
+                               converters=1, serializers=1,
+                               queue_size=1).upload(source())
+    assert stats.bundles == 30 and max(ahead) <= 12
+
+
+def test_pipeline_bundle_size_from_controller(export_directory,
+                                              server_factory):
+    server = server_factory()
+    controller = AdaptiveController(bundle_size=12, min_bundle_size=6,
+                                    max_bundle_size=12, window=100)
+    with BundleUploader(server.url, controller=controller) as uploader:
+        stats = UploadPipeline(uploader, bundle_size=500).upload(
+            str(export_directory))
+    assert stats.bundles == 15 \
+           and all(len(body["entry"]) == 12 for body in server.bodies)
+
+
+def test_pipeline_stops_on_upload_error(export_directory, server_factory):
+    server = server_factory([400])
+    with BundleUploader(server.url, concurrency=1) as uploader:
+        with pytest.raises(UploadError):
+            UploadPipeline(uploader, queue_size=1).upload(
+                str(export_directory))
+
+
+def test_pipeline_arguments():
+    uploader = BundleUploader("https://example.com")
+    with pytest.raises(TypeError):
+        UploadPipeline("https://example.com")
+    with pytest.raises(ValueError):
+        UploadPipeline(uploader, bundle_size=0)
+    with pytest.raises(TypeError):
+        UploadPipeline(uploader, queue_size=None)
+    with pytest.raises(TypeError):
+        UploadPipeline(uploader, request_method="PATCH")
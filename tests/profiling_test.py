@@ -0,0 +1,89 @@
+import threading
+from datetime import date
+
+import pytest
+
+from fhir_biobank import profiling
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.serializer import JSONSerializer
+
+
+def _bundle():
+    patient = PatientResource("0", "4816522", "female", date(1997, 12, 1))
+    return Bundle("0", [Entry.from_resource(patient, "https://example.com")])
+
+
+def test_profiling_disabled_by_default():
+    init = PatientResource.__dict__["__init__"]
+    assert not profiling.is_enabled() and not hasattr(init, "__wrapped__")
+
+
+def test_profile_counts_stages():
+    with profiling.profile() as measured:
+        _bundle().bundleJSON()
+    stats = measured.snapshot()
+    assert stats["PatientResource.__init__"].count == 1 \
+           and stats["Entry._convert_to_FHIR"].count == 1 \
+           and stats["Bundle.bundleJSON"].count == 1 \
+           and stats["Bundle.bundleJSON"].seconds > 0 \
+           and stats["SpecimenResource.__init__"].count == 0
+
+
+def test_profile_counts_threads():
+    def create():
+        for index in range(2000):
+            PatientResource(str(index), "4816522")
+
+    with profiling.profile() as measured:
+        threads = [threading.Thread(target=create) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert measured.snapshot()["PatientResource.__init__"].count == 16000
+
+
+def test_profile_removes_instrumentation():
+    with profiling.profile():
+        pass
+    assert not hasattr(PatientResource.__dict__["__init__"], "__wrapped__") \
+           and not profiling.is_enabled()
+
+
+def test_profile_block_only():
+    _bundle()
+    with profiling.profile() as measured:
+        JSONSerializer.dumps(_bundle())
+    _bundle()
+    stats = measured.snapshot()
+    assert stats["Bundle.__init__"].count == 1 \
+           and stats["JSONSerializer.dumps"].count == 1
+
+
+def test_profile_allocations():
+    with profiling.profile(allocations=True) as measured:
+        bundle = _bundle()
+        bundle.FHIRInterpretation
+    assert measured.snapshot()["Bundle._convert_to_FHIR"].allocated > 0
+
+
+def test_nested_enable():
+    profiling.enable()
+    profiling.enable()
+    profiling.disable()
+    assert profiling.is_enabled()
+    profiling.disable()
+    assert not profiling.is_enabled()
+
+
+def test_reset():
+    with profiling.profile():
+        _bundle()
+    profiling.reset()
+    assert profiling.snapshot()["Bundle.__init__"] == (0, 0.0, 0)
+
+
+def test_enable_incorrect_type_allocations():
+    with pytest.raises(TypeError):
+        profiling.enable(allocations="yes")
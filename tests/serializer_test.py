@@ -0,0 +1,151 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from datetime import date
+from unittest import mock
+
+import pytest
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.condition import ConditionResource
+from fhir_biobank.custodian import Custodian
+from fhir_biobank.diagnosis import Diagnosis
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.serializer import JSONSerializer, _entry_json
+from fhir_biobank.specimen import SpecimenResource
+from fhir_biobank.storageTemperature import StorageTemperature
+
+
+def _patient():
+    return PatientResource("0", "4816522", "female", date(1997, 12, 1))
+
+
+def _specimen(patient):
+    return SpecimenResource("1", "BBM:2021:723:1", "tumor-tissue-frozen",
+                            patient, date(2021, 11, 4), 3.0,
+                            body_site_collection_code="C50",
+                            quantity_unit="ml", quantity_unit_code="mL",
+                            extensions=[Diagnosis("C509"),
+                                        StorageTemperature("temperatureLN"),
+                                        Custodian("Organization/1")])
+
+
+def test_serializer_patient_equivalent_to_fhirclient():
+    patient = _patient()
+    serialized = JSONSerializer.dumps(patient, check_equivalence=True)
+    assert json.loads(serialized) == patient.patientJSON()
+
+
+def test_serializer_patient_all_values_equivalent_to_fhirclient():
+    linked = _patient()
+    patient = PatientResource("1", "42", "male", date(1950, 1, 1),
+                              deceased_boolean=True,
+                              deceased_datetime=date(2020, 5, 4),
+                              multiple_birth_boolean=True,
+                              multiple_birth_int=2,
+                              patient_links=[linked],
+                              identifier_type="MR")
+    serialized = JSONSerializer.dumps(patient, check_equivalence=True)
+    assert json.loads(serialized) == patient.patientJSON()
+
+
+def test_serializer_specimen_equivalent_to_fhirclient():
+    specimen = _specimen(_patient())
+    serialized = JSONSerializer.dumps(specimen, check_equivalence=True)
+    assert json.loads(serialized) == specimen.specimenJSON()
+
+
+def test_serializer_condition_equivalent_to_fhirclient():
+    condition = ConditionResource("2", "C509", date(2021, 1, 8), _patient())
+    serialized = JSONSerializer.dumps(condition, check_equivalence=True)
+    assert json.loads(serialized) == condition.conditionJSON()
+
+
+def test_serializer_extension_equivalent_to_fhirclient():
+    diagnosis = Diagnosis("C509")
+    serialized = JSONSerializer.dumps(diagnosis, check_equivalence=True)
+    assert json.loads(serialized) == diagnosis.fhirExtension.as_json()
+
+
+def test_serializer_bundle_equivalent_to_fhirclient():
+    patient = _patient()
+    entries = [Entry(patient, "https://example.com/Patient/0", "Patient/0"),
+               Entry(_specimen(patient), "https://example.com/Specimen/1",
+                     "Specimen/1")]
+    bundle = Bundle("6441", entries)
+    serialized = JSONSerializer.dumps(bundle, check_equivalence=True)
+    assert json.loads(serialized) == bundle.FHIRInterpretation.as_json()
+
+
+def test_serializer_returns_bytes():
+    assert type(JSONSerializer.dumps(_patient())) == bytes
+
+
+def test_serializer_non_ascii_values():
+    patient = PatientResource("0", "Šimon-č")
+    serialized = JSONSerializer.dumps(patient, check_equivalence=True)
+    assert json.loads(serialized)["identifier"][0]["value"] == "Šimon-č"
+
+
+def test_serializer_dump_writes_to_file():
+    patient = _patient()
+    fp = io.BytesIO()
+    written = JSONSerializer.dump(patient, fp)
+    assert fp.getvalue() == JSONSerializer.dumps(patient) \
+           and written == len(fp.getvalue())
+
+
+def test_serializer_incorrect_type_object():
+    with pytest.raises(TypeError):
+        JSONSerializer.dumps(42)
+
+
+def test_serializer_incorrect_type_check_equivalence():
+    with pytest.raises(TypeError):
+        JSONSerializer.dumps(_patient(), check_equivalence="yes")
+
+
+def test_serializer_does_not_import_fhirclient():
+    source = "\n".join([
+        "import sys",
+        "from fhir_biobank.bundle import Bundle, Entry",
+        "from fhir_biobank.patient import PatientResource",
+        "from fhir_biobank.serializer import JSONSerializer",
+        "patient = PatientResource('0', '4816522')",
+        "JSONSerializer.dumps(Bundle('0', [Entry.from_resource(",
+        "    patient, 'https://example.com')]))",
+        "print(any(name.startswith('fhirclient') for name in sys.modules))"])
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", source], cwd=root,
+                            check=True,
+                            stdout=subprocess.PIPE,
+                            universal_newlines=True).stdout
+    assert output.strip() == "False"
+
+
+def test_serializer_bundle_reuses_serialized_entries():
+    first = Entry.from_resource(_patient(), "https://example.com")
+    bundle = Bundle("6441", [first])
+    JSONSerializer.dumps(bundle)
+    second = Entry.from_resource(PatientResource("1", "4816523"),
+                                 "https://example.com")
+    bundle.append(second)
+    with mock.patch("fhir_biobank.serializer._entry_json",
+                    wraps=_entry_json) as entry_json:
+        serialized = JSONSerializer.dumps(bundle, check_equivalence=True)
+        entry_json.assert_called_once_with(second)
+    assert [entry["fullUrl"] for entry in json.loads(serialized)["entry"]] \
+           == ["https://example.com/Patient/0",
+               "https://example.com/Patient/1"]
+
+
+@pytest.mark.parametrize("quantity", [float("nan"), float("inf"),
+                                      float("-inf")])
+def test_serializer_rejects_non_finite_numbers(quantity):
+    patient = PatientResource("0", "2441")
+    specimen = SpecimenResource("0", "442", "bone-marrow", patient,
+                                date(2012, 2, 28), quantity)
+    with pytest.raises(ValueError):
+        JSONSerializer.dumps(specimen)
@@ -0,0 +1,95 @@
+from datetime import date
+
+import pytest
+
+from fhir_biobank.bundle import Entry
+from fhir_biobank.condition import ConditionResource
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.shardPlanner import ShardPlanner
+from fhir_biobank.specimen import SpecimenResource
+
+BASE_URL = "https://example.com"
+
+
+def _ids(entries):
+    return [entry.sourceResource.patientId
+            if isinstance(entry.sourceResource, PatientResource)
+            else entry.sourceResource.specimenId
+            if isinstance(entry.sourceResource, SpecimenResource)
+            else entry.sourceResource.conditionId for entry in entries]
+
+
+def _biobank(patients, specimens):
+    """
+    Resources with specimens listed before their patients.
+    """
+    resources = []
+    for patient_index in range(patients):
+        patient = PatientResource("p{}".format(patient_index), "4816522")
+        for index in range(specimens):
+            resources.append(SpecimenResource(
+                "s{}-{}".format(patient_index, index), "BBM:1", "dna",
+                patient, date(2021, 11, 4), 1.0))
+        resources.append(patient)
+    return resources
+
+
+def test_planner_orders_patients_first():
+    plan = ShardPlanner(base_url=BASE_URL).plan(_biobank(2, 2))
+    assert _ids(plan.order) == ["p0", "p1", "s0-0", "s0-1", "s1-0", "s1-1"] \
+           and [_ids(level) for level in plan.levels] == \
+           [["p0", "p1"], ["s0-0", "s0-1", "s1-0", "s1-1"]] \
+           and not plan.missingReferences
+
+
+def test_planner_balances_independent_shards():
+    resources = _biobank(3, 1)
+    big = PatientResource("big", "4816522")
+    resources += [SpecimenResource("b{}".format(index), "BBM:1", "dna", big,
+                                   date(2021, 11, 4), 1.0)
+                  for index in range(3)] + [big]
+    plan = ShardPlanner(shards=2, base_url=BASE_URL).plan(resources)
+    assert [_ids(shard) for shard in plan.shards] == \
+           [["p2", "big", "s2-0", "b0", "b1", "b2"],
+            ["p0", "p1", "s0-0", "s1-0"]]
+
+
+def test_planner_links_and_conditions_join_shards():
+    first = PatientResource("p0", "4816522")
+    second = PatientResource("p1", "4816523", patient_links=[first])
+    condition = ConditionResource("c0", "C509", date(2021, 11, 4), second)
+    plan = ShardPlanner(shards=4, base_url=BASE_URL).plan(
+        [condition, second, first])
+    assert len(plan.shards) == 1 \
+           and _ids(plan.shards[0]) == ["p0", "p1", "c0"]
+
+
+def test_planner_missing_references_and_cycles():
+    first = PatientResource("p0", "4816522")
+    second = PatientResource("p1", "4816523", patient_links=[first])
+    third = PatientResource("p2", "4816524", patient_links=[second])
+    second._link = [third]
+    specimen = SpecimenResource("s0", "BBM:1", "dna", first,
+                                date(2021, 11, 4), 1.0)
+    plan = ShardPlanner(shards=2, base_url=BASE_URL).plan(
+        [Entry.from_resource(resource, BASE_URL)
+         for resource in (second, third, specimen)])
+    assert plan.missingReferences == {"Patient/p0"} \
+           and [_ids(level) for level in plan.levels] == \
+           [["s0"], ["p1", "p2"]] \
+           and len(plan.shards) == 2
+
+
+def test_planner_arguments():
+    with pytest.raises(TypeError):
+        ShardPlanner(shards="2")
+    with pytest.raises(ValueError):
+        ShardPlanner(shards=0)
+    with pytest.raises(TypeError):
+        ShardPlanner(base_url=1)
+    with pytest.raises(TypeError):
+        ShardPlanner(request_method="PATCH")
+    with pytest.raises(ValueError):
+        ShardPlanner().plan(_biobank(1, 1))
+    with pytest.raises(TypeError):
+        ShardPlanner(base_url=BASE_URL).plan(["Patient/0"])
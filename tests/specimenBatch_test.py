@@ -0,0 +1,100 @@
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from fhir_biobank.bundle import Entry
+from fhir_biobank.bundleWriter import BundleWriter
+from fhir_biobank.diagnosis import Diagnosis
+from fhir_biobank.ndjsonExporter import NDJSONExporter
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.serializer import JSONSerializer
+from fhir_biobank.specimen import SpecimenResource
+from fhir_biobank.specimenBatch import SpecimenBatch
+
+
+def _batch(**kwargs):
+    columns = dict(specimen_ids=["0", "1", "2"],
+                   identifiers=["BBM:1", "BBM:2", "BBM:3"],
+                   specimen_material_codes=["bone-marrow", "dna",
+                                            "bone-marrow"],
+                   subject_ids=["7", "7", "8"],
+                   collected_dates=[date(2012, 2, 28), date(2012, 2, 28),
+                                    date(2020, 1, 1)],
+                   quantities=[4.0, 1.5, 2.0],
+                   diagnosis_codes=["C509", None, "C509"])
+    columns.update(kwargs)
+    return SpecimenBatch(**columns)
+
+
+def test_specimen_batch_columns():
+    batch = _batch()
+    assert len(batch) == 3 \
+           and batch.specimenMaterialCodes == ["bone-marrow", "dna",
+                                               "bone-marrow"] \
+           and batch.collectedDates[2] == date(2020, 1, 1) \
+           and list(batch.quantities) == [4.0, 1.5, 2.0]
+
+
+def test_specimen_batch_same_json_as_specimen_resource():
+    patients = {"7": PatientResource("7", "2441"),
+                "8": PatientResource("8", "2442")}
+    batch = _batch()
+    for index, specimen_json in enumerate(batch.iter_json()):
+        code = batch.diagnosisCodes[index]
+        specimen = SpecimenResource(
+            batch.specimenIds[index], batch.identifiers[index],
+            batch.specimenMaterialCodes[index],
+            patients[batch.subjectIds[index]],
+            batch.collectedDates[index], batch.quantities[index],
+            extensions=[Diagnosis(code)] if code is not None else None)
+        assert specimen_json == JSONSerializer.dumps(specimen,
+                                                     check_equivalence=True)
+
+
+def test_specimen_batch_entries_json():
+    batch = _batch(diagnosis_codes=None)
+    fp = io.BytesIO()
+    with BundleWriter(fp, "6441") as writer:
+        for entry_json in batch.iter_entries_json("https://example.com"):
+            writer.write_serialized(entry_json)
+    entry = json.loads(fp.getvalue())["entry"][0]
+    expected = Entry.from_resource(
+        SpecimenResource("0", "BBM:1", "bone-marrow",
+                         PatientResource("7", "2441"), date(2012, 2, 28),
+                         4.0), "https://example.com")
+    assert entry == json.loads(JSONSerializer.dumps(expected))
+
+
+def test_specimen_batch_write_ndjson(tmp_path):
+    with NDJSONExporter(str(tmp_path)) as exporter:
+        count = _batch().write_ndjson(exporter)
+    assert count == 3 and len((tmp_path / "Specimen.ndjson").read_bytes()
+                              .splitlines()) == 3
+
+
+def test_specimen_batch_different_column_lengths():
+    with pytest.raises(ValueError):
+        _batch(quantities=[4.0])
+
+
+def test_specimen_batch_incorrect_value_material_code():
+    with pytest.raises(ValueError):
+        _batch(specimen_material_codes=["bone-marrow", "dna", "blood"])
+
+
+def test_specimen_batch_incorrect_type_quantity():
+    with pytest.raises(TypeError):
+        _batch(quantities=[4.0, 1, 2.0])
+
+
+def test_specimen_batch_incorrect_type_identifier():
+    with pytest.raises(TypeError):
+        _batch(identifiers=["BBM:1", 2, "BBM:3"])
+
+
+def test_specimen_batch_collected_date_in_future():
+    with pytest.raises(ValueError):
+        _batch(collected_dates=[date(2012, 2, 28), date(2012, 2, 28),
+                                date.today() + timedelta(days=1)])
@@ -18,3 +18,20 @@ def test_storage_temperature_incorrect_value_code():
     code = "incorrect code"
     with pytest.raises(Exception):
         StorageTemperature(code)
+
+
+def test_storage_temperature_same_code_shared_instance():
+    assert StorageTemperature("temperatureLN") is \
+           StorageTemperature("temperatureLN")
+
+
+def test_storage_temperature_immutable():
+    storage = StorageTemperature("temperatureLN")
+    with pytest.raises(AttributeError):
+        storage._storage_temperature_code = "temperatureRoom"
+
+
+def test_storage_temperature_extension_changes_not_shared():
+    extension = StorageTemperature("temperatureLN").fhirExtension
+    extension.url = "x"
+    assert StorageTemperature("temperatureLN").fhirExtension.url != "x"
@@ -0,0 +1,129 @@
+import io
+import json
+
+import pytest
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.transactionResponse import ServerVersion, \
+    TransactionResponseIndex, TransactionResponseParser
+
+BASE_URL = "https://example.com"
+
+
+def _request(count):
+    return Bundle("b0", [Entry.from_resource(
+        PatientResource(str(index), "4816522"), BASE_URL)
+        for index in range(count)])
+
+
+def _response(entries, response_type="transaction-response"):
+    return json.dumps({"resourceType": "Bundle", "id": "r0",
+                       "type": response_type, "total": 123456789,
+                       "entry": entries}, indent=1).encode("utf-8")
+
+
+RESPONSE = _response([
+    {"response": {"status": "201 Created",
+                  "location": "Patient/17/_history/1",
+                  "etag": 'W/"1"'}},
+    {"response": {"status": "200 OK", "location":
+                  "https://server.org/fhir/Patient/18/_history/3"}},
+    {"response": {"status": "200 OK", "etag": 'W/"2"'},
+     "resource": {"resourceType": "Patient", "id": "19",
+                  "meta": {"versionId": "2"}, "text": "žluťoučký " * 50}},
+])
+
+
+def test_parser_maps_full_urls():
+    request = _request(3)
+    index = TransactionResponseParser().parse(RESPONSE, request)
+    full_urls = [entry.resourceFullUrl for entry in request.sourceEntries]
+    assert [index[full_url] for full_url in full_urls] == [
+        ServerVersion("Patient", "17", "1", 'W/"1"'),
+        ServerVersion("Patient", "18", "3", None),
+        ServerVersion("Patient", "19", "2", 'W/"2"')] \
+           and index.if_match(full_urls[1]) == 'W/"3"' \
+           and index.if_match("https://example.com/Patient/99") is None \
+           and len(index) == 3 and not index.failures
+
+
+def test_parser_streams_small_chunks():
+    full_urls = [entry.resourceFullUrl
+                 for entry in _request(3).sourceEntries]
+    expected = dict(TransactionResponseParser().parse(RESPONSE,
+                                                      full_urls).items())
+    for chunk_size in (1, 3, 7):
+        parser = TransactionResponseParser(chunk_size)
+        assert dict(parser.parse(io.BytesIO(RESPONSE),
+                                 full_urls).items()) == expected \
+               and dict(parser.parse(io.StringIO(RESPONSE.decode("utf-8")),
+                                     full_urls).items()) == expected
+
+
+def test_parser_batch_failures():
+    response = _response([
+        {"response": {"status": "201 Created",
+                      "location": "Patient/1/_history/1"}},
+        {"response": {"status": "404 Not Found"}}], "batch-response")
+    request = _request(2)
+    index = TransactionResponseParser().parse(response, request)
+    assert len(index) == 1 and index.failures == {
+        request.sourceEntries[1].resourceFullUrl: "404 Not Found"}
+
+
+def test_parser_removes_deleted_entries():
+    request = _request(2)
+    index = TransactionResponseParser().parse(RESPONSE, _request(3))
+    response = _response([
+        {"response": {"status": "204 No Content"}},
+        {"response": {"status": "200 OK"}}])
+    delete = Bundle("b1", [Entry.delete(entry.resourceShortUrl, BASE_URL)
+                           for entry in request.sourceEntries])
+    TransactionResponseParser().parse(response, delete, index)
+    assert len(index) == 1 and index.get(
+        request.sourceEntries[0].resourceFullUrl) is None
+
+
+def test_parser_type_after_entries():
+    index = TransactionResponseIndex()
+    response = json.dumps({
+        "resourceType": "Bundle",
+        "entry": [{"response": {"status": "201 Created",
+                                "location": "Patient/1/_history/1"}}],
+        "type": "searchset"}).encode("utf-8")
+    with pytest.raises(ValueError):
+        TransactionResponseParser().parse(response, _request(1), index)
+    assert len(index) == 0 and not index.failures
+
+
+def test_parser_errors():
+    parser = TransactionResponseParser()
+    with pytest.raises(ValueError):
+        parser.parse(RESPONSE, _request(2))
+    with pytest.raises(ValueError):
+        parser.parse(RESPONSE, _request(4))
+    with pytest.raises(ValueError):
+        parser.parse(_response([], "transaction"), [])
+    with pytest.raises(ValueError):
+        parser.parse(RESPONSE[:-10], _request(3))
+    with pytest.raises(TypeError):
+        parser.parse(1, [])
+    with pytest.raises(TypeError):
+        parser.parse(RESPONSE, [1, 2, 3])
+    with pytest.raises(ValueError):
+        TransactionResponseParser(0)
+
+
+def test_index_dump_and_load():
+    index = TransactionResponseParser().parse(RESPONSE, _request(3))
+    index.add("https://example.com/Patient/9", "Patient/9")
+    fp = io.StringIO()
+    index.dump(fp)
+    fp.seek(0)
+    loaded = TransactionResponseIndex.load(fp)
+    assert dict(loaded.items()) == dict(index.items()) \
+           and loaded["https://example.com/Patient/9"] == \
+           ServerVersion("Patient", "9", None, None)
+    with pytest.raises(ValueError):
+        index.add("https://example.com/Patient/10", "Patient")
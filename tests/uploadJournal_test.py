@@ -0,0 +1,172 @@
+import os
+import sqlite3
+
+import pytest
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.pipeline import UploadPipeline
+from fhir_biobank.uploadJournal import UploadJournal
+from fhir_biobank.uploader import BundleUploader, UploadError
+from tests.uploader_test import StubFHIRServer
+
+BASE_URL = "https://example.com"
+EXPORT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                           "BBM211219230002-000079.XML")
+
+
+def _bundles(count):
+    return [Bundle("b{}".format(index), [Entry.from_resource(
+        PatientResource(str(index), "4816522"), BASE_URL)])
+            for index in range(count)]
+
+
+@pytest.fixture
+def server_factory():
+    servers = []
+
+    def create(statuses=()):
+        servers.append(StubFHIRServer(statuses))
+        return servers[-1]
+
+    yield create
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_journal_record_and_reopen(tmp_path):
+    path = str(tmp_path / "upload.journal")
+    bundles = _bundles(3)
+    with UploadJournal(path) as journal:
+        journal.record(bundles[0])
+        journal.record("b1", ["https://example.com/Patient/1"])
+    with UploadJournal(path) as journal:
+        assert journal.is_committed("b0") and "b1" in journal \
+               and "b2" not in journal \
+               and journal.bundleCount == 2 and journal.entryCount == 2 \
+               and journal.committed_urls(
+                   ["https://example.com/Patient/{}".format(index)
+                    for index in range(3)]) == \
+               {"https://example.com/Patient/0",
+                "https://example.com/Patient/1"} \
+               and [bundle.id for bundle in
+                    journal.pending_bundles(bundles)] == ["b2"] \
+               and journal.pending_entries(
+                   bundles[1].sourceEntries + bundles[2].sourceEntries) == \
+               bundles[2].sourceEntries
+
+
+def test_journal_resumes_upload_all(tmp_path, server_factory):
+    path = str(tmp_path / "upload.journal")
+    failing = server_factory([200, 200, 400])
+    with UploadJournal(path) as journal, \
+            BundleUploader(failing.url, concurrency=1) as uploader:
+        with pytest.raises(UploadError):
+            list(uploader.upload_all(_bundles(5), journal=journal))
+        # b3 may be sent before the failure of b2 is noticed
+        committed = journal.bundleCount
+        assert "b2" not in journal and committed in (2, 3)
+
+    server = server_factory()
+    with UploadJournal(path) as journal, \
+            BundleUploader(server.url, concurrency=1) as uploader:
+        results = list(uploader.upload_all(_bundles(5), journal=journal))
+        assert results[0].bundleId == "b2" \
+               and len(results) == 5 - committed \
+               and journal.bundleCount == 5
+        with pytest.raises(TypeError):
+            list(uploader.upload_all([b"{}"], journal=journal))
+
+
+def test_journal_resumes_pipeline(tmp_path, server_factory):
+    exports = tmp_path / "exports"
+    exports.mkdir()
+    with open(EXPORT_PATH, "rb") as fp:
+        export = fp.read()
+    for index in range(4):
+        (exports / "BBM{}.XML".format(index)).write_bytes(
+            export.replace(b'id="4816522"', 'id="{}"'.format(index).encode()))
+    path = str(tmp_path / "upload.journal")
+    server = server_factory()
+    with UploadJournal(path) as journal, \
+            BundleUploader(server.url) as uploader:
+        first = UploadPipeline(uploader, bundle_size=12,
+                               journal=journal).upload(
+            [str(exports / "BBM0.XML"), str(exports / "BBM1.XML")])
+        second = UploadPipeline(uploader, bundle_size=12,
+                                journal=journal).upload(str(exports))
+        # bundles of both runs are kept, with ids of their runs
+        assert journal.bundleCount == 2 and journal.entryCount == 24
+    assert first.bundles == 1 and first.skipped == 0 \
+           and second.resources == 24 and second.skipped == 12 \
+           and second.bundles == 1 and len(server.bodies) == 2
+
+
+def test_journal_changed_entries_pending(tmp_path):
+    with UploadJournal(str(tmp_path / "upload.journal")) as journal:
+        journal.record(_bundles(2)[0])
+        journal.record("b1", ["https://example.com/Patient/1"])
+        changed = Entry.from_resource(
+            PatientResource("0", "4816522", "female"), BASE_URL)
+        # Patient/1 was recorded without a digest
+        assert journal.pending_entries(
+            [changed] + _bundles(2)[0].sourceEntries +
+            _bundles(2)[1].sourceEntries) == [changed]
+        journal.clear()
+        assert journal.bundleCount == 0 and journal.entryCount == 0
+
+
+def test_journal_reuploads_changed_export(tmp_path, server_factory):
+    exports = tmp_path / "exports"
+    exports.mkdir()
+    with open(EXPORT_PATH, "rb") as fp:
+        export = fp.read()
+    (exports / "BBM0.XML").write_bytes(export)
+    path = str(tmp_path / "upload.journal")
+    server = server_factory()
+    with UploadJournal(path) as journal, \
+            BundleUploader(server.url) as uploader:
+        UploadPipeline(uploader, journal=journal).upload(str(exports))
+        (exports / "BBM0.XML").write_bytes(
+            export.replace(b'sex="female"', b'sex="male"'))
+        changed = UploadPipeline(uploader, journal=journal).upload(
+            str(exports))
+        unchanged = UploadPipeline(uploader, journal=journal).upload(
+            str(exports))
+    assert changed.skipped == changed.resources - 1 \
+           and changed.bundles == 1 and unchanged.bundles == 0 \
+           and server.bodies[1]["entry"][0]["resource"]["gender"] == "male"
+
+
+def test_journal_without_digests(tmp_path):
+    path = str(tmp_path / "upload.journal")
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        "CREATE TABLE bundles (id TEXT PRIMARY KEY, "
+        "entries INTEGER NOT NULL, committed REAL NOT NULL);"
+        "CREATE TABLE entries (full_url TEXT PRIMARY KEY, "
+        "bundle_id TEXT NOT NULL) WITHOUT ROWID;"
+        "INSERT INTO entries VALUES ('https://example.com/Patient/0', "
+        "'b0');")
+    connection.close()
+    with UploadJournal(path) as journal:
+        assert journal.pending_entries(_bundles(1)[0].sourceEntries) == []
+        journal.record(_bundles(2)[1])
+        assert journal.entryCount == 2
+
+
+def test_journal_arguments(tmp_path):
+    with pytest.raises(TypeError):
+        UploadJournal(1)
+    with UploadJournal(str(tmp_path / "upload.journal")) as journal:
+        with pytest.raises(TypeError):
+            journal.record(1)
+        with pytest.raises(TypeError):
+            journal.record("b0", [1])
+        with pytest.raises(TypeError):
+            journal.record("b0", ["https://example.com/Patient/0"], [1])
+        with pytest.raises(ValueError):
+            journal.record("b0", ["https://example.com/Patient/0"], [])
+        with pytest.raises(TypeError):
+            UploadPipeline(BundleUploader(BASE_URL), journal=object())
@@ -0,0 +1,164 @@
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.uploader import BundleUploader, UploadError
+
+BASE_URL = "https://example.com"
+
+
+class StubFHIRServer(ThreadingHTTPServer):
+    """
+    Local FHIR server stub. Responds with the queued statuses, then
+    with 200, and records bodies of the requests.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, statuses=(), delay=0.0):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.bodies = []
+        self.connections = 0
+        self.active = 0
+        self.maxActive = 0
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, args=(0.05,),
+                         daemon=True).start()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{}/fhir".format(self.server_address[1])
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.maxActive = max(server.maxActive, server.active)
+            status = server.statuses.pop(0) if server.statuses else 200
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        time.sleep(server.delay)
+        content = b'{"resourceType": "Bundle", "type": ' \
+                  b'"transaction-response"}'
+        with server.lock:
+            server.active -= 1
+            if status == 200:
+                server.bodies.append(json.loads(body))
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Type", "application/fhir+json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+@pytest.fixture
+def server_factory():
+    servers = []
+
+    def create(statuses=(), delay=0.0):
+        servers.append(StubFHIRServer(statuses, delay))
+        return servers[-1]
+
+    yield create
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _bundles(count):
+    return [Bundle("b{}".format(index), [Entry.from_resource(
+        PatientResource(str(index), "4816522"), BASE_URL)])
+            for index in range(count)]
+
+
+def test_uploader_keep_alive_and_gzip(server_factory):
+    server = server_factory()
+    with BundleUploader(server.url, concurrency=1) as uploader:
+        results = list(uploader.upload_all(_bundles(5)))
+    metrics = uploader.metrics()
+    assert [result.bundleId for result in results] == \
+           ["b0", "b1", "b2", "b3", "b4"] \
+           and all(result.status == 200 and result.attempts == 1
+                   for result in results) \
+           and [body["id"] for body in server.bodies] == \
+           ["b0", "b1", "b2", "b3", "b4"] \
+           and server.connections == 1 \
+           and metrics.requests == 5 and metrics.retries == 0 \
+           and metrics.latency_max >= metrics.latency_p50 > 0
+
+
+def test_uploader_concurrency_limit(server_factory):
+    server = server_factory(delay=0.05)
+    with BundleUploader(server.url, concurrency=3) as uploader:
+        results = list(uploader.upload_all(_bundles(9)))
+    assert len(results) == 9 and 1 < server.maxActive <= 3 \
+           and server.connections <= 3
+
+
+def test_uploader_retries(server_factory):
+    server = server_factory([503, 429, 200])
+    with BundleUploader(server.url, backoff=0.0,
+                        compress=False) as uploader:
+        result = uploader.upload(_bundles(1)[0])
+    assert result.attempts == 3 and uploader.metrics().retries == 2 \
+           and server.bodies[0]["id"] == "b0"
+
+
+def test_uploader_errors(server_factory):
+    server = server_factory([400, 500, 500])
+    with BundleUploader(server.url, max_retries=1,
+                        backoff=0.0) as uploader:
+        with pytest.raises(UploadError) as rejected:
+            uploader.upload(_bundles(1)[0])
+        with pytest.raises(UploadError) as exhausted:
+            uploader.upload(b"{}", "raw")
+    assert rejected.value.status == 400 and rejected.value.bundleId == "b0" \
+           and exhausted.value.status == 500 \
+           and exhausted.value.bundleId == "raw" \
+           and uploader.metrics().failures == 2
+
+
+def test_uploader_connection_error():
+    with BundleUploader("http://127.0.0.1:1", max_retries=1, backoff=0.0,
+                        timeout=1.0) as uploader:
+        with pytest.raises(UploadError) as error:
+            uploader.upload(_bundles(1)[0])
+    assert error.value.status is None \
+           and uploader.metrics().requests == 0
+
+
+def test_uploader_arguments():
+    with pytest.raises(TypeError):
+        BundleUploader(1)
+    with pytest.raises(ValueError):
+        BundleUploader("ftp://example.com")
+    with pytest.raises(ValueError):
+        BundleUploader(BASE_URL, concurrency=0)
+    with pytest.raises(TypeError):
+        BundleUploader(BASE_URL, backoff="1")
+    with pytest.raises(TypeError):
+        BundleUploader(BASE_URL).upload("bundle")
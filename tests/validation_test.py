@@ -0,0 +1,157 @@
+import threading
+from datetime import date
+
+import pytest
+
+from fhir_biobank.bundle import Bundle, Entry
+from fhir_biobank.condition import ConditionResource
+from fhir_biobank.patient import PatientResource
+from fhir_biobank.specimen import SpecimenResource
+from fhir_biobank.validation import DEFERRED, STRICT, TRUSTED, \
+    ValidationError, create_many, deferred_errors, get_validation_mode, \
+    raise_deferred_errors, set_validation_mode, validate_many, \
+    validation_mode
+
+
+def test_default_validation_mode_strict():
+    assert get_validation_mode() == STRICT
+
+
+def test_strict_mode_raises_first_error():
+    with validation_mode(STRICT):
+        with pytest.raises(ValueError):
+            PatientResource("0", "4816522", "incorrect gender")
+
+
+def test_trusted_mode_skips_checks():
+    with validation_mode(TRUSTED):
+        patient = PatientResource("0", "4816522", "incorrect gender")
+    assert patient.gender == "incorrect gender"
+
+
+def test_per_call_mode_overrides_current_mode():
+    with validation_mode(TRUSTED):
+        with pytest.raises(TypeError):
+            ConditionResource(42, "C509", date(2021, 1, 1),
+                              PatientResource("0", "4816522"),
+                              validation=STRICT)
+
+
+def test_deferred_mode_collects_errors_of_batch():
+    with pytest.raises(ValidationError) as error_info:
+        with validation_mode(DEFERRED):
+            patient = PatientResource("0", "4816522", "incorrect gender")
+            SpecimenResource("0", "BBM:1", "serum", patient,
+                             date(2021, 1, 1), 3.0)
+            Bundle("0", [])
+    assert [type(error) for error in error_info.value.errors] == \
+           [ValueError, ValueError, ValueError]
+
+
+def test_deferred_mode_without_raising():
+    with validation_mode(DEFERRED, raise_errors=False) as errors:
+        Entry(PatientResource("0", "4816522"), 42, "Patient/0")
+    assert len(errors) == 1 and isinstance(errors[0], TypeError)
+
+
+def test_deferred_mode_incorrect_entries():
+    with validation_mode(DEFERRED, raise_errors=False) as errors:
+        bundle = Bundle("0", None)
+    assert len(errors) == 1 and isinstance(errors[0], TypeError)
+    assert len(bundle) == 0
+
+
+def test_errors_of_block_not_kept():
+    with pytest.raises(ValidationError) as error_info:
+        with validation_mode(DEFERRED) as errors:
+            PatientResource(42, "4816522")
+    assert len(error_info.value.errors) == 1 and errors == []
+
+
+def test_global_deferred_errors_per_thread():
+    set_validation_mode(DEFERRED)
+    try:
+        PatientResource(42, "4816522")
+        thread_errors = []
+        thread = threading.Thread(target=lambda: thread_errors.append(
+            (PatientResource(43, "4816523"), list(deferred_errors()))))
+        thread.start()
+        thread.join()
+        assert len(thread_errors[0][1]) == 1
+        assert len(deferred_errors()) == 1
+        with pytest.raises(ValidationError):
+            raise_deferred_errors()
+    finally:
+        set_validation_mode(STRICT)
+
+
+def test_global_deferred_mode():
+    set_validation_mode(DEFERRED)
+    try:
+        PatientResource(42, "4816522")
+        PatientResource("0", "4816522", deceased_boolean="no")
+        assert len(deferred_errors()) == 2
+        with pytest.raises(ValidationError):
+            raise_deferred_errors()
+        assert deferred_errors() == []
+    finally:
+        set_validation_mode(STRICT)
+
+
+def test_validation_mode_incorrect_value():
+    with pytest.raises(ValueError):
+        set_validation_mode("lenient")
+
+
+def test_per_call_mode_incorrect_value():
+    with pytest.raises(ValueError):
+        PatientResource("0", "4816522", validation="lenient")
+
+
+def test_validate_many_reports_incorrect_records():
+    errors = validate_many(PatientResource, [
+        ("0", "4816522", "female"),
+        ("1", "4816523", "incorrect gender"),
+        {"patient_id": "2", "identifier": 42},
+        {"patient_id": "3", "identifier": "4816524",
+         "birth_date": date(1997, 12, 1)}])
+    assert [(index, type(error)) for index, error in errors] == \
+           [(1, ValueError), (2, TypeError)]
+
+
+def test_validate_many_same_errors_as_constructor():
+    record = ("0", "BBM:1", "serum", PatientResource("0", "4816522"),
+              date(2021, 1, 1), 3.0)
+    with pytest.raises(ValueError) as error_info:
+        SpecimenResource(*record)
+    [(_, error)] = validate_many(SpecimenResource, [record])
+    assert str(error) == str(error_info.value)
+
+
+def test_validate_many_entry_incorrect_request_method():
+    patient = PatientResource("0", "4816522")
+    [(index, error)] = validate_many(
+        Entry, [(patient, "https://example.com/Patient/0", "Patient/0"),
+                (patient, "https://example.com/Patient/0", "Patient/0",
+                 "PATCH")])
+    assert index == 1 and type(error) == TypeError
+
+
+def test_create_many():
+    patients = create_many(PatientResource, [("0", "4816522", "female"),
+                                             {"patient_id": "1",
+                                              "identifier": "4816523"}])
+    assert [patient.patientId for patient in patients] == ["0", "1"] \
+           and patients[1].gender == "unknown"
+
+
+def test_create_many_raises_all_errors():
+    with pytest.raises(ValidationError) as error_info:
+        create_many(ConditionResource, [(42, "C509", date(2021, 1, 1), None),
+                                        ("1", "C509", "2021-01-01", None)])
+    assert len(error_info.value.errors) == 2
+
+
+def test_validate_many_incorrect_type_cls():
+    with pytest.raises(TypeError):
+        validate_many(date, [])
@@ -0,0 +1,100 @@
+import io
+import os
+from datetime import date
+
+import pytest
+
+from fhir_biobank.diagnosis import Diagnosis
+from fhir_biobank.xmlReader import PatientXMLReader
+
+EXPORT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                           "BBM211219230002-000079.XML")
+
+AGGREGATED_EXPORT = b"""<?xml version="1.0" encoding="utf-8" ?>
+<export xmlns="http://www.bbmri.cz/schemas/biobank/data">
+<patient id="1" sex="male" year="1950">
+<LTS><tissue sampleId="BBM:1"><availableSamplesNo>2</availableSamplesNo>
+<materialType>1</materialType><cutTime>2020-01-02T09:40:00</cutTime>
+</tissue></LTS>
+</patient>
+<patient id="2" sex="female" year="1960" month="--03">
+<STS><diagnosisMaterial sampleId="BBM:2"><materialType>S</materialType>
+<diagnosis>C509</diagnosis><takingDate>2021-10-18T10:02:00</takingDate>
+</diagnosisMaterial></STS>
+</patient>
+</export>"""
+
+
+def test_xml_reader_patient_from_export():
+    patient, specimens = next(iter(PatientXMLReader(EXPORT_PATH)))
+    assert patient.patientId == "4816522" and patient.gender == "female" \
+           and patient.birthDate == date(1997, 12, 1) and len(specimens) == 5
+
+
+def test_xml_reader_specimens_from_export():
+    _, specimens = next(iter(PatientXMLReader(EXPORT_PATH)))
+    tissue, sts = specimens[0], specimens[4]
+    assert tissue.identifier == "BBM:2021:723:1" \
+           and tissue.quantity == 3.0 \
+           and tissue.collectedDateTime == date(2021, 11, 4) \
+           and type(tissue.extensions[0]) == Diagnosis \
+           and tissue.extensions[0].diagnosisCode == "C509"
+    assert sts.identifier == "&:2021:136043" \
+           and sts.collectedDateTime == date(2021, 10, 18)
+
+
+def test_xml_reader_aggregated_export():
+    reader = PatientXMLReader(io.BytesIO(AGGREGATED_EXPORT))
+    result = list(reader)
+    assert [patient.patientId for patient, _ in result] == ["1", "2"] \
+           and result[1][0].birthDate == date(1960, 3, 1) \
+           and result[0][1][0].specimenId == "1-0" \
+           and result[0][1][0].extensions is None
+
+
+def test_xml_reader_material_codes():
+    reader = PatientXMLReader(io.BytesIO(AGGREGATED_EXPORT),
+                              default_material_code="tissue-frozen",
+                              material_codes={"S": "blood-serum"})
+    result = list(reader)
+    assert result[0][1][0].specimenMaterialCode == "tissue-frozen" \
+           and result[1][1][0].specimenMaterialCode == "blood-serum"
+
+
+def test_xml_reader_records():
+    records = list(PatientXMLReader(io.BytesIO(AGGREGATED_EXPORT)).records())
+    assert records[0]["id"] == "1" \
+           and records[0]["samples"][0]["kind"] == "tissue" \
+           and records[0]["samples"][0]["cutTime"] == "2020-01-02T09:40:00"
+
+
+def test_xml_reader_sample_without_collection_time():
+    export = b"""<patient xmlns="http://www.bbmri.cz/schemas/biobank/data"
+        id="1" sex="male"><LTS><tissue sampleId="BBM:1"/></LTS></patient>"""
+    with pytest.raises(ValueError):
+        list(PatientXMLReader(io.BytesIO(export)))
+
+
+def test_xml_reader_sample_without_id():
+    export = b"""<patient xmlns="http://www.bbmri.cz/schemas/biobank/data"
+        id="1" sex="male"><LTS><tissue>
+        <cutTime>2020-01-02T09:40:00</cutTime></tissue></LTS></patient>"""
+    with pytest.raises(ValueError, match="tissue element of patient 1"):
+        list(PatientXMLReader(io.BytesIO(export)))
+
+
+def test_xml_reader_patient_without_id():
+    export = b"""<patient xmlns="http://www.bbmri.cz/schemas/biobank/data"
+        sex="male"/>"""
+    with pytest.raises(ValueError, match="patient element"):
+        list(PatientXMLReader(io.BytesIO(export)))
+
+
+def test_xml_reader_incorrect_type_source():
+    with pytest.raises(TypeError):
+        PatientXMLReader(42)
+
+
+def test_xml_reader_incorrect_value_material_codes():
+    with pytest.raises(ValueError):
+        PatientXMLReader(EXPORT_PATH, material_codes={"S": "serum"})